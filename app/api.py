@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from app.core.config import settings
 from app.matches.controllers.match_upload_controller import router as upload_match_router
 from app.standings.controllers.standings_upload_controller import router as upload_standing_router
 from app.current_league.controllers.current_league_controller import router as current_league_router
@@ -7,6 +8,7 @@ from app.placing_bets.controllers.bets_controller import router as betting_route
 from app.new_odds.controllers.betfair_odds_controller import router as betfair_router
 from app.odds_calculation.controllers.odds_calculation_controller import router as odds_calculation_router
 from app.match_statistics.controllers.match_statistics_controller import router as match_statistics_router 
+from app.monitoring.controllers.metrics_controller import router as metrics_router
 
 api_router = APIRouter()
 
@@ -17,4 +19,6 @@ api_router.include_router(new_odds_router, prefix="/odds", tags=["odds"])
 api_router.include_router(betfair_router, prefix="/betfair-odds", tags=["new-betfair-odds"])
 api_router.include_router(betting_router, prefix="/betting-router", tags=["new-betting-router"])
 api_router.include_router(odds_calculation_router, prefix="/odds-calculation", tags=["odds-calculation"])
-api_router.include_router(match_statistics_router, prefix="/match-statistics", tags=["match-statistics"]) 
\ No newline at end of file
+api_router.include_router(match_statistics_router, prefix="/match-statistics", tags=["match-statistics"])
+if settings.METRICS_ENDPOINT_ENABLED:
+    api_router.include_router(metrics_router, prefix="/internal", tags=["internal"])
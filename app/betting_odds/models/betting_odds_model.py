@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, Float, ForeignKey
+from sqlalchemy import Column, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class BettingOdds(Base):
     __tablename__ = "betting_odds"
+    __table_args__ = (
+        Index("ix_betting_odds_match_id", "match_id"),
+    )
 
     betting_oddds_id = Column(String, primary_key=True, index=True)
     match_id = Column(String, ForeignKey("matches.match_id"), nullable=False)
@@ -1,7 +1,15 @@
 import requests
 import os
+import time
+import threading
+from app.core.config import settings
 
 class BetfairAuthService:
+    # Session tokens are reused across service instances in the same process
+    # (username, app_key) -> (token, obtained_at)
+    _token_cache = {}
+    _token_lock = threading.Lock()
+
     def __init__(self, username, password, app_key):
         self.username = username
         self.password = password
@@ -11,7 +19,22 @@ class BetfairAuthService:
 
         self.login_url = "https://identitysso-cert.betfair.com/api/certlogin"
     
-    def get_session_token(self):
+    def get_session_token(self, force_refresh: bool = False):
+        """Cached session token, logging in again when it is missing, expired or force_refresh is set."""
+        key = (self.username, self.app_key)
+        with self._token_lock:
+            cached = self._token_cache.get(key)
+            if cached and not force_refresh and time.time() - cached[1] < settings.BETFAIR_SESSION_TTL_SECONDS:
+                return cached[0]
+
+            token = self._login()
+            if token:
+                self._token_cache[key] = (token, time.time())
+            else:
+                self._token_cache.pop(key, None)
+            return token
+
+    def _login(self):
         cert = (f"{self.certs_path}/client-2048.crt", f"{self.certs_path}/client-2048.key")
         
         print("Base Directory path:", self.base_dir)
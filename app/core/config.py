@@ -1,8 +1,68 @@
+from typing import Optional
 from pydantic import BaseSettings
 from pathlib import Path
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Optional read replica for read-only endpoints (falls back to DATABASE_URL)
+    DATABASE_READ_URL: Optional[str] = None
+
+    # How many IDs each process reserves per trip to the id_counters table
+    ID_BLOCK_SIZE: int = 50
+
+    # Connection pool per process role: "api" (uvicorn), "scheduler" (scheduler job
+    # processes) and "background" (in-process background tasks), plus the "read" pool
+    PROCESS_ROLE: str = "api"
+    POOL_SIZE_API: int = 5
+    POOL_MAX_OVERFLOW_API: int = 5
+    POOL_SIZE_SCHEDULER: int = 2
+    POOL_MAX_OVERFLOW_SCHEDULER: int = 1
+    POOL_SIZE_BACKGROUND: int = 2
+    POOL_MAX_OVERFLOW_BACKGROUND: int = 2
+    POOL_SIZE_READ: int = 5
+    POOL_MAX_OVERFLOW_READ: int = 10
+    POOL_TIMEOUT: int = 90
+    POOL_RECYCLE: int = 1800
+
+    # A connection checked out for longer than this is logged as a possible leak
+    POOL_LEAK_THRESHOLD_SECONDS: float = 300
+    # Record the acquiring stack on every checkout (logged for leaks and timeouts); costly, debug only
+    POOL_TRACK_STACKS: bool = False
+    # Mount GET /internal/metrics (pool telemetry); unauthenticated, so off unless the API is private
+    METRICS_ENDPOINT_ENABLED: bool = False
+
+    # Adds X-DB-* query headers to responses and logs per-request query totals
+    DEBUG: bool = False
+    QUERY_STATS_ENABLED: bool = True
+    # A statement fingerprint repeated this many times in one request/job is flagged as N+1
+    N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Schema is managed by Alembic (`alembic upgrade head`); create_all on startup is opt-in
+    INIT_DB_ON_STARTUP: bool = False
+    # Warn when importing the app takes longer than this (cold-start budget)
+    IMPORT_TIME_BUDGET_MS: int = 800
+
+    # Reuse a Betfair session token for this long before logging in again
+    BETFAIR_SESSION_TTL_SECONDS: int = 4 * 3600
+
+    # Long-lived worker processes for scheduled jobs
+    WORKER_POOL_SIZE: int = 2
+    # Recycle a worker after this many jobs, or once its RSS (with child processes, e.g. Chromium) passes the ceiling
+    WORKER_MAX_JOBS: int = 50
+    WORKER_MAX_RSS_MB: int = 1024
+    LIVE_UPDATE_TIMEOUT_SECONDS: int = 300
+    # Cap for the daily jobs (Betfair odds, league scraper, odds calculation trigger)
+    SCHEDULED_JOB_TIMEOUT_SECONDS: int = 1800
+
+    # Processes for an odds calculation run; 0 = one per available core, 1 = in-process
+    ODDS_CALC_WORKERS: int = 0
+    # Upper bound on those processes (also capped at the available cores); each opens its own DB pool
+    ODDS_CALC_MAX_WORKERS: int = 8
+    # POST /odds-calculation/evaluate: snapshot age before a background reload, and pairings per request
+    ODDS_SNAPSHOT_TTL_SECONDS: int = 600
+    ODDS_EVALUATE_MAX_FIXTURES: int = 1000
+    # GET /odds-calculation/calculated-odds/ is cached until a write to its tables, or this long at most
+    ODDS_RESPONSE_CACHE_TTL_SECONDS: int = 30
 
     class Config:
         # Go up two levels from core/config.py → project root
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, BigInteger
+from sqlalchemy.orm import Session
+from app.core.database import Base
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    # Bumped by a statement-level trigger on every write to the table (see migration 0006)
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+def current_versions(db: Session, table_names) -> tuple:
+    """Versions of the given tables, in the order given (0 for a table without a row)."""
+    table_names = list(table_names)
+    rows = dict(
+        db.query(DataVersion.table_name, DataVersion.version)
+        .filter(DataVersion.table_name.in_(table_names))
+        .all()
+    )
+    return tuple(rows.get(name, 0) for name in table_names)
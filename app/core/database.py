@@ -1,21 +1,128 @@
-from sqlalchemy import create_engine
-from sqlalchemy import text
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from contextlib import asynccontextmanager
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.config import settings
+from app.core.pool_monitor import PoolMonitor, TimedQueuePool, TimedAsyncQueuePool, register_monitor, unregister_monitor
 
-# Create the engine with `pool_pre_ping=True` to prevent stale connections
-engine = create_engine(settings.DATABASE_URL,
-    pool_pre_ping=True,   # tests connections before using them
-    pool_recycle=1800,    # recycle every 30 min to avoid stale connections
-    pool_size=5,          # (optional) max number of persistent connections
-    max_overflow=5,      # (optional) extra connections allowed
-    pool_timeout=90      # (optional) wait 30s before giving up on a connection
-    )
+# Pool size and overflow for each process role (see configure_process_role)
+POOL_PROFILES = {
+    "api": {"pool_size": settings.POOL_SIZE_API, "max_overflow": settings.POOL_MAX_OVERFLOW_API},
+    "scheduler": {"pool_size": settings.POOL_SIZE_SCHEDULER, "max_overflow": settings.POOL_MAX_OVERFLOW_SCHEDULER},
+    "background": {"pool_size": settings.POOL_SIZE_BACKGROUND, "max_overflow": settings.POOL_MAX_OVERFLOW_BACKGROUND},
+    "read": {"pool_size": settings.POOL_SIZE_READ, "max_overflow": settings.POOL_MAX_OVERFLOW_READ},
+}
+
+
+def _pool_profile(role: str) -> dict:
+    if role not in POOL_PROFILES:
+        raise ValueError(f"Unknown process role '{role}', expected one of {sorted(POOL_PROFILES)}")
+    return POOL_PROFILES[role]
+
+
+def _monitor(name: str, role: str) -> PoolMonitor:
+    return register_monitor(PoolMonitor(
+        name, role,
+        leak_threshold=settings.POOL_LEAK_THRESHOLD_SECONDS,
+        track_stacks=settings.POOL_TRACK_STACKS,
+    ))
+
+
+def _build_engine(role: str, name: str, url: str = None):
+    # `pool_pre_ping=True` tests connections before using them, `pool_recycle` avoids stale ones
+    new_engine = create_engine(url or settings.DATABASE_URL,
+        poolclass=TimedQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=settings.POOL_RECYCLE,
+        pool_timeout=settings.POOL_TIMEOUT,
+        **_pool_profile(role)
+        )
+    return _monitor(name, role).attach(new_engine)
+
+
+# Engine for this process's role (the API unless PROCESS_ROLE says otherwise)
+engine = _build_engine(settings.PROCESS_ROLE, "sync")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Separate pool for in-process background tasks, so a long job can't starve requests
+background_engine = _build_engine("background", "background")
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
+
+# Read-only endpoints get their own pool, on the replica when DATABASE_READ_URL is set
+read_engine = _build_engine("read", "read", url=settings.DATABASE_READ_URL)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_writes(session, flush_context, instances):
+    raise RuntimeError("Read sessions are read-only; use get_db for writes")
+
+
+def configure_process_role(role: str):
+    """
+    Rebuild the sync engine with the pool profile of `role`. Call it first thing in a
+    child process: the pools inherited through fork() are dropped without closing the
+    parent's connections, and the child uses one small pool for all its sessions.
+    """
+    global engine, background_engine
+    for inherited in {engine, background_engine, read_engine}:
+        inherited.dispose(close=False)
+    unregister_monitor("background")
+
+    engine = _build_engine(role, "sync")
+    background_engine = engine
+    SessionLocal.configure(bind=engine)
+    BackgroundSessionLocal.configure(bind=engine)
+    settings.PROCESS_ROLE = role
+    return engine
+
+
+def _async_url(url: str):
+    """Same database as DATABASE_URL, through the asyncpg driver."""
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    connect_args = {}
+    # asyncpg takes `ssl` instead of libpq's `sslmode`
+    sslmode = async_url.query.get("sslmode")
+    if sslmode:
+        async_url = async_url.difference_update_query(["sslmode"])
+        connect_args["ssl"] = sslmode
+    return async_url, connect_args
+
+
+_async_database_url, _async_connect_args = _async_url(settings.DATABASE_URL)
+
+# Async engine for `async def` endpoints and services, so DB I/O yields to the event loop
+async_engine = _monitor("async", settings.PROCESS_ROLE).attach(create_async_engine(_async_database_url,
+    connect_args=_async_connect_args,
+    poolclass=TimedAsyncQueuePool,
+    pool_pre_ping=True,
+    pool_recycle=settings.POOL_RECYCLE,
+    pool_timeout=settings.POOL_TIMEOUT,
+    **_pool_profile(settings.PROCESS_ROLE)
+    ))
+
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+@asynccontextmanager
+async def isolated_async_session():
+    """
+    AsyncSession on an unpooled engine of its own, for code running on a private event loop
+    (e.g. a job thread): asyncpg connections from async_engine's pool belong to the API's loop.
+    """
+    isolated_engine = create_async_engine(_async_database_url, connect_args=_async_connect_args, poolclass=NullPool)
+    try:
+        async with AsyncSession(isolated_engine, autoflush=False, expire_on_commit=False) as db:
+            yield db
+    finally:
+        await isolated_engine.dispose()
+
 # Base class for models
 Base = declarative_base()
 
@@ -27,32 +134,46 @@ def get_db():
     finally:
         db.close()
 
-# Function to initialize the database
-def init_db():
-    # Import all models here
+# Dependency to get a read-only DB session (replica when configured)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Import every model so Base.metadata knows about all tables
+def import_models():
     from app.leagues.models.leagues_models import League
     from app.matches.models.match_model import Match
     from app.teams.models.team_model import Team
     from app.country.models.country_model import Country
     from app.betting_odds.models.betting_odds_model import BettingOdds
     from app.match_statistics.models.match_statistics_model import MatchStatistics
+    from app.match_statistics.models.head_to_head_summary_model import HeadToHeadSummary
     from app.referee.models.referee_model import Referee
     from app.teams.models.team_alias_model import TeamAlias
     from app.seasons.models.seasons_model import Season
     from app.standings.models.standings_model import Standing
     from app.current_league.models.current_league_model import CurrentLeague
+    from app.fixtures.models.fixture_model import Fixture
     from app.new_odds.models.new_odds_model import NewOdds
     from app.odds_calculation.models.odds_calculation_model import OddsCalculation
+    from app.odds_calculation.models.banded_stats_model import BandedStats
     from app.live_data.models.live_game_data import LiveGameData
-    
-    # Use context manager to ensure connection is released new cleanup before all
+    from app.core.id_allocator import IdCounter
+    from app.core.data_versions import DataVersion
+
+
+# Function to initialize the database
+def init_db():
+    import_models()
 
+    # Use context manager to ensure connection is released
     with engine.begin() as conn:
-        conn.execute(text("""
-                SELECT pg_terminate_backend(pid)
-                FROM pg_stat_activity
-                WHERE usename='postgres'
-                AND state='idle'
-                AND pid<>pg_backend_pid();
-            """))
         Base.metadata.create_all(bind=conn)
@@ -0,0 +1,100 @@
+import os
+import re
+import threading
+import logging
+from sqlalchemy import Column, String, BigInteger, select, update, func, cast
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.database import Base
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IdCounter(Base):
+    __tablename__ = "id_counters"
+
+    # One counter per table (Season and Standing both use the "S" prefix)
+    counter_name = Column(String, primary_key=True)
+    next_value = Column(BigInteger, nullable=False)
+
+
+class IdAllocator:
+    """
+    Hands out human-readable IDs (e.g. "M1", "MS10000") from blocks reserved in the
+    id_counters table. A block is reserved with a single UPDATE ... RETURNING on its own
+    connection, so concurrent writers never race for the same number and the caller's
+    transaction is not held open on the counter row.
+    """
+
+    def __init__(self, block_size: int = 50):
+        self.block_size = block_size
+        self._blocks = {}  # counter_name -> [next_value, end_value_exclusive]
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def allocate(self, db: Session, model, prefix: str, id_field: str) -> str:
+        counter_name = model.__tablename__
+        with self._lock:
+            # Blocks inherited through fork() are shared with the parent, so drop them
+            if self._pid != os.getpid():
+                self._blocks.clear()
+                self._pid = os.getpid()
+
+            block = self._blocks.get(counter_name)
+            if not block or block[0] >= block[1]:
+                block = list(self._reserve_block(db, model, prefix, id_field))
+                self._blocks[counter_name] = block
+
+            new_id = block[0]
+            block[0] += 1
+
+        return f"{prefix}{new_id}"
+
+    def reset(self, counter_name: str = None):
+        """Forget in-memory blocks (all, or for one table)."""
+        with self._lock:
+            if counter_name:
+                self._blocks.pop(counter_name, None)
+            else:
+                self._blocks.clear()
+
+    def _reserve_block(self, db: Session, model, prefix: str, id_field: str):
+        bind = db.get_bind()
+        engine = getattr(bind, "engine", bind)
+        counter_name = model.__tablename__
+
+        with engine.begin() as conn:
+            end_value = self._bump(conn, counter_name)
+            if end_value is None:
+                # First use of this counter: seed it past the highest existing ID
+                seed = self._highest_existing_id(conn, model, prefix, id_field) + 1
+                conn.execute(
+                    insert(IdCounter)
+                    .values(counter_name=counter_name, next_value=seed)
+                    .on_conflict_do_nothing(index_elements=["counter_name"])
+                )
+                end_value = self._bump(conn, counter_name)
+
+        start_value = end_value - self.block_size
+        logger.debug(f"Reserved IDs {prefix}{start_value}..{prefix}{end_value - 1} for {counter_name}")
+        return start_value, end_value
+
+    def _bump(self, conn, counter_name: str):
+        return conn.execute(
+            update(IdCounter)
+            .where(IdCounter.counter_name == counter_name)
+            .values(next_value=IdCounter.next_value + self.block_size)
+            .returning(IdCounter.next_value)
+        ).scalar()
+
+    def _highest_existing_id(self, conn, model, prefix: str, id_field: str) -> int:
+        column = getattr(model, id_field)
+        numeric_part = cast(func.substring(column, len(prefix) + 1), BigInteger)
+        highest = conn.execute(
+            select(func.max(numeric_part)).where(column.regexp_match(f"^{re.escape(prefix)}[0-9]+$"))
+        ).scalar()
+        return highest or 0
+
+
+id_allocator = IdAllocator(block_size=settings.ID_BLOCK_SIZE)
@@ -0,0 +1,178 @@
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """State of one submitted job; its function reports progress through set_total/advance/add_error."""
+
+    def __init__(self, kind: str, params: dict):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = "queued"   # queued -> running -> succeeded | failed
+        self.phase = None
+        self.total = None
+        self.done = 0
+        self.result = None
+        self.errors = []
+        self.submitted_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.coalesced = 0       # triggers that joined this job instead of starting their own
+        self._started = None
+        self._counting_since = None
+        self._lock = threading.Lock()
+
+    def set_phase(self, phase: str, total: int = None):
+        """Start a new phase; `total` resets the done/total counter."""
+        with self._lock:
+            self.phase = phase
+            if total is not None:
+                self.total = total
+                self.done = 0
+                self._counting_since = time.monotonic()
+
+    def set_total(self, total: int):
+        with self._lock:
+            self.total = total
+
+    def advance(self, count: int = 1):
+        with self._lock:
+            self.done += count
+
+    def add_error(self, message: str):
+        with self._lock:
+            self.errors.append(message)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            elapsed = None
+            rate = eta = None
+            if self._started is not None:
+                now = time.monotonic()
+                elapsed = now - self._started
+                # Rate over the current phase's counter
+                counting = now - (self._counting_since or self._started)
+                if self.status == "running" and self.done and counting > 0:
+                    rate = self.done / counting
+                    if self.total is not None:
+                        eta = max(self.total - self.done, 0) / rate
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "params": self.params,
+                "status": self.status,
+                "phase": self.phase,
+                "progress": {
+                    "done": self.done,
+                    "total": self.total,
+                    "rate_per_second": round(rate, 2) if rate is not None else None,
+                    "eta_seconds": round(eta, 1) if eta is not None else None,
+                },
+                "elapsed_seconds": round(elapsed, 1) if elapsed is not None else None,
+                "coalesced_triggers": self.coalesced,
+                "result": self.result,
+                "errors": list(self.errors),
+                "submitted_at": self.submitted_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class JobExecutor:
+    """
+    Runs jobs on their own threads, off the event loop, and keeps their state for status
+    endpoints. A job function is called as func(job, **params) and its return value becomes
+    job.result; it must open its own DB sessions.
+
+    One job per kind runs at a time. With a job running, a new trigger queues a follow-up job
+    (so data that arrived meanwhile is picked up); later triggers with the same params join
+    that queued job instead of piling up, and triggers with other params (e.g. force=True)
+    queue their own follow-up, run in order. The returned job's params are the ones it runs with.
+
+    Job state lives in this process only; the last `history` jobs are kept.
+    """
+
+    def __init__(self, name: str, history: int = 100):
+        self.name = name
+        self.history = history
+        self._jobs = OrderedDict()
+        self._running = {}   # kind -> Job
+        self._queued = {}    # kind -> [(Job, func), ...], one per distinct params, in trigger order
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func, **params) -> Job:
+        """Start a `kind` job, or return the one a concurrent trigger coalesces into."""
+        with self._lock:
+            queue = self._queued.setdefault(kind, [])
+            for queued, _ in queue:
+                if queued.params == params:
+                    with queued._lock:
+                        queued.coalesced += 1
+                    return queued
+
+            job = Job(kind, params)
+            self._remember(job)
+            if kind in self._running:
+                queue.append((job, func))
+                logger.info(f"⏳ {kind} is running, queued follow-up job {job.id}")
+                return job
+            self._start(job, func)
+            return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _remember(self, job: Job):
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in ("queued", "running"):
+                break
+            del self._jobs[oldest_id]
+
+    def _start(self, job: Job, func):
+        # Called with self._lock held
+        self._running[job.kind] = job
+        threading.Thread(
+            target=self._run,
+            args=(job, func),
+            name=f"{self.name}-{job.kind}-{job.id[:8]}",
+            daemon=True,
+        ).start()
+
+    def _run(self, job: Job, func):
+        with job._lock:
+            job.status = "running"
+            job.started_at = datetime.now()
+            job._started = time.monotonic()
+        try:
+            result = func(job, **job.params)
+            with job._lock:
+                job.result = result
+                job.status = "succeeded"
+            logger.info(f"✅ Job {job.kind} {job.id} finished")
+        except Exception as e:
+            logger.exception(f"❌ Job {job.kind} {job.id} failed")
+            with job._lock:
+                job.errors.append(f"{type(e).__name__}: {e}")
+                job.status = "failed"
+        finally:
+            with job._lock:
+                job.finished_at = datetime.now()
+            with self._lock:
+                del self._running[job.kind]
+                queue = self._queued.get(job.kind)
+                if queue:
+                    self._start(*queue.pop(0))
+
+
+# Background jobs started from API requests (odds calculation, ...)
+job_executor = JobExecutor("jobs")
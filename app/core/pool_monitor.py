@@ -0,0 +1,191 @@
+import time
+import threading
+import logging
+import traceback
+from collections import deque
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMonitor:
+    """
+    Telemetry for one engine's connection pool: how long checkouts wait, how many
+    connections are in use or in overflow, and which code is holding a connection
+    for longer than `leak_threshold` seconds (with the stack of the acquirer).
+    """
+
+    def __init__(self, name: str, role: str, leak_threshold: float, track_stacks: bool = True, sample_size: int = 1000):
+        self.name = name
+        self.role = role
+        self.leak_threshold = leak_threshold
+        self.track_stacks = track_stacks
+        self.pool = None
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._held = {}  # id(connection_record) -> checkout info
+        self._leaks_reported = 0
+
+    def attach(self, engine):
+        """Hook the monitor into an engine built with one of the Timed*Pool classes."""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        sync_engine.pool.monitor = self
+        self.pool = sync_engine.pool
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+        event.listen(sync_engine, "close", self._on_checkin)
+        return engine
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self._waits.append(seconds)
+            self._total_wait += seconds
+            self._max_wait = max(self._max_wait, seconds)
+            if timed_out:
+                self._timeouts += 1
+        if timed_out:
+            logger.error(f"❌ [{self.name}] Pool checkout timed out after {seconds:.1f}s; current holders:")
+            for holder in self.long_held(min_seconds=0, include_stacks=True):
+                logger.error(f"   held {holder['held_seconds']}s by {holder['thread']}\n{holder['stack'] or ''}")
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        stack = "".join(traceback.format_stack(limit=25)[:-2]) if self.track_stacks else None
+        with self._lock:
+            self._checkouts += 1
+            self._held[id(connection_record)] = {
+                "since": time.monotonic(),
+                "thread": threading.current_thread().name,
+                "stack": stack,
+                "reported": False,
+            }
+        self._report_leaks()
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._held.pop(id(connection_record), None)
+
+    def long_held(self, min_seconds: float = None, include_stacks: bool = False) -> list:
+        """
+        Connections checked out for longer than min_seconds (default: the leak threshold).
+        Acquiring stacks are for logs only and are left out unless include_stacks is set.
+        """
+        threshold = self.leak_threshold if min_seconds is None else min_seconds
+        now = time.monotonic()
+        with self._lock:
+            held = list(self._held.values())
+        return [
+            {
+                "held_seconds": round(now - info["since"], 1),
+                "thread": info["thread"],
+                **({"stack": info["stack"]} if include_stacks else {}),
+            }
+            for info in sorted(held, key=lambda info: info["since"])
+            if now - info["since"] >= threshold
+        ]
+
+    def _report_leaks(self):
+        now = time.monotonic()
+        with self._lock:
+            leaked = [info for info in self._held.values()
+                      if not info["reported"] and now - info["since"] >= self.leak_threshold]
+            for info in leaked:
+                info["reported"] = True
+            self._leaks_reported += len(leaked)
+        for info in leaked:
+            acquired_at = f" Acquired at:\n{info['stack']}" if info["stack"] else ""
+            logger.warning(
+                f"⚠ [{self.name}] Connection held for {now - info['since']:.0f}s by {info['thread']}, "
+                f"possible leaked session.{acquired_at}"
+            )
+
+    def snapshot(self) -> dict:
+        self._report_leaks()
+        with self._lock:
+            waits = sorted(self._waits)
+            checkouts, timeouts = self._checkouts, self._timeouts
+            total_wait, max_wait = self._total_wait, self._max_wait
+            leaks_reported = self._leaks_reported
+
+        def percentile(p):
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 2) if waits else 0.0
+
+        pool = self.pool
+        return {
+            "name": self.name,
+            "role": self.role,
+            "pool_size": pool.size() if pool is not None else None,
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            "checked_in": pool.checkedin() if pool is not None else None,
+            "checked_out": pool.checkedout() if pool is not None else None,
+            "overflow": max(pool.overflow(), 0) if pool is not None else None,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms": {
+                "avg": round(total_wait / checkouts * 1000, 2) if checkouts else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": round(max_wait * 1000, 2),
+            },
+            "leaks_reported": leaks_reported,
+            "long_held": self.long_held(),
+        }
+
+
+class _TimedPoolMixin:
+    """Measures how long each checkout waits for a free connection."""
+    monitor = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            if self.monitor is not None:
+                self.monitor.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.monitor is not None:
+            self.monitor.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting to the same monitor
+        new_pool = super().recreate()
+        new_pool.monitor = self.monitor
+        if self.monitor is not None:
+            self.monitor.pool = new_pool
+        return new_pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+def register_monitor(monitor: PoolMonitor):
+    with _monitors_lock:
+        _monitors[monitor.name] = monitor
+    return monitor
+
+
+def unregister_monitor(name: str):
+    with _monitors_lock:
+        _monitors.pop(name, None)
+
+
+def pool_metrics() -> list:
+    """Snapshots of every monitored pool in this process."""
+    with _monitors_lock:
+        monitors = list(_monitors.values())
+    return [monitor.snapshot() for monitor in monitors]
@@ -0,0 +1,141 @@
+import re
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar = ContextVar("query_stats", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\((?:\s*(?:\?|%\([^)]+\)s|\$\d+)\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Statement with literals and IN-lists blanked out, so repeats of one query compare equal."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """Statements, DB time and repeated fingerprints for one request or job."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.closed = False
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float):
+        with self._lock:
+            if self.closed:
+                # e.g. a background task that outlived the request it was started from
+                return
+            self.count += 1
+            self.db_time += seconds
+            self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = None) -> list:
+        """Fingerprints executed at least `threshold` times: likely N+1 loops."""
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+        return self
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def report(self):
+        suspects = self.repeated()
+        level = logging.INFO if settings.DEBUG else logging.DEBUG
+        logger.log(
+            level,
+            f"[{self.label}] {self.count} queries, {self.db_time * 1000:.1f}ms DB of {self.elapsed * 1000:.1f}ms total"
+        )
+        for sql, n in suspects:
+            logger.warning(f"⚠ [{self.label}] Possible N+1: executed {n}x: {sql[:300]}")
+        return suspects
+
+
+# Registered on the Engine class so every engine (sync, background, async, rebuilt) is covered
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start = getattr(context, "_query_stats_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+@contextmanager
+def track_queries(label: str):
+    """Collect query stats for everything run inside the block (e.g. a scheduled job)."""
+    stats = QueryStats(label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        stats.close().report()
+
+
+def current_query_stats():
+    return _current_stats.get()
+
+
+class QueryStatsMiddleware:
+    """
+    Counts SQL statements per HTTP request and logs them, flagging N+1 patterns.
+    In DEBUG mode the totals are also returned as X-DB-* response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        stats = QueryStats(label)
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.db_time * 1000:.1f}".encode()))
+                headers.append((b"x-db-n-plus-one", str(len(stats.repeated())).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            stats.close().report()
@@ -0,0 +1,145 @@
+import threading
+import logging
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class CachedRow:
+    """Read-only snapshot of a reference row, safe to share between sessions and threads."""
+
+    def __init__(self, model, values: dict):
+        self.__dict__.update(values)
+        self.__dict__["_model"] = model
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self._model.__name__} snapshots are read-only")
+
+    def __repr__(self):
+        values = ", ".join(f"{k}={v!r}" for k, v in self.__dict__.items() if k != "_model")
+        return f"<Cached{self._model.__name__} {values}>"
+
+
+class _TableCache:
+    def __init__(self, model, keys: tuple, groups: tuple):
+        self.model = model
+        self.keys = keys          # unique lookups: field -> {value: row}
+        self.groups = groups      # one-to-many lookups: field -> {value: [rows]}
+        self.loaded = False
+        self.clear()
+
+    def clear(self):
+        self.rows = []
+        self.by_key = {field: {} for field in self.keys}
+        self.by_group = {field: {} for field in self.groups}
+        self.loaded = False
+
+    def put(self, row: CachedRow):
+        for field in self.keys:
+            value = getattr(row, field)
+            if value is not None:
+                # Keep the first row seen for non-unique keys (e.g. league_code)
+                self.by_key[field].setdefault(value, row)
+        for field in self.groups:
+            self.by_group[field].setdefault(getattr(row, field), []).append(row)
+        self.rows.append(row)
+
+
+class ReferenceDataCache:
+    """
+    Process-wide cache for small, rarely changing reference tables (leagues, seasons,
+    countries, referees, teams and team aliases).
+
+    Each table is loaded in full on first use and then served from memory. Services call
+    add() after committing a new row and invalidate() when rows change behind their back.
+    get() only consults memory; lookup() falls back to the database on a miss.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tables = {}
+
+    def register(self, model, keys: tuple, groups: tuple = ()):
+        with self._lock:
+            self._tables[model] = _TableCache(model, keys, groups)
+
+    def _table(self, db: Session, model) -> _TableCache:
+        table = self._tables.get(model)
+        if table is None:
+            raise KeyError(f"{model.__name__} is not a cached reference table")
+        if not table.loaded:
+            with self._lock:
+                if not table.loaded:
+                    rows = db.query(model).all()
+                    for obj in rows:
+                        table.put(self._snapshot(obj))
+                    table.loaded = True
+                    logger.info(f"📚 Loaded {len(rows)} {model.__tablename__} rows into the reference cache")
+        return table
+
+    def _snapshot(self, obj) -> CachedRow:
+        mapper = inspect(obj).mapper
+        return CachedRow(mapper.class_, {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs})
+
+    def get(self, db: Session, model, field: str, value):
+        """Return the cached row where field == value, or None. Never queries after the first load."""
+        if value is None:
+            return None
+        return self._table(db, model).by_key[field].get(value)
+
+    def lookup(self, db: Session, model, field: str, value):
+        """Like get(), but checks the database on a miss and caches what it finds."""
+        row = self.get(db, model, field, value)
+        if row is None and value is not None:
+            obj = db.query(model).filter(getattr(model, field) == value).first()
+            if obj is not None:
+                row = self.add(obj)
+        return row
+
+    def group(self, db: Session, model, field: str, value) -> list:
+        """Return every cached row where field == value (e.g. all aliases of a team)."""
+        return list(self._table(db, model).by_group[field].get(value, []))
+
+    def all(self, db: Session, model) -> list:
+        return list(self._table(db, model).rows)
+
+    def add(self, obj) -> CachedRow:
+        """Cache a committed ORM row and return its snapshot."""
+        row = self._snapshot(obj)
+        table = self._tables.get(row._model)
+        if table is not None:
+            with self._lock:
+                # Rows added before the first load are picked up by the load itself
+                if table.loaded and table.by_key[table.keys[0]].get(getattr(row, table.keys[0])) is None:
+                    table.put(row)
+        return row
+
+    def invalidate(self, model=None):
+        """Drop one table (or every table); it is reloaded on next use."""
+        with self._lock:
+            tables = [self._tables[model]] if model is not None else self._tables.values()
+            for table in tables:
+                table.clear()
+
+
+def _build_reference_cache() -> ReferenceDataCache:
+    from app.leagues.models.leagues_models import League
+    from app.seasons.models.seasons_model import Season
+    from app.country.models.country_model import Country
+    from app.referee.models.referee_model import Referee
+    from app.teams.models.team_model import Team
+    from app.teams.models.team_alias_model import TeamAlias
+
+    cache = ReferenceDataCache()
+    # The first key of each table must be its primary key
+    cache.register(League, keys=("league_id", "league_name", "league_code"))
+    cache.register(Season, keys=("season_id", "season_year"))
+    cache.register(Country, keys=("country_id", "country_name"))
+    cache.register(Referee, keys=("ref_id", "ref_name"))
+    cache.register(Team, keys=("team_id", "team_name"))
+    cache.register(TeamAlias, keys=("alias_id", "alias_name"), groups=("team_id",))
+    return cache
+
+
+reference_cache = _build_reference_cache()
@@ -0,0 +1,57 @@
+import time
+import hashlib
+import threading
+
+
+class CachedResponse:
+    """A serialized response body with its ETag."""
+    __slots__ = ("body", "etag", "versions", "built_at")
+
+    def __init__(self, body: bytes, versions: tuple, built_at: float):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.versions = versions
+        self.built_at = built_at
+
+
+class ResponseCache:
+    """
+    Serialized responses keyed by request parameters. An entry is served while the data
+    versions it was built from are current and it is younger than `ttl_seconds` (for
+    payloads that also depend on the clock). On a miss, concurrent callers for the same key
+    wait for one build instead of each running it (single flight).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, versions: tuple, build) -> CachedResponse:
+        """Cached response for `key`, or build() -> bytes run once and stored under `versions`."""
+        entry = self._fresh(key, versions)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another caller may have built it while this one waited
+            entry = self._fresh(key, versions)
+            if entry is not None:
+                return entry
+            entry = CachedResponse(build(), versions, time.monotonic())
+            self._entries[key] = entry
+            return entry
+
+    def invalidate(self):
+        self._entries.clear()
+
+    def _fresh(self, key, versions: tuple):
+        entry = self._entries.get(key)
+        if entry is None or entry.versions != versions:
+            return None
+        if time.monotonic() - entry.built_at >= self.ttl_seconds:
+            return None
+        return entry
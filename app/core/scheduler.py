@@ -2,126 +2,108 @@ import logging
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from app.live_data.services.live_game_date_service import LiveGameDataService
-from app.core.database import SessionLocal
-from app.core.cleanup_function import cleanup_connections
-from multiprocessing import Process
-import httpx
-import sys
+from app.core.config import settings
+from app.core.query_stats import track_queries
+from app.core.worker_pool import WorkerPool, warm_resource
 
 logger = logging.getLogger(__name__)
 
 base_url = "https://api.betgenieuk.com"
 headers = {"Content-Type": "application/json"}
 
+# Long-lived processes that run the jobs below; see WorkerPool
+job_pool = WorkerPool(
+    "scheduler",
+    size=settings.WORKER_POOL_SIZE,
+    role="scheduler",
+    max_jobs=settings.WORKER_MAX_JOBS,
+    max_rss_mb=settings.WORKER_MAX_RSS_MB,
+)
+
+
+# --- Jobs: these run inside a job_pool worker process ---
 
 def fetch_betfair_odds():
-    """Fetch Betfair odds in a separate process to avoid blocking"""
+    """Fetch Betfair odds (the Betfair session token is reused between runs)"""
     from app.core.database import SessionLocal
     from app.new_odds.services.betfair_service import BetfairService
 
     db = SessionLocal()
     try:
-        service = BetfairService(db)
-        service.display_filtered_competitions_and_markets()
-    except Exception as e:
-        logger.error(f"❌ Error in fetch_betfair_odds: {e}")
+        with track_queries("job:fetch_betfair_odds"):
+            service = BetfairService(db)
+            service.display_filtered_competitions_and_markets()
     finally:
         db.close()
 
 
-def fetch_league_scraper():
-    """Run league table scraper in a separate process"""
-    import asyncio
+def _http_client():
+    import httpx
 
-    async def task():
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{base_url}/current-league/scrape-current-league/",
-                json={"scraper_name": "thefishy"},
-                headers=headers
-            )
-            logger.info(f"📨 League scraper status: {resp.status_code}")
+    return warm_resource("http_client", lambda: httpx.Client(timeout=30.0, headers=headers))
 
-    asyncio.run(task())
 
+def fetch_league_scraper():
+    """Trigger the league table scraper on the API"""
+    resp = _http_client().post(
+        f"{base_url}/current-league/scrape-current-league/",
+        json={"scraper_name": "thefishy"},
+    )
+    logger.info(f"📨 League scraper status: {resp.status_code}")
 
-def calculate_odds():
-    """Run odds calculation in a separate process"""
-    import asyncio
-
-    async def task():
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(f"{base_url}/odds-calculation/calculate-ratios/", headers=headers)
-            logger.info(f"📨 Odds calculation status: {resp.status_code}")
 
-    asyncio.run(task())
+def calculate_odds():
+    """Trigger the odds calculation on the API"""
+    resp = _http_client().post(f"{base_url}/odds-calculation/calculate-ratios/")
+    logger.info(f"📨 Odds calculation status: {resp.status_code}")
 
 
 def live_game_update():
-    """Heavy live game update job"""
+    """Heavy live game update job (keeps one Chromium open between runs)"""
+    from app.core.database import SessionLocal
+    from app.live_data.services.live_game_date_service import LiveGameDataService
+    from app.live_data.services.sofa_service import SofaScoreService
+
+    sofa_service = warm_resource("sofascore", lambda: SofaScoreService(persistent=True))
     db = SessionLocal()
-    service = LiveGameDataService(db=db)
     try:
-        service.check_and_update_live_games()
-    except Exception as e:
-        logger.error(f"❌ Error in live_game_update: {e}")
+        with track_queries("job:live_game_update"):
+            LiveGameDataService(db=db, sofa_service=sofa_service).check_and_update_live_games()
     finally:
         db.close()
 
-    sys.exit(0)
+
+def _run_job(label: str, job: str, timeout: float = None):
+    try:
+        job_pool.run(f"{__name__}:{job}", timeout=timeout)
+        logger.info(f"✅ {label} finished")
+    except TimeoutError as e:
+        logger.warning(f"⚠ {label} timed out: {e}")
+    except Exception as e:
+        logger.error(f"❌ Error in {label}: {e}")
 
 
 def start_scheduler():
     scheduler = BackgroundScheduler()
+    job_pool.start()
 
     # Step 1: Betfair Odds at 4:00 AM
     @scheduler.scheduled_job(CronTrigger(hour=4, minute=0))
     def step1_job():
         logger.info("🔁 Running Step 1: Betfair Odds")
-        p = Process(target=fetch_betfair_odds)
-        try:
-            p.start()
-            p.join()
-        except Exception as e:
-            logger.error(f"❌ Error in step1job betfair odds getting process: {e}")
-        finally:
-            if p.is_alive():
-                p.terminate()
-                p.join()  
-                logger.warning("⚠  betfair odds Process terminated forcefully")
+        _run_job("step1_job betfair odds", "fetch_betfair_odds", timeout=settings.SCHEDULED_JOB_TIMEOUT_SECONDS)
 
     # Step 2: League table scraper at 4:15 AM
     @scheduler.scheduled_job(CronTrigger(hour=4, minute=15))
     def step2_job():
         logger.info("🔁 Running Step 2: League table scraper")
-        p = Process(target=fetch_league_scraper)
-        try:
-            p.start()
-            p.join()
-        except Exception as e:
-            logger.error(f"❌ Error in step2_job fishy table process: {e}")
-        finally:
-            if p.is_alive():
-                p.terminate()
-                p.join()  
-                logger.warning("⚠ fishy table Process terminated forcefully")
+        _run_job("step2_job fishy table", "fetch_league_scraper", timeout=settings.SCHEDULED_JOB_TIMEOUT_SECONDS)
 
     # Step 3: Odds calculation at 4:30 AM
     @scheduler.scheduled_job(CronTrigger(hour=4, minute=30))
     def step3_job():
         logger.info("🔁 Running Step 3: Odds calculation")
-        p = Process(target=calculate_odds)
-        try:
-            p.start()
-            p.join()
-        except Exception as e:
-            logger.error(f"❌ Error in step3_job calculate  process: {e}")
-        finally:
-            if p.is_alive():
-                p.terminate()
-                p.join()  
-                logger.warning("⚠ step3_job calculate Process terminated forcefully")
+        _run_job("step3_job calculate", "calculate_odds", timeout=settings.SCHEDULED_JOB_TIMEOUT_SECONDS)
 
 
     # Test print job every 6 minutes
@@ -131,28 +113,11 @@ def start_scheduler():
         logger.info("!!!! This is testing and printing scheduler !!!!")
         logger.info("-------------------------")
 
-    # Live game update every 6 minutes (heavy)
+    # Live game update every 5 minutes (heavy), capped at LIVE_UPDATE_TIMEOUT_SECONDS
     @scheduler.scheduled_job(IntervalTrigger(minutes=5),max_instances=1)
     def scheduled_live_update():
         logger.info("🔁 Running scheduled check_and_update_live_games()")
-        p = Process(target=live_game_update)
-        try:
-            p.start()
-            # Wait up to 3 minutes (180 seconds) for process to finish
-            p.join(timeout=300)  # wait for process to finish
-        except Exception as e:
-            logger.error(f"❌ Error in scheduled_live_update process: {e}")
-        finally:
-            if p.is_alive():
-                logger.warning("⚠ live_game_update Process exceeded 6 mins, terminating...")
-                p.terminate()
-                p.join()
-                logger.warning("⚠ live_game_update Process terminated forcefully")
-            else:
-                logger.info("✅ live_game_update finished within 6 mins")   
-
-            # 🔑 Cleanup DB connections
-            cleanup_connections()
+        _run_job("live_game_update", "live_game_update", timeout=settings.LIVE_UPDATE_TIMEOUT_SECONDS)
 
 
     scheduler.start()
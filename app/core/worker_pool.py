@@ -0,0 +1,225 @@
+import os
+import queue
+import logging
+import resource
+import importlib
+import threading
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+# Resources kept alive for the lifetime of a worker process (browser, HTTP client, ...)
+_warm_resources = {}
+
+
+def warm_resource(name: str, factory):
+    """
+    Return the worker-local resource called `name`, creating it with factory() on first use.
+    Resources with a close() method are closed when the worker exits or is recycled.
+    """
+    if name not in _warm_resources:
+        _warm_resources[name] = factory()
+    return _warm_resources[name]
+
+
+def _close_warm_resources():
+    for name, resource_obj in list(_warm_resources.items()):
+        close = getattr(resource_obj, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"⚠ Failed to close warm resource '{name}': {e}")
+    _warm_resources.clear()
+
+
+def _vm_rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass  # exited meanwhile, or a kernel thread
+    return 0
+
+
+def _descendant_pids(root: int) -> list:
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The name field may contain spaces, so split after its closing parenthesis
+                ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    pids, pending = [], [root]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            pids.append(child)
+            pending.append(child)
+    return pids
+
+
+def _tree_rss_mb() -> float:
+    """
+    Current RSS of this worker plus all its descendants, e.g. the Chromium processes a warm
+    browser keeps running, which is what tends to grow between recycles.
+    """
+    if not os.path.isdir("/proc"):
+        # No procfs: fall back to this process's own peak (KB on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    pid = os.getpid()
+    return sum(_vm_rss_kb(p) for p in [pid, *_descendant_pids(pid)]) / 1024
+
+
+def _resolve(job: str):
+    module_name, func_name = job.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _worker_main(conn, role: str, max_jobs: int, max_rss_mb: int):
+    """Worker loop: run jobs from the pipe until told to stop or due for recycling."""
+    logging.basicConfig(level=logging.INFO)
+    from app.core.database import configure_process_role
+
+    configure_process_role(role)
+    jobs_done = 0
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+
+            job, args = message
+            try:
+                reply = ("ok", _resolve(job)(*args))
+            except Exception as e:
+                logger.exception(f"❌ Job {job} failed")
+                reply = ("error", f"{type(e).__name__}: {e}")
+
+            jobs_done += 1
+            rss_mb = _tree_rss_mb()
+            recycle = jobs_done >= max_jobs or rss_mb >= max_rss_mb
+            conn.send(reply + ({"jobs_done": jobs_done, "rss_mb": round(rss_mb, 1), "recycle": recycle},))
+            if recycle:
+                break
+    finally:
+        _close_warm_resources()
+        conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, name: str, role: str, max_jobs: int, max_rss_mb: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, role, max_jobs, max_rss_mb),
+            name=name,
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, timeout: float = 10):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Long-lived worker processes for scheduled jobs. Jobs are "module:function" paths run
+    in a separate process (so a crash or hang can't take the API down), but the process
+    is reused, keeping DB pools, Betfair tokens, alias data and browsers warm between runs.
+
+    run() blocks until a worker is free and the job has finished; with a timeout, waiting for
+    a worker and running the job are each capped by it. A job that exceeds its timeout gets
+    its worker terminated and replaced. Workers retire themselves after `max_jobs` jobs or
+    once their RSS, counting child processes such as a warm browser, passes `max_rss_mb`,
+    and are replaced.
+    """
+
+    def __init__(self, name: str, size: int, role: str = "scheduler", max_jobs: int = 50, max_rss_mb: int = 1024):
+        self.name = name
+        self.size = size
+        self.role = role
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        # spawn, not fork: workers outlive many jobs and must not inherit the API's threads and sockets
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._spawned = 0
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(self._spawn())
+            self._started = True
+        logger.info(f"✅ Worker pool '{self.name}' started with {self.size} workers")
+
+    def _spawn(self) -> _Worker:
+        self._spawned += 1
+        return _Worker(self._ctx, f"{self.name}-worker-{self._spawned}", self.role, self.max_jobs, self.max_rss_mb)
+
+    def run(self, job: str, args: tuple = (), timeout: float = None):
+        """Run `job` on the next free worker and return its result. Raises TimeoutError or RuntimeError."""
+        self.start()
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No free worker for {job} within {timeout}s")
+        try:
+            if not worker.process.is_alive():
+                logger.warning(f"⚠ {worker.process.name} had exited, replacing it")
+                worker = self._spawn()
+
+            worker.conn.send((job, args))
+            if not worker.conn.poll(timeout):
+                logger.warning(f"⚠ {job} exceeded {timeout}s on {worker.process.name}, terminating the worker")
+                worker.kill()
+                worker = self._spawn()
+                raise TimeoutError(f"{job} exceeded {timeout}s")
+
+            status, payload, info = worker.conn.recv()
+            if info["recycle"]:
+                logger.info(f"♻ Recycling {worker.process.name} after {info['jobs_done']} jobs (RSS incl. children {info['rss_mb']}MB)")
+                worker.process.join(10)
+                worker = self._spawn()
+
+            if status == "error":
+                raise RuntimeError(payload)
+            return payload
+        except (EOFError, BrokenPipeError, ConnectionResetError):
+            logger.error(f"❌ {worker.process.name} died while running {job}, replacing it")
+            worker.kill()
+            worker = self._spawn()
+            raise RuntimeError(f"Worker died while running {job}")
+        finally:
+            self._idle.put(worker)
+
+    def shutdown(self):
+        with self._lock:
+            while not self._idle.empty():
+                self._idle.get_nowait().stop()
+            self._started = False
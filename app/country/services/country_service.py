@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.country.models.country_model import Country
 from app.core.utils import generate_custom_id
+from app.core.reference_cache import reference_cache
 
 class CountryService:
     def __init__(self, db: Session):
@@ -35,8 +36,8 @@ class CountryService:
             raise ValueError(f"Unknown division code: {division}")
 
         try:
-            # Check if country already exists in the database
-            country = self.db.query(Country).filter(Country.country_name == country_name).first()
+            # Check if country already exists (cache first, then the database)
+            country = reference_cache.lookup(self.db, Country, "country_name", country_name)
 
             if not country:
                 # Generate a structured ID like C1, C2, C10000
@@ -47,6 +48,7 @@ class CountryService:
                     country_id=new_id,  # Generate unique country ID
                     country_name=country_name      # Save the corresponding country name
                 )
+                # Not cached here: the caller commits it, and a rollback would leave a stale entry
                 self.db.add(country)
 
             return country
@@ -2,8 +2,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 import json
 import asyncio
-from app.core.database import SessionLocal
-from app.scraper.scraper_manager import ScraperManager
+from app.core.database import BackgroundSessionLocal
+from app.core.query_stats import track_queries
 
 router = APIRouter()
 
@@ -29,14 +29,17 @@ async def scrape_current_league(scraper_name: str = "thefishy"):
     print(f"🟠 Loaded {len(urls)} URLs for {scraper_name}")
 
     async def background_scrape():
+        from app.scraper.scraper_manager import ScraperManager  # loads the browser stack, so only on demand
+
         # Create a fresh DB session for the background task
-        db: Session = SessionLocal()
+        db: Session = BackgroundSessionLocal()
         try:
-            for idx, url in enumerate(urls):
-                print(f"🟣 Scraping URL {idx+1}/{len(urls)}: {url}")
-                scraper_manager = ScraperManager(scraper_name, db)
-                await scraper_manager.run_scraper(url)
-                print(f"✅ Finished {idx+1}/{len(urls)}: {url}")
+            with track_queries(f"task:scrape_current_league:{scraper_name}"):
+                for idx, url in enumerate(urls):
+                    print(f"🟣 Scraping URL {idx+1}/{len(urls)}: {url}")
+                    scraper_manager = ScraperManager(scraper_name, db)
+                    await scraper_manager.run_scraper(url)
+                    print(f"✅ Finished {idx+1}/{len(urls)}: {url}")
             print(f"✅ Scraping completed for {scraper_name}")
         except Exception as e:
             print(f"❌ Error during scraping: {e}")
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, ForeignKey, Integer
+from sqlalchemy import Column, String, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class CurrentLeague(Base):
     __tablename__ = "current_league"
+    __table_args__ = (
+        Index("ix_current_league_team_season", "team_id", "season_id"),
+    )
 
     current_league_id = Column(String, primary_key=True, index=True)
     team_id = Column(String, ForeignKey("teams.team_id"), nullable=False)
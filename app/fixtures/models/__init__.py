@@ -0,0 +1 @@
+from .fixture_model import Fixture
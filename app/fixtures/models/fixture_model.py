@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Time, UniqueConstraint
+from app.core.database import Base
+
+
+class Fixture(Base):
+    """
+    One real-world match, shared by NewOdds, OddsCalculation and LiveGameData (fixture_id)
+    and holding the IDs the external feeds know it by, so services join on it instead of
+    re-matching (date, time, home, away) or parsing stored market JSON.
+    """
+    __tablename__ = "fixtures"
+    __table_args__ = (
+        UniqueConstraint("date", "time", "home_team_id", "away_team_id", name="uq_fixtures_fixture"),
+    )
+
+    fixture_id = Column(String, primary_key=True, index=True)
+    date = Column(DateTime, nullable=False)
+    time = Column(Time, nullable=False)
+
+    home_team_id = Column(String, ForeignKey("teams.team_id"), nullable=False)
+    away_team_id = Column(String, ForeignKey("teams.team_id"), nullable=False)
+
+    # Betfair event (live games are matched by it) and its MATCH_ODDS market
+    betfair_event_id = Column(String, nullable=True, index=True)
+    betfair_event_name = Column(String, nullable=True)
+    betfair_market_id = Column(String, nullable=True)
+    # Remembered after the first name match, so later live updates match by ID
+    sofascore_event_id = Column(String, nullable=True, index=True)
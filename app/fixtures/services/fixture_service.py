@@ -0,0 +1,91 @@
+from sqlalchemy import func, or_, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, date, time
+from app.fixtures.models.fixture_model import Fixture
+from app.core.utils import generate_custom_id
+
+# Feed IDs a writer may know for a fixture; None means "not known here", never "clear it"
+EXTERNAL_ID_COLUMNS = ("betfair_event_id", "betfair_event_name", "betfair_market_id", "sofascore_event_id")
+
+
+def fixture_key(row) -> tuple:
+    """(date, time, home_team_id, away_team_id) of a dict or model row; dates become midnight datetimes."""
+    get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+    match_date = get("date")
+    if isinstance(match_date, date) and not isinstance(match_date, datetime):
+        match_date = datetime.combine(match_date, time.min)
+    return (match_date, get("time"), get("home_team_id"), get("away_team_id"))
+
+
+class FixtureService:
+    BULK_CHUNK_SIZE = 500
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ensure_fixtures(self, rows: list, chunk_size: int = None) -> dict:
+        """
+        Get or create the fixtures for many rows (dicts with date, time, home_team_id,
+        away_team_id and optionally EXTERNAL_ID_COLUMNS) in the caller's transaction;
+        nothing is committed. Given external IDs overwrite stored ones, missing ones keep
+        them. Returns {fixture_key: fixture_id}.
+        """
+        chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+        rows_by_key = {}  # fixture key -> row; later non-empty IDs win
+        for row in rows:
+            key = fixture_key(row)
+            merged = rows_by_key.get(key)
+            if merged is None:
+                merged = rows_by_key[key] = {
+                    "fixture_id": generate_custom_id(self.db, Fixture, "FX", "fixture_id"),
+                    "date": key[0],
+                    "time": key[1],
+                    "home_team_id": key[2],
+                    "away_team_id": key[3],
+                    **{column: None for column in EXTERNAL_ID_COLUMNS},
+                }
+            for column in EXTERNAL_ID_COLUMNS:
+                if row.get(column) is not None:
+                    merged[column] = str(row[column])
+
+        values = list(rows_by_key.values())
+        ids_by_key = {}
+        for start in range(0, len(values), chunk_size):
+            stmt = insert(Fixture).values(values[start:start + chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_fixtures_fixture",
+                set_={
+                    column: func.coalesce(getattr(stmt.excluded, column), getattr(Fixture, column))
+                    for column in EXTERNAL_ID_COLUMNS
+                },
+                # Only rewrite the row when an ID actually changes
+                where=or_(*(
+                    getattr(stmt.excluded, column).is_not(None)
+                    & getattr(stmt.excluded, column).is_distinct_from(getattr(Fixture, column))
+                    for column in EXTERNAL_ID_COLUMNS
+                )),
+            ).returning(
+                # An existing fixture keeps its ID
+                Fixture.fixture_id, Fixture.date, Fixture.time, Fixture.home_team_id, Fixture.away_team_id,
+            )
+            for row in self.db.execute(stmt):
+                ids_by_key[(row.date, row.time, row.home_team_id, row.away_team_id)] = row.fixture_id
+
+        # Existing fixtures that needed no update aren't returned by the upsert
+        missing = [key for key in rows_by_key if key not in ids_by_key]
+        for start in range(0, len(missing), chunk_size):
+            existing = self.db.query(
+                Fixture.fixture_id, Fixture.date, Fixture.time, Fixture.home_team_id, Fixture.away_team_id,
+            ).filter(
+                tuple_(Fixture.date, Fixture.time, Fixture.home_team_id, Fixture.away_team_id)
+                .in_(missing[start:start + chunk_size])
+            )
+            for row in existing:
+                ids_by_key[(row.date, row.time, row.home_team_id, row.away_team_id)] = row.fixture_id
+
+        return ids_by_key
+
+    def ensure_fixture(self, row: dict) -> str:
+        """ensure_fixtures() for a single row; returns its fixture_id."""
+        return self.ensure_fixtures([row])[fixture_key(row)]
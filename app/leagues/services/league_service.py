@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.leagues.models import League
 from app.country.services.country_service import CountryService  # Assuming you have this
 from app.core.utils import generate_custom_id
+from app.core.reference_cache import reference_cache
 
 class LeagueService:
     LEAGUE_NAME_MAPPING = {
@@ -28,20 +29,12 @@ class LeagueService:
 
     def get_or_create_league(self, league_name: str):
         '''Retrieve a league by name or code, or create a new one if it doesn't exist.'''
-        # First try to find by full name
-        league = self.db.query(League).filter(League.league_name == league_name).first()
-        
+        league = self._find_league(league_name, cached=True)
         if not league:
-            # If not found, check if it's a league code (E0, E1, etc.)
-            league = self.db.query(League).filter(League.league_code == league_name).first()
-            
-            # If still not found, check if the full name exists in our mapping values
-            if not league:
-                # Find the code if this is a full name
-                for code, mapped_name in self.LEAGUE_NAME_MAPPING.items():
-                    if mapped_name == league_name:
-                        league = self.db.query(League).filter(League.league_code == code).first()
-                        break
+            # Not cached yet: another process may have created it
+            league = self._find_league(league_name, cached=False)
+            if league:
+                league = reference_cache.add(league)
 
         if not league:
             # Get the full league name from the mapping if it's a code, otherwise use the name as is
@@ -71,5 +64,30 @@ class LeagueService:
             self.db.add(league)
             self.db.commit()
             self.db.refresh(league)
+            league = reference_cache.add(league)
+
+        return league
+
+    def _find_league(self, league_name: str, cached: bool):
+        """Find a league by full name, by code, or by the code its mapped full name belongs to."""
+        if cached:
+            find = lambda field, value: reference_cache.get(self.db, League, field, value)
+        else:
+            find = lambda field, value: self.db.query(League).filter(getattr(League, field) == value).first()
+
+        # First try to find by full name
+        league = find("league_name", league_name)
+
+        if not league:
+            # If not found, check if it's a league code (E0, E1, etc.)
+            league = find("league_code", league_name)
+
+            # If still not found, check if the full name exists in our mapping values
+            if not league:
+                # Find the code if this is a full name
+                for code, mapped_name in self.LEAGUE_NAME_MAPPING.items():
+                    if mapped_name == league_name:
+                        league = find("league_code", code)
+                        break
 
         return league
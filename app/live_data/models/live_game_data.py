@@ -11,6 +11,7 @@ class LiveGameData(Base):
         primary_key=True,
         index=True
     )
+    fixture_id = Column(String, ForeignKey("fixtures.fixture_id"), nullable=True, index=True)
 
     is_live = Column(Boolean, default=False)
     scrape_url = Column(String, nullable=True)
@@ -39,3 +40,4 @@ class LiveGameData(Base):
 
     # Relationship to OddsCalculation
     odds_calculation = relationship("OddsCalculation", back_populates="live_data")
+    fixture = relationship("Fixture")
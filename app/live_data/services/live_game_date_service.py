@@ -1,25 +1,22 @@
 from datetime import datetime, timezone
 from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 from app.live_data.models.live_game_data import LiveGameData  # your model import path
 from app.live_data.services.sofa_service import SofaScoreService  # your model import path
 from app.odds_calculation.models.odds_calculation_model import OddsCalculation  # if needed for validation
-from app.new_odds.models.new_odds_model import NewOdds  # if needed for validation
+from app.fixtures.models.fixture_model import Fixture
 from app.teams.models.team_model import Team
-from app.new_odds.services.betfair_service import BetfairService
-import json
+from app.teams.services.team_alias_service import load_team_aliases
 import unicodedata
 
 
 class LiveGameDataService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, sofa_service: SofaScoreService = None):
         self.db = db
-        self.betfafairService = BetfairService(db)
-        self.sofa_service = SofaScoreService()
-        # Load team aliases from JSON file once
-        with open("app/teams/teams_aliases.json", "r") as f:
-            self.team_aliases = json.load(f)
+        self._betfair_service = None
+        self.sofa_service = sofa_service or SofaScoreService()
+        # Team aliases from the JSON file (cached per process)
+        self.team_aliases = load_team_aliases()
         # Create a mapping from lowercased alias to canonical name
         self.alias_to_team = {}
         for canonical, aliases in self.team_aliases.items():
@@ -27,6 +24,14 @@ class LiveGameDataService:
                 clean_alias = self.strip_accents(alias).strip().lower()
                 self.alias_to_team[clean_alias] = canonical
 
+    @property
+    def betfafairService(self):
+        """Created on first use: BetfairService logs in to Betfair, which read paths never need."""
+        if self._betfair_service is None:
+            from app.new_odds.services.betfair_service import BetfairService
+            self._betfair_service = BetfairService(self.db)
+        return self._betfair_service
+
     @staticmethod
     def strip_accents(text: str) -> str:
         if not text:
@@ -87,12 +92,14 @@ class LiveGameDataService:
                 live_data.shots_off_target_away = shots_off_target_away
                 live_data.corners_home = corners_home
                 live_data.corners_away = corners_away
+                live_data.fixture_id = odds_calc.fixture_id
                 live_data.last_updated = datetime.now(timezone.utc)
 
             else:
                 # Create new row
                 live_data = LiveGameData(
                     odds_calculation_id=odds_calculation_id,
+                    fixture_id=odds_calc.fixture_id,
                     is_live=is_live,
                     scrape_url=scrape_url,
                     live_home_score=live_home_score,
@@ -143,12 +150,18 @@ class LiveGameDataService:
 
     def check_and_update_live_games(self):
         today = date.today()
-        todays_odds_calculations = self.db.query(OddsCalculation).filter(
+        # Each calculation with its Fixture, which carries the Betfair/SofaScore event IDs
+        todays_odds_calculations = self.db.query(OddsCalculation, Fixture).outerjoin(
+            Fixture, OddsCalculation.fixture_id == Fixture.fixture_id
+        ).filter(
             OddsCalculation.date == today
         ).all()
         if not todays_odds_calculations:
             print("No odds calculations found for today.")
             return
+        live_data_lookup = self.get_bulk_live_game_data(
+            [odds_calc.odds_calculation_id for odds_calc, _ in todays_odds_calculations]
+        )
 
         # 1️⃣ Get Betfair live games
         betfair_live_games = self.betfafairService.get_live_games_by_league()
@@ -158,33 +171,20 @@ class LiveGameDataService:
         sofascore_live_matches = self.sofa_service.get_live_matches()
         print("These are sofa live matches::")
         print(sofascore_live_matches)
-        for odds_calc in todays_odds_calculations:
-            new_odds = self.db.query(NewOdds).filter(
-                and_(
-                    NewOdds.home_team_id == odds_calc.home_team_id,
-                    NewOdds.away_team_id == odds_calc.away_team_id,
-                    NewOdds.date == odds_calc.date
-                )
-            ).first()
-
-            if not new_odds:
-                print(f"No new odds for odds_calculation_id {odds_calc.odds_calculation_id}")
+        for odds_calc, fixture in todays_odds_calculations:
+            if not fixture or not fixture.betfair_event_id:
+                print(f"No Betfair event for odds_calculation_id {odds_calc.odds_calculation_id}")
                 continue
 
-            try:
-                market_data = json.loads(new_odds.full_market_data)
-                event_id = str(market_data.get("event_id"))
-                event_name = market_data.get("event_name","")
-            except Exception:
-                print(f"Failed to load market data for odds_calculation_id {odds_calc.odds_calculation_id}")
-                continue
+            event_id = fixture.betfair_event_id
+            event_name = fixture.betfair_event_name or ""
 
             # Check if game is live in Betfair
             betfair_game = betfair_live_dict.get(event_id)
             if not betfair_game:
                 print(f"No live Betfair match for event_id: {event_id}")
                  # ✅ If it existed before and was live, mark finished
-                existing_live_data = self.get_live_game_data(odds_calc.odds_calculation_id)
+                existing_live_data = live_data_lookup.get(odds_calc.odds_calculation_id)
                 if existing_live_data and existing_live_data.is_live:
                     print(f"Marking {event_name} as finished (Betfair no longer shows it).")
                     existing_live_data.is_live = False
@@ -208,19 +208,30 @@ class LiveGameDataService:
                 print("Sofa:", self.normalize_team_name(m.get("homeTeam.name", "")),
                     "vs", self.normalize_team_name(m.get("awayTeam.name", "")))
 
-            # From SofaScore
-            matched_sofa_game = next(
-                (
-                    m for m in sofascore_live_matches
-                    if self.normalize_team_name(m.get("homeTeam.name", "")) == betfair_home
-                    and self.normalize_team_name(m.get("awayTeam.name", "")) == betfair_away
-                ),
-                None
-            )
+            # From SofaScore: by the event ID matched earlier, else by team names
+            matched_sofa_game = None
+            if fixture.sofascore_event_id:
+                matched_sofa_game = next(
+                    (m for m in sofascore_live_matches if str(m.get("id")) == fixture.sofascore_event_id),
+                    None
+                )
+            if not matched_sofa_game:
+                matched_sofa_game = next(
+                    (
+                        m for m in sofascore_live_matches
+                        if self.normalize_team_name(m.get("homeTeam.name", "")) == betfair_home
+                        and self.normalize_team_name(m.get("awayTeam.name", "")) == betfair_away
+                    ),
+                    None
+                )
 
             if not matched_sofa_game:
                 print(f"No SofaScore match for Betfair game {betfair_home} vs {betfair_away}")
                 continue
+
+            # Saved with the live data below
+            if matched_sofa_game.get("id") is not None:
+                fixture.sofascore_event_id = str(matched_sofa_game["id"])
             
             # Update DB with SofaScore live stats
             self.create_live_game_data(
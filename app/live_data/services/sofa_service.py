@@ -1,4 +1,3 @@
-from playwright.sync_api import sync_playwright
 import json
 import time
 
@@ -16,8 +15,12 @@ class SofaScoreService:
         "Trendyol Süper Lig", "Liga Portugal Betclic", "VriendenLoterij Eredivisie"
     ]
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, persistent: bool = False):
         self.headless = headless
+        # persistent=True keeps one Chromium running across calls (long-lived worker processes)
+        self.persistent = persistent
+        self._playwright = None
+        self._browser = None
 
     def _game_clock(self, start_ts, status_desc, injury_time1=None, injury_time2=None):
         """
@@ -82,70 +85,97 @@ class SofaScoreService:
         Fetches live match data for selected leagues, including statistics.
         Returns a list of dictionaries with match details.
         """
-        results = []
+        from playwright.sync_api import sync_playwright  # heavy; only needed when a live job runs
+
+        if self.persistent:
+            return self._collect_live_matches(self._persistent_browser())
 
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=self.headless)
             try:
-                # Use context manager to ensure cleanup
-                with browser.new_context() as context:
-                    page = context.new_page()
-
-                    # Get live events
-                    page.goto(self.LIVE_API_URL)
-                    try:
-                        data = json.loads(page.inner_text("pre"))
-                    except json.JSONDecodeError:
-                        raise ValueError("Failed to parse JSON from live events.")
-
-                    if "events" not in data:
-                        raise ValueError("No 'events' found in live data.")
-
-                    # Loop through events
-                    for event in data["events"]:
-                        league_name = event.get("tournament", {}).get("name")
-                        if league_name not in self.SELECTED_LEAGUES:
-                            continue
-
-                        match_data = {
-                            "startTimestamp": event.get("startTimestamp"),
-                            "status.timestamp": event.get("statusTime", {}).get("timestamp"),
-                            "id": event.get("id"),
-                            "currentMinute": self._game_clock(
-                                event.get("time", {}).get("currentPeriodStartTimestamp"),
-                                event.get("status", {}).get("description")
-                            ),
-                            "changeTimestamp": event.get("changes", {}).get("changeTimestamp"),
-                            "currentPeriodStartTimestamp": event.get("time", {}).get("currentPeriodStartTimestamp"),
-                            "homeScore.current": event.get("homeScore", {}).get("current"),
-                            "homeScore.period1": event.get("homeScore", {}).get("period1"),
-                            "homeScore.period2": event.get("homeScore", {}).get("period2"),
-                            "awayScore.current": event.get("awayScore", {}).get("current"),
-                            "awayScore.period1": event.get("awayScore", {}).get("period1"),
-                            "awayScore.period2": event.get("awayScore", {}).get("period2"),
-                            "homeTeam.name": event.get("homeTeam", {}).get("name"),
-                            "awayTeam.name": event.get("awayTeam", {}).get("name"),
-                            "lastPeriod": event.get("lastPeriod"),
-                            "finalResultOnly": event.get("finalResultOnly"),
-                            "status.description": event.get("status", {}).get("description"),
-                            "status.type": event.get("status", {}).get("type"),
-                            "customId": event.get("customId"),
-                            "slug": event.get("slug")
-                        }
-
-                        # Fetch match statistics
-                        stats_url = self.STATS_API_URL.format(id=event.get("id"))
-                        try:
-                            page.goto(stats_url)
-                            stats_content = json.loads(page.inner_text("pre"))
-                            match_data.update(self._extract_required_stats(stats_content))
-                        except Exception as e:
-                            match_data["statsError"] = f"Could not fetch stats: {e}"
-
-                        results.append(match_data)
-
+                return self._collect_live_matches(browser)
             finally:
                 browser.close()  # Ensure browser always closed
 
+    def _collect_live_matches(self, browser):
+        results = []
+
+        # Use context manager to ensure cleanup
+        with browser.new_context() as context:
+            page = context.new_page()
+
+            # Get live events
+            page.goto(self.LIVE_API_URL)
+            try:
+                data = json.loads(page.inner_text("pre"))
+            except json.JSONDecodeError:
+                raise ValueError("Failed to parse JSON from live events.")
+
+            if "events" not in data:
+                raise ValueError("No 'events' found in live data.")
+
+            # Loop through events
+            for event in data["events"]:
+                league_name = event.get("tournament", {}).get("name")
+                if league_name not in self.SELECTED_LEAGUES:
+                    continue
+
+                match_data = {
+                    "startTimestamp": event.get("startTimestamp"),
+                    "status.timestamp": event.get("statusTime", {}).get("timestamp"),
+                    "id": event.get("id"),
+                    "currentMinute": self._game_clock(
+                        event.get("time", {}).get("currentPeriodStartTimestamp"),
+                        event.get("status", {}).get("description")
+                    ),
+                    "changeTimestamp": event.get("changes", {}).get("changeTimestamp"),
+                    "currentPeriodStartTimestamp": event.get("time", {}).get("currentPeriodStartTimestamp"),
+                    "homeScore.current": event.get("homeScore", {}).get("current"),
+                    "homeScore.period1": event.get("homeScore", {}).get("period1"),
+                    "homeScore.period2": event.get("homeScore", {}).get("period2"),
+                    "awayScore.current": event.get("awayScore", {}).get("current"),
+                    "awayScore.period1": event.get("awayScore", {}).get("period1"),
+                    "awayScore.period2": event.get("awayScore", {}).get("period2"),
+                    "homeTeam.name": event.get("homeTeam", {}).get("name"),
+                    "awayTeam.name": event.get("awayTeam", {}).get("name"),
+                    "lastPeriod": event.get("lastPeriod"),
+                    "finalResultOnly": event.get("finalResultOnly"),
+                    "status.description": event.get("status", {}).get("description"),
+                    "status.type": event.get("status", {}).get("type"),
+                    "customId": event.get("customId"),
+                    "slug": event.get("slug")
+                }
+
+                # Fetch match statistics
+                stats_url = self.STATS_API_URL.format(id=event.get("id"))
+                try:
+                    page.goto(stats_url)
+                    stats_content = json.loads(page.inner_text("pre"))
+                    match_data.update(self._extract_required_stats(stats_content))
+                except Exception as e:
+                    match_data["statsError"] = f"Could not fetch stats: {e}"
+
+                results.append(match_data)
+
         return results
 
+    def _persistent_browser(self):
+        """Browser kept open between calls; relaunched if it has crashed or disconnected."""
+        if self._browser is None or not self._browser.is_connected():
+            from playwright.sync_api import sync_playwright
+
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+        return self._browser
+
+    def close(self):
+        """Shut down the persistent browser, if one was started."""
+        try:
+            if self._browser is not None:
+                self._browser.close()
+        finally:
+            self._browser = None
+            if self._playwright is not None:
+                self._playwright.stop()
+                self._playwright = None
@@ -1,9 +1,14 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 import logging
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import settings
 from app.core.database import init_db
 from app.api import api_router
-from app.core.scheduler import start_scheduler 
+from app.core.scheduler import start_scheduler, job_pool
+from app.core.query_stats import QueryStatsMiddleware
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -11,6 +16,15 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# Heavy modules (pandas, Playwright, Selenium, ...) are imported by the handlers that use
+# them, so importing the app stays cheap. `python -X importtime -c "import app.main"` shows
+# where the time goes if this budget is exceeded.
+_import_ms = (time.perf_counter() - _import_started) * 1000
+if _import_ms > settings.IMPORT_TIME_BUDGET_MS:
+    logger.warning(f"⚠ App import took {_import_ms:.0f}ms, over the {settings.IMPORT_TIME_BUDGET_MS}ms budget")
+else:
+    logger.info(f"⏱ App import took {_import_ms:.0f}ms (budget {settings.IMPORT_TIME_BUDGET_MS}ms)")
+
 
 # Allow CORS for all origins (you can restrict it later)
 app.add_middleware(
@@ -19,19 +33,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-N-Plus-One"],
 )
 
+# Count SQL statements per request and flag N+1 loops
+app.add_middleware(QueryStatsMiddleware)
+
 # Ensure database tables are created
 @app.on_event("startup")
 async def startup():
     try:
-        init_db()  # Calls Base.metadata.create_all(bind=engine)
-        logger.info("✅ Database connected and tables created.")
+        if settings.INIT_DB_ON_STARTUP:
+            init_db()  # Calls Base.metadata.create_all(bind=engine)
+            logger.info("✅ Database connected and tables created.")
         start_scheduler()  # ⬅️ Start your cron-based background scheduler here
         logger.info("⏰ Scheduler started.")
     except Exception as e:
         logger.error(f"❌ Database connection error: {e}")
 
+@app.on_event("shutdown")
+def shutdown():
+    job_pool.shutdown()  # stop the scheduler's worker processes
+
 @app.get("/")
 async def home():
     return {"message": "Welcome to Bet Backend"}
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.match_statistics.services.match_statistics_service import MatchStatisticsService
 
 router = APIRouter()
@@ -26,7 +26,7 @@ def get_all_match_statistics(db: Session = Depends(get_db)):
     
     
 @router.get("/matches/historic/{id}")
-def get_historic_matches_by_odds_calculation(id: str, db: Session = Depends(get_db)):
+def get_historic_matches_by_odds_calculation(id: str, db: Session = Depends(get_read_db)):
     """
     Get historic matches with teams, league, country, and statistics based on odds calculation ID.
     """
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, JSON
+from app.core.database import Base
+
+# How many of the most recent meetings are kept in recent_results
+H2H_RECENT_RESULTS = 5
+
+
+class HeadToHeadSummary(Base):
+    """
+    Running head-to-head record for one (home team, away team) pairing, i.e. matches where
+    home_team_id played at home against away_team_id. Maintained by MatchStatisticsService
+    whenever a result is stored, so H2H lookups are a single primary-key read.
+    """
+    __tablename__ = "head_to_head_summary"
+
+    home_team_id = Column(String, ForeignKey("teams.team_id"), primary_key=True)
+    away_team_id = Column(String, ForeignKey("teams.team_id"), primary_key=True)
+
+    # Meetings with a stored result, and how they ended (full_time_result H/A/D)
+    matches_played = Column(Integer, nullable=False, default=0)
+    home_wins = Column(Integer, nullable=False, default=0)
+    away_wins = Column(Integer, nullable=False, default=0)
+    draws = Column(Integer, nullable=False, default=0)
+
+    # Newest first: [{"match_id", "date", "result", "home_goals", "away_goals"}, ...]
+    recent_results = Column(JSON, nullable=False, default=list)
+    last_match_date = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False)
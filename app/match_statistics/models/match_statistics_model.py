@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class MatchStatistics(Base):
     __tablename__ = "match_statistics"
+    __table_args__ = (
+        Index("ix_match_statistics_match_id", "match_id"),
+    )
 
     match_stat_id = Column(String, primary_key=True, index=True)
     match_id = Column(String, ForeignKey("matches.match_id"), nullable=False)
@@ -0,0 +1,78 @@
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.match_statistics.models.head_to_head_summary_model import HeadToHeadSummary, H2H_RECENT_RESULTS
+from app.match_statistics.models.match_statistics_model import MatchStatistics
+from app.matches.models.match_model import Match
+
+
+class HeadToHeadService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_summary(self, home_team_id: str, away_team_id: str):
+        """H2H summary for home_team_id at home against away_team_id, or None if they never met."""
+        return self.db.get(HeadToHeadSummary, (home_team_id, away_team_id))
+
+    def get_summaries(self, pairs) -> dict:
+        """{(home_team_id, away_team_id): HeadToHeadSummary} for the given pairs, in one query."""
+        pairs = list(pairs)
+        if not pairs:
+            return {}
+        rows = (
+            self.db.query(HeadToHeadSummary)
+            .filter(tuple_(HeadToHeadSummary.home_team_id, HeadToHeadSummary.away_team_id).in_(pairs))
+            .all()
+        )
+        return {(row.home_team_id, row.away_team_id): row for row in rows}
+
+    def record_result(self, match: Match, match_stats: MatchStatistics):
+        """
+        Add a newly stored result to its pairing's summary. Runs in the caller's transaction;
+        the summary row is locked so concurrent uploads of the same pairing don't lose updates.
+        """
+        if not match.home_team_id or not match.away_team_id:
+            return None
+
+        key = {"home_team_id": match.home_team_id, "away_team_id": match.away_team_id}
+        now = datetime.utcnow()
+        self.db.execute(
+            insert(HeadToHeadSummary)
+            .values(**key, matches_played=0, home_wins=0, away_wins=0, draws=0,
+                    recent_results=[], last_match_date=None, updated_at=now)
+            .on_conflict_do_nothing(index_elements=["home_team_id", "away_team_id"])
+        )
+        summary = (
+            self.db.query(HeadToHeadSummary)
+            .filter_by(**key)
+            .with_for_update()
+            .populate_existing()
+            .one()
+        )
+
+        result = match_stats.full_time_result
+        summary.matches_played += 1
+        if result == "H":
+            summary.home_wins += 1
+        elif result == "A":
+            summary.away_wins += 1
+        elif result == "D":
+            summary.draws += 1
+
+        # Uploads aren't always in date order, so keep the list sorted rather than prepending
+        recent = list(summary.recent_results or [])
+        recent.append({
+            "match_id": match.match_id,
+            "date": match.date.isoformat() if match.date else None,
+            "result": result,
+            "home_goals": match_stats.full_time_home_goals,
+            "away_goals": match_stats.full_time_away_goals,
+        })
+        recent.sort(key=lambda entry: entry["date"] or "", reverse=True)
+        summary.recent_results = recent[:H2H_RECENT_RESULTS]
+
+        if match.date and (summary.last_match_date is None or match.date > summary.last_match_date):
+            summary.last_match_date = match.date
+        summary.updated_at = now
+        return summary
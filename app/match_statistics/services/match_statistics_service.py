@@ -9,7 +9,8 @@ from app.matches.models.match_model import Match
 from app.teams.models.team_model import Team
 from app.leagues.models.leagues_models import League
 from app.country.models.country_model import Country
-from app.odds_calculation.models.odds_calculation_model import OddsCalculation 
+from app.odds_calculation.models.odds_calculation_model import OddsCalculation
+from app.match_statistics.services.head_to_head_service import HeadToHeadService
 
 
 class MatchStatisticsService:
@@ -55,6 +56,10 @@ class MatchStatisticsService:
 
         try:
             self.db.add(match_stats)
+            match = self.db.get(Match, match_id)
+            if match is not None:
+                # Same transaction, so the summary never counts a result that wasn't stored
+                HeadToHeadService(self.db).record_result(match, match_stats)
             self.db.commit()
             self.db.refresh(match_stats)
             return match_stats
@@ -1,20 +1,21 @@
 from fastapi import APIRouter, UploadFile, File
-from app.matches.services.match_upload_service import UploadService
 from fastapi import Depends
-from app.core.database import get_db
-from sqlalchemy.orm import Session
+from app.core.database import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 @router.post("/upload-matches-csv/")
 async def upload_csv(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)  # Session managed by FastAPIY
+    db: AsyncSession = Depends(get_async_db)  # Session managed by FastAPIY
 ):
     """Upload CSV and delegate processing to the service layer."""
+    from app.matches.services.match_upload_service import UploadService  # pandas, only when uploading
+
     try:
         upload_service = UploadService(db)  # Dependency injection
         return await upload_service.process_csv(file)
     except Exception as e:
-        db.rollback()  # rollback on failure to avoid locked sessions
+        await db.rollback()  # rollback on failure to avoid locked sessions
         raise e
@@ -1,9 +1,15 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Match(Base):
     __tablename__ = "matches"
+    __table_args__ = (
+        # Fixture lookups during upload and head-to-head history (newest first)
+        Index("ix_matches_home_away_date", "home_team_id", "away_team_id", "date"),
+        # Lets "home_team_id = x OR away_team_id = x" use a BitmapOr
+        Index("ix_matches_away_team_id", "away_team_id"),
+    )
 
     # host
 
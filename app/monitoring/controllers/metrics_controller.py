@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from app.core.config import settings
+from app.core.pool_monitor import pool_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def get_metrics():
+    """
+    Connection-pool telemetry for this process: checkout wait times, in-use and
+    overflow counts, and connections held past the leak threshold.
+    """
+    return {
+        "process_role": settings.PROCESS_ROLE,
+        "pools": pool_metrics(),
+    }
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
-from app.new_odds.services.betfair_service import BetfairService
+from app.core.database import BackgroundSessionLocal
+from app.core.query_stats import track_queries
 import asyncio
 
 router = APIRouter()
@@ -12,13 +12,16 @@ async def get_new_betfair_odds():
     print(f"🔵 Getting new odds from BetFair")
 
     async def background_task():
-        db: Session = SessionLocal()  # create a fresh session for the thread
+        from app.new_odds.services.betfair_service import BetfairService
+
+        db: Session = BackgroundSessionLocal()  # create a fresh session for the thread
         try:
-            betfair_service = BetfairService(db)
-            # Run the blocking method in thread
-            await asyncio.to_thread(
-                betfair_service.display_filtered_competitions_and_markets
-            )
+            with track_queries("task:betfair_odds"):
+                betfair_service = BetfairService(db)
+                # Run the blocking method in thread
+                await asyncio.to_thread(
+                    betfair_service.display_filtered_competitions_and_markets
+                )
         except Exception as e:
             db.rollback()
             print(f"❌ Error in Betfair background task: {e}")
@@ -3,7 +3,6 @@ from sqlalchemy.orm import Session
 import asyncio
 import json
 from app.core.database import get_db
-from app.scraper.scraper_manager import ScraperManager
 
 router = APIRouter()
     
@@ -23,6 +22,8 @@ def load_urls(scraper_name):
 @router.post("/scrape-new-odds/")
 async def scrape_new_odds(scraper_name: str = "oddsportal", db: Session = Depends(get_db)):
     """Trigger scraping for new odds."""
+    from app.scraper.scraper_manager import ScraperManager  # loads the browser stack, so only on demand
+
     print(f"🔵 Starting scraping for: {scraper_name}")
     
     urls = load_urls(scraper_name)
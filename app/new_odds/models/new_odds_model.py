@@ -1,12 +1,17 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Time
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Time, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from app.core.database import Base
 from sqlalchemy.dialects.postgresql import JSONB
 
 class NewOdds(Base):
     __tablename__ = "new_odds"
+    __table_args__ = (
+        # One row per fixture; also the conflict target for bulk upserts
+        UniqueConstraint("date", "time", "home_team_id", "away_team_id", name="uq_new_odds_fixture"),
+    )
 
     new_odds_id = Column(String, primary_key=True, index=True)
+    fixture_id = Column(String, ForeignKey("fixtures.fixture_id"), nullable=True, index=True)
     date = Column(DateTime, nullable=False)
     time = Column(Time, nullable=False)
     season_id = Column(String, ForeignKey("seasons.season_id"), nullable=False)
@@ -19,9 +24,11 @@ class NewOdds(Base):
     draw_odds = Column(Float)
     away_odds = Column(Float)
 
-    full_market_data = Column(JSONB, nullable=True)
+    # The whole Betfair event JSON; read only where asked for (undefer / load_only)
+    full_market_data = deferred(Column(JSONB, nullable=True))
     
     home_team = relationship("Team", foreign_keys=[home_team_id], back_populates="home_odds")
     away_team = relationship("Team", foreign_keys=[away_team_id], back_populates="away_odds")
     season = relationship("Season", back_populates="odds")
     league = relationship("League", back_populates="new_odds")
+    fixture = relationship("Fixture")
@@ -34,9 +34,9 @@ class BetfairService:
         self.league_service = LeagueService(db)
 
 
-    def authenticate(self):
+    def authenticate(self, force_refresh: bool = False):
         auth_service = BetfairAuthService(self.username, self.password,  self.appKey)
-        token = auth_service.get_session_token()
+        token = auth_service.get_session_token(force_refresh=force_refresh)
         if token:
             self.sessionToken = token
             print("Token:" ,self.sessionToken)
@@ -46,7 +46,7 @@ class BetfairService:
             raise Exception("Authentication failed.")
 
 
-    def call_aping(self, jsonrpc_req: Dict) -> Optional[Dict]:
+    def call_aping(self, jsonrpc_req: Dict, retry_on_expired_session: bool = True) -> Optional[Dict]:
         headers = {
             'X-Application': self.appKey,
             'X-Authentication': self.sessionToken,
@@ -57,7 +57,12 @@ class BetfairService:
         try:
             with urllib.request.urlopen(req) as response:
                 resp_data = response.read().decode('utf-8')
-                return json.loads(resp_data)
+            # A reused token may have expired on Betfair's side: log in again and retry once
+            if retry_on_expired_session and ("INVALID_SESSION_INFORMATION" in resp_data or "NO_SESSION" in resp_data):
+                print("[WARN] Betfair session expired, re-authenticating.")
+                self.authenticate(force_refresh=True)
+                return self.call_aping(jsonrpc_req, retry_on_expired_session=False)
+            return json.loads(resp_data)
         except urllib.error.URLError as e:
             print(f"Network error: {e}")
         except urllib.error.HTTPError as e:
@@ -238,12 +243,23 @@ class BetfairService:
 
             competitions_data.append(comp_dict)
 
-            # Save after processing all events for the competition
+        # Transform every event, then save the whole sweep in one bulk upsert
+        odds_rows = []
+        for comp_dict in competitions_data:
             for event_dict in comp_dict["events"]:
                 try:
-                    self.transform_and_save_betfair_odds(event_dict, comp_dict["competition_name"])
+                    odds_data = self.transform_betfair_odds(event_dict, comp_dict["competition_name"])
+                    if odds_data:
+                        odds_rows.append(odds_data)
                 except Exception as e:
-                    print(f"Error saving odds for event {event_dict.get('event_name')} in competition {comp_dict['competition_name']}: {e}")
+                    self.db.rollback()
+                    print(f"Error transforming odds for event {event_dict.get('event_name')} in competition {comp_dict['competition_name']}: {e}")
+
+        outcomes = self.new_odds_service.create_new_odds_bulk(odds_rows)
+        inserted = sum(1 for o in outcomes if o["status"] == "inserted")
+        updated = sum(1 for o in outcomes if o["status"] == "updated")
+        failed = sum(1 for o in outcomes if o["status"] == "error")
+        print(f"Saved Betfair odds: {inserted} inserted, {updated} updated, {failed} failed")
 
 
     def transform_and_save_betfair_odds(self, event_dict: Dict, competition_name: str) -> None:
@@ -255,66 +271,12 @@ class BetfairService:
             competition_name: Name of the competition to map league
         """
         event_name = event_dict["event_name"]
-        start_time = datetime.strptime(event_dict["start_time"], "%Y-%m-%dT%H:%M:%S.%fZ")
 
         try:
-            # Map competition to league code
-            league_code = self.map_betfair_competition_to_league(competition_name)
-            if not league_code:
-                print(f"Unsupported league: {competition_name} for {event_name}")
-                return
-
-            # Parse team names
-            try:
-                home_team, away_team = self.parse_teams_from_event(event_name)
-            except ValueError as e:
-                print(f"Parse error for {event_name}: {e}")
-                return
-
-            # Find MATCH_ODDS market
-            match_market = next(
-                (m for m in event_dict["markets"] if m["market_name"].lower().replace(" ", "") == "matchodds"),
-                None
-            )
-            if not match_market:
-                print(f"No MATCH_ODDS market found for {event_name}")
+            odds_data = self.transform_betfair_odds(event_dict, competition_name)
+            if not odds_data:
                 return
 
-            # Extract odds
-            home_odds = draw_odds = away_odds = None
-            for sel in match_market["selections"]:
-                name = sel["name"].lower()
-                best_back = sel.get("best_back", {})
-                price = best_back.get("price") if best_back else None
-
-                if price:
-                    if name == home_team.lower():
-                        home_odds = price
-                    elif "draw" in name:
-                        draw_odds = price
-                    elif name == away_team.lower():
-                        away_odds = price
-
-            print(f"Extracted odds for {event_name}: Home={home_odds}, Draw={draw_odds}, Away={away_odds}")
-            if not all([home_odds, draw_odds, away_odds]):
-                print(f"Incomplete odds for {event_name} - skipping")
-                return
-
-            full_event_json = json.dumps(event_dict)
-            odds_data = {
-                'date': start_time.date(),
-                'time': start_time.time(),
-                'home_team_id': self.team_service.get_or_create_team(home_team, league_code).team_id,
-                'away_team_id': self.team_service.get_or_create_team(away_team, league_code).team_id,
-                'home_odds': home_odds,
-                'draw_odds': draw_odds,
-                'away_odds': away_odds,
-                'league_code': league_code,
-                'full_market_data': full_event_json
-            }
-
-            print(f"Saving Odds: {event_name} | H {home_odds} | D {draw_odds} | A {away_odds}")
-
             # Safe DB operation
             self.new_odds_service.create_new_odds(odds_data)
             self.db.commit()  # Commit after successful insert
@@ -322,6 +284,76 @@ class BetfairService:
             self.db.rollback()  # Rollback if anything fails
             print(f"❌ Error saving odds for event {event_name}: {e}")
 
+    def transform_betfair_odds(self, event_dict: Dict, competition_name: str) -> Optional[Dict]:
+        """
+        Turns a structured Betfair event into a NewOdds row dict (resolving teams),
+        or returns None when the event can't be used.
+        """
+        event_name = event_dict["event_name"]
+        start_time = datetime.strptime(event_dict["start_time"], "%Y-%m-%dT%H:%M:%S.%fZ")
+
+        # Map competition to league code
+        league_code = self.map_betfair_competition_to_league(competition_name)
+        if not league_code:
+            print(f"Unsupported league: {competition_name} for {event_name}")
+            return None
+
+        # Parse team names
+        try:
+            home_team, away_team = self.parse_teams_from_event(event_name)
+        except ValueError as e:
+            print(f"Parse error for {event_name}: {e}")
+            return None
+
+        # Find MATCH_ODDS market
+        match_market = next(
+            (m for m in event_dict["markets"] if m["market_name"].lower().replace(" ", "") == "matchodds"),
+            None
+        )
+        if not match_market:
+            print(f"No MATCH_ODDS market found for {event_name}")
+            return None
+
+        # Extract odds
+        home_odds = draw_odds = away_odds = None
+        for sel in match_market["selections"]:
+            name = sel["name"].lower()
+            best_back = sel.get("best_back", {})
+            price = best_back.get("price") if best_back else None
+
+            if price:
+                if name == home_team.lower():
+                    home_odds = price
+                elif "draw" in name:
+                    draw_odds = price
+                elif name == away_team.lower():
+                    away_odds = price
+
+        print(f"Extracted odds for {event_name}: Home={home_odds}, Draw={draw_odds}, Away={away_odds}")
+        if not all([home_odds, draw_odds, away_odds]):
+            print(f"Incomplete odds for {event_name} - skipping")
+            return None
+
+        full_event_json = json.dumps(event_dict)
+        odds_data = {
+            'date': start_time.date(),
+            'time': start_time.time(),
+            'home_team_id': self.team_service.get_or_create_team(home_team, league_code).team_id,
+            'away_team_id': self.team_service.get_or_create_team(away_team, league_code).team_id,
+            'home_odds': home_odds,
+            'draw_odds': draw_odds,
+            'away_odds': away_odds,
+            'league_code': league_code,
+            'full_market_data': full_event_json,
+            # Stored on the Fixture, so readers don't have to parse full_market_data
+            'betfair_event_id': event_dict.get("event_id"),
+            'betfair_event_name': event_name,
+            'betfair_market_id': match_market.get("market_id"),
+        }
+
+        print(f"Prepared Odds: {event_name} | H {home_odds} | D {draw_odds} | A {away_odds}")
+        return odds_data
+
 
 
     def parse_teams_from_event(self, event_name: str) -> tuple:
@@ -1,12 +1,17 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert
 from app.new_odds.models.new_odds_model import NewOdds
 from app.core.utils import generate_custom_id
+from app.fixtures.services.fixture_service import FixtureService
 from app.seasons.services.season_service import SeasonService
-from datetime import datetime
+from datetime import datetime, date, time
 from app.leagues.services.league_service import LeagueService
 from app.leagues.models.leagues_models import League
 
 class NewOddsService:
+    BULK_CHUNK_SIZE = 500
+
     def __init__(self, db: Session):
         self.db = db
         self.season_service = SeasonService(db)
@@ -47,6 +52,10 @@ class NewOddsService:
         # Find matching league using league_code
         league = self._find_matching_league(odds_data['league_code'])
         try:
+            fixture_id = FixtureService(self.db).ensure_fixture(self._fixture_row(
+                odds_data, self._normalize_date(odds_data['date']), self._normalize_time(odds_data['time'])
+            ))
+
             # Check if odds already exist for this match
             existing_odds = self.db.query(NewOdds).filter_by(
                 home_team_id=odds_data['home_team_id'],
@@ -64,6 +73,7 @@ class NewOddsService:
                 existing_odds.season_id = season.season_id
                 existing_odds.league_id = league.league_id
                 existing_odds.full_market_data = odds_data['full_market_data']
+                existing_odds.fixture_id = fixture_id
                 self.db.commit()
                 self.db.refresh(existing_odds)
                 return existing_odds
@@ -83,8 +93,8 @@ class NewOddsService:
                 away_odds=odds_data['away_odds'],
                 season_id=season.season_id,
                 league_id=league.league_id,
-                full_market_data=odds_data['full_market_data']
-
+                full_market_data=odds_data['full_market_data'],
+                fixture_id=fixture_id
             )
 
 
@@ -98,3 +108,142 @@ class NewOddsService:
             self.db.rollback()  # undo any uncommitted changes
             print(f"Error creating/updating new game odds: {e}")
             return None
+
+    def create_new_odds_bulk(self, odds_list: list, chunk_size: int = None):
+        """
+        Upsert odds for many fixtures in a single transaction, linking each to its Fixture
+        (created as needed, with any Betfair IDs the row carries).
+
+        Rows are written with one INSERT ... ON CONFLICT (date, time, home_team_id, away_team_id)
+        DO UPDATE per chunk. Returns one outcome per input row, in input order:
+        {"status": "inserted" | "updated" | "skipped" | "error", "new_odds_id": ..., "error": ...}
+        """
+        chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+        outcomes = [None] * len(odds_list)
+        rows_by_key = {}  # fixture key -> row; later rows for the same fixture win
+        indexes_by_key = {}
+        fixture_rows = []
+        seasons = {}
+        leagues = {}
+
+        for idx, odds_data in enumerate(odds_list):
+            if '-' in (odds_data['home_odds'], odds_data['draw_odds'], odds_data['away_odds']):
+                outcomes[idx] = {"status": "skipped", "new_odds_id": None, "error": None}
+                continue
+
+            try:
+                match_date = self._normalize_date(odds_data['date'])
+                match_time = self._normalize_time(odds_data['time'])
+
+                season_year = self.season_service.determine_season(match_date.strftime('%d/%m/%Y'))
+                if season_year not in seasons:
+                    seasons[season_year] = self.season_service.get_or_create_season(season_year)
+
+                league_code = odds_data['league_code']
+                if league_code not in leagues:
+                    leagues[league_code] = self._find_matching_league(league_code)
+            except ValueError as e:
+                outcomes[idx] = {"status": "error", "new_odds_id": None, "error": str(e)}
+                continue
+
+            key = (match_date, match_time, odds_data['home_team_id'], odds_data['away_team_id'])
+            rows_by_key[key] = {
+                "new_odds_id": rows_by_key[key]["new_odds_id"] if key in rows_by_key
+                else generate_custom_id(self.db, NewOdds, "NO", "new_odds_id"),
+                "date": match_date,
+                "time": match_time,
+                "home_team_id": odds_data['home_team_id'],
+                "away_team_id": odds_data['away_team_id'],
+                "home_odds": odds_data['home_odds'],
+                "draw_odds": odds_data['draw_odds'],
+                "away_odds": odds_data['away_odds'],
+                "season_id": seasons[season_year].season_id,
+                "league_id": leagues[league_code].league_id,
+                "full_market_data": odds_data.get('full_market_data'),
+            }
+            fixture_rows.append(self._fixture_row(odds_data, match_date, match_time))
+            indexes_by_key.setdefault(key, []).append(idx)
+
+        try:
+            fixture_ids = FixtureService(self.db).ensure_fixtures(fixture_rows, chunk_size)
+            for key, row in rows_by_key.items():
+                row["fixture_id"] = fixture_ids[key]
+            rows = list(rows_by_key.values())
+
+            for start in range(0, len(rows), chunk_size):
+                stmt = insert(NewOdds).values(rows[start:start + chunk_size])
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_new_odds_fixture",
+                    set_={
+                        "home_odds": stmt.excluded.home_odds,
+                        "draw_odds": stmt.excluded.draw_odds,
+                        "away_odds": stmt.excluded.away_odds,
+                        "season_id": stmt.excluded.season_id,
+                        "league_id": stmt.excluded.league_id,
+                        "fixture_id": stmt.excluded.fixture_id,
+                        # Sources without market data (e.g. OddsPortal) keep what Betfair stored
+                        "full_market_data": func.coalesce(stmt.excluded.full_market_data, NewOdds.full_market_data),
+                    },
+                ).returning(
+                    NewOdds.new_odds_id,
+                    NewOdds.date,
+                    NewOdds.time,
+                    NewOdds.home_team_id,
+                    NewOdds.away_team_id,
+                    # xmax is 0 only for freshly inserted tuples
+                    literal_column("(xmax = 0)").label("inserted"),
+                )
+
+                for row in self.db.execute(stmt):
+                    key = (row.date, row.time, row.home_team_id, row.away_team_id)
+                    outcome = {
+                        "status": "inserted" if row.inserted else "updated",
+                        "new_odds_id": row.new_odds_id,
+                        "error": None,
+                    }
+                    for idx in indexes_by_key.get(key, []):
+                        outcomes[idx] = outcome
+
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error bulk creating/updating new game odds: {e}")
+            for key, indexes in indexes_by_key.items():
+                for idx in indexes:
+                    outcomes[idx] = {"status": "error", "new_odds_id": None, "error": str(e)}
+
+        return outcomes
+
+    def _fixture_row(self, odds_data: dict, match_date: datetime, match_time: time) -> dict:
+        """The Fixture for an odds row, with the Betfair IDs the row carries (if any)."""
+        return {
+            "date": match_date,
+            "time": match_time,
+            "home_team_id": odds_data['home_team_id'],
+            "away_team_id": odds_data['away_team_id'],
+            "betfair_event_id": odds_data.get('betfair_event_id'),
+            "betfair_event_name": odds_data.get('betfair_event_name'),
+            "betfair_market_id": odds_data.get('betfair_market_id'),
+        }
+
+    def _normalize_date(self, value) -> datetime:
+        """Accepts 'DD MMM YYYY' strings, dates or datetimes and returns a midnight datetime."""
+        if isinstance(value, str):
+            try:
+                return datetime.strptime(value, '%d %b %Y')
+            except ValueError as e:
+                raise ValueError(f"Invalid date format: {value}. Expected 'DD MMM YYYY'") from e
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime.combine(value, time.min)
+        raise ValueError(f"Invalid date value: {value!r}")
+
+    def _normalize_time(self, value) -> time:
+        """Accepts 'HH:MM' strings or time objects."""
+        if isinstance(value, time):
+            return value
+        try:
+            return datetime.strptime(str(value).strip(), '%H:%M').time()
+        except ValueError as e:
+            raise ValueError(f"Invalid time format: {value}. Expected 'HH:MM'") from e
@@ -1,35 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.odds_calculation.services.odds_calculation_service import OddsCalculationService
-from app.new_odds.services.new_odds_service import NewOddsService
-from app.odds_calculation.services.odds_retrieval_service import OddsRetrievalService
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from datetime import datetime
-import requests
-import asyncio
+import json
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import get_read_db, ReadSessionLocal
+from app.core.job_executor import job_executor
+from app.odds_calculation.services.odds_retrieval_service import OddsRetrievalService, json_default, resolve_fields
+from app.odds_calculation.services.odds_calculation_runner import calculate_ratios_job
+from app.odds_calculation.schemas.odds_evaluation_schema import OddsEvaluationRequest, OddsEvaluationResponse
 
 router = APIRouter()
 
 @router.get("/calculated-odds/")
-def get_all_calculated_odds(db: Session = Depends(get_db)):
+def get_all_calculated_odds(
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+):
     """
     Retrieve all calculated odds from the database.
+    `fields` (comma-separated) limits each row, and the columns read, to those fields.
+    Served from a cache that follows writes to the underlying tables; send the returned
+    ETag back as If-None-Match to get a 304 when nothing changed.
     """
     try:
-        odds_service = OddsRetrievalService(db)
-        calculated_odds = odds_service.get_all_calculated_odds()
+        cached = OddsRetrievalService(db).get_calculated_odds_response(fields=fields)
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+
+        if if_none_match and _etag_matches(if_none_match, cached.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
 
-        if not calculated_odds:
-            return {"message": "No calculated odds found."}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return {"calculated_odds": calculated_odds}
 
+@router.get("/calculated-odds/page/")
+def get_calculated_odds_page(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Upcoming calculated odds one page at a time, ordered by date, time and ID.
+    Pass `next_cursor` from the previous page as `cursor`; it is null on the last page.
+    `fields` (comma-separated) limits each row to those fields.
+    """
+    try:
+        return OddsRetrievalService(db).get_calculated_odds_page(limit, cursor, fields=fields)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/calculated-odds/stream/")
+def stream_calculated_odds(fields: Optional[str] = None):
+    """
+    All upcoming calculated odds as NDJSON (one JSON object per line), streamed from a
+    server-side cursor as rows are read. `fields` (comma-separated) limits each row.
+    """
+    try:
+        fields = resolve_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def rows():
+        # The stream outlives the request handler, so it owns its session
+        db = ReadSessionLocal()
+        try:
+            for row in OddsRetrievalService(db).iter_calculated_odds(fields=fields):
+                yield json.dumps(row, default=json_default).encode() + b"\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as If-None-Match uses
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
     
 
+@router.post("/evaluate", response_model=OddsEvaluationResponse)
+def evaluate_odds(request: OddsEvaluationRequest):
+    """
+    Ratios and banded stats for hypothetical pairings (e.g. cup draws), computed from an
+    in-memory snapshot refreshed every ODDS_SNAPSHOT_TTL_SECONDS. Nothing is saved.
+    Unknown teams or seasons are reported per pairing instead of failing the request.
+    """
+    # The snapshot pulls in the calculation service, so load it only when first needed
+    from app.odds_calculation.services.odds_snapshot import odds_snapshot
+
+    try:
+        loaded_at, results = odds_snapshot.evaluate(
+            (pairing.home_team_id, pairing.away_team_id, pairing.season_id) for pairing in request.fixtures
+        )
+        return {"snapshot_loaded_at": loaded_at, "results": results}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/backtest")
+def backtest(
+    season_id: Optional[List[str]] = Query(None),
+    league_code: Optional[List[str]] = Query(None),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    min_edge: float = 0.0,
+    db: Session = Depends(get_read_db),
+):
+    """
+    How the ratio model would have done on past matches: hit rate, Brier score and log-loss,
+    and per bookmaker (B365, BW, BF, PS, WH, Max, Avg) the same scores for its prices plus the
+    ROI of value bets above `min_edge`. Filters select the scored matches (repeatable).
+    """
+    # pandas/numpy come with the backtest, so load it only when asked for
+    from app.odds_calculation.services.odds_backtest import OddsBacktestService
+
+    try:
+        return OddsBacktestService(db).run(season_id, league_code, date_from, date_to, min_edge)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/test-network")
 def test_network():
+    import requests
+
     try:
         r = requests.post(
             "https://identitysso-cert.betfair.com/api/certlogin", timeout=5
@@ -44,6 +151,8 @@ def test_network():
 
 @router.post("/test-betfair-post")
 def test_betfair_post():
+    import requests
+
     url = "https://identitysso-cert.betfair.com/api/certlogin"
     cert = ("/app/app/BetfairCerts/client-2048.crt", "/app/app/BetfairCerts/client-2048.key")
 
@@ -66,28 +175,36 @@ def test_betfair_post():
         return {"error": str(e)}
 
 @router.post("/calculate-ratios/")
-async def calculate_ratios(db: Session = Depends(get_db)):
+def calculate_ratios(
+    workers: Optional[int] = Query(None, ge=0, le=settings.ODDS_CALC_MAX_WORKERS),
+    force: bool = False,
+):
     """
-    Fetches upcoming matches, calculates win, draw, and loss ratios, and returns JSON response.
+    Starts a job that calculates win, draw, and loss ratios for the upcoming matches and
+    returns its ID; follow it at GET /odds-calculation/jobs/{job_id}.
+    `workers` sets the number of calculation processes (default ODDS_CALC_WORKERS, 0 = one per core),
+    at most ODDS_CALC_MAX_WORKERS and the available cores.
+    Fixtures whose inputs haven't changed since their last calculation are skipped unless `force` is set.
+    While a calculation runs, further triggers with the same parameters coalesce into a single
+    follow-up job; `params` in the response are the ones the returned job runs with.
     """
     try:
-        # Initialize services
-        odds_service = OddsCalculationService(db)
-        new_odds_service = NewOddsService(db)
+        job = job_executor.submit("calculate_ratios", calculate_ratios_job, workers=workers, force=force)
+        return {
+            "message": f"Odds calculation job is {job.status}.",
+            "job_id": job.id,
+            "status": job.status,
+            "params": job.params,
+        }
 
-        # Get future matches
-        current_time = datetime.now()
-        new_matches = new_odds_service.get_upcoming_matches(current_time)
-        print(f"[LOG] Total upcoming matches fetched: {len(new_matches)}")
-
-        if not new_matches:
-            return {"message": "No upcoming matches found for ratio calculation."}
-
-        # Run the calculation in the background
-        # Schedule async function in the background
-        asyncio.create_task(odds_service.calculate_ratios_for_matches(new_matches))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        return {"message": "Odds calculation task has started in the background."}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status, progress (done/total, rate, ETA), final counts and errors of a calculation job."""
+    job = job_executor.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.as_dict()
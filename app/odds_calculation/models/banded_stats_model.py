@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Date, JSON
+from app.core.database import Base
+
+
+class BandedStats(Base):
+    """
+    Ready-made stats_banded_data for one (home team, away team) pairing. Rebuilt by
+    BandedStatsService when new results land for the pair, and daily, since the 5- and
+    3-year windows move with the calendar.
+    """
+    __tablename__ = "banded_stats"
+
+    home_team_id = Column(String, ForeignKey("teams.team_id"), primary_key=True)
+    away_team_id = Column(String, ForeignKey("teams.team_id"), primary_key=True)
+
+    stats_banded_data = Column(JSON, nullable=False)
+    # Newest match the data includes and how many matches the pair has; compared with
+    # head_to_head_summary to spot pairs with new results
+    latest_match_date = Column(DateTime, nullable=True)
+    match_count = Column(Integer, nullable=False)
+    # The windows are relative to this day
+    computed_on = Column(Date, nullable=False)
@@ -1,12 +1,17 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Time, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Time, JSON, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from app.core.database import Base
 
 class OddsCalculation(Base):
     # new
     __tablename__ = "odds_calculations"
+    __table_args__ = (
+        # One calculation per fixture; also serves the upcoming-fixtures range scan
+        UniqueConstraint("date", "time", "home_team_id", "away_team_id", name="uq_odds_calculations_fixture"),
+    )
 
     odds_calculation_id = Column(String, primary_key=True, index=True)
+    fixture_id = Column(String, ForeignKey("fixtures.fixture_id"), nullable=True, index=True)
     date = Column(DateTime, nullable=False)
     time = Column(Time, nullable=False)
 
@@ -17,11 +22,16 @@ class OddsCalculation(Base):
     calculated_draw_odds = Column(Float)
     calculated_away_odds = Column(Float)
 
-    stats_banded_data = Column(JSON, nullable=True)
+    # Multi-kilobyte; read only where asked for (undefer / load_only)
+    stats_banded_data = deferred(Column(JSON, nullable=True))
+
+    # Hash of the inputs the odds were calculated from; unchanged inputs skip recalculation
+    input_fingerprint = Column(String(64), nullable=True)
     
     home_team = relationship("Team", foreign_keys=[home_team_id], back_populates="home_calculated_odds")
     away_team = relationship("Team", foreign_keys=[away_team_id], back_populates="away_calculated_odds")
 
 
+    fixture = relationship("Fixture")
     live_data = relationship("LiveGameData", uselist=False, back_populates="odds_calculation")
 
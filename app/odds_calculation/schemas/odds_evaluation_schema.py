@@ -0,0 +1,28 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, conlist
+from app.core.config import settings
+
+
+class EvaluationPairing(BaseModel):
+    home_team_id: str
+    away_team_id: str
+    season_id: str
+
+
+class OddsEvaluationRequest(BaseModel):
+    fixtures: conlist(EvaluationPairing, min_items=1, max_items=settings.ODDS_EVALUATE_MAX_FIXTURES)
+
+
+class EvaluationResult(BaseModel):
+    home_team_id: str
+    away_team_id: str
+    season_id: str
+    # Same shape as a stored calculation (ratios, team data, head_to_head, stats_banded_data)
+    odds: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class OddsEvaluationResponse(BaseModel):
+    snapshot_loaded_at: datetime
+    results: List[EvaluationResult]
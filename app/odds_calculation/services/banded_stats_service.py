@@ -0,0 +1,219 @@
+import math
+from datetime import date, datetime, timedelta
+import numpy as np
+from sqlalchemy import tuple_, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.match_statistics.models.head_to_head_summary_model import HeadToHeadSummary
+from app.match_statistics.models.match_statistics_model import MatchStatistics
+from app.matches.models.match_model import Match
+from app.odds_calculation.models.banded_stats_model import BandedStats
+
+STATS_KEYS = ("corners", "shots_on_target")
+# Means cover 5 years of meetings; correlations the latest 3 meetings of the last 3 years
+SD_WINDOW_DAYS = 5 * 365
+CORRELATION_WINDOW_DAYS = 3 * 365
+CORRELATION_MATCHES = 3
+
+_STAT_COLUMNS = [f"{key}_{side}" for key in STATS_KEYS for side in ("home", "away")]
+_PAIR = ["home_team_id", "away_team_id"]
+
+
+def compute_banded_stats(avg: float) -> list:
+    """Distribute avg across 90 minutes and add ±25% range (same as frontend)."""
+    time_intervals = [0, 15, 30, 45, 60, 75, 90]
+    per_min = avg / 90 if avg else 0
+    banded = []
+    for t in time_intervals:
+        val = round(per_min * t, 2)
+        if t == 0:
+            banded.append({"time": t, "actual": val, "stdRange": [0, 0]})
+        else:
+            std = val * 0.25
+            banded.append({
+                "time": t,
+                "actual": val,
+                "stdRange": [round(max(val - std, 0), 2), round(val + std, 2)]
+            })
+    return banded
+
+
+def safe_corr(x, y) -> float:
+    if len(x) < 2 or len(y) < 2 or np.std(x) == 0 or np.std(y) == 0:
+        return 0
+    corr = float(np.corrcoef(x, y)[0, 1])
+    return 0 if math.isnan(corr) or math.isinf(corr) else corr
+
+
+def empty_banded_data() -> dict:
+    """stats_banded_data for a pair without meetings in the last 5 years."""
+    return banded_data({}, None)
+
+
+def banded_data(means: dict, recent) -> dict:
+    """
+    stats_banded_data from the 5-year means ({column: mean}) and the latest meetings for
+    correlations (a DataFrame, or None if there are none).
+    """
+    result = {}
+    for key in STATS_KEYS:
+        if recent is not None:
+            goals = {side: recent[f"full_time_{side}_goals"].tolist() for side in ("home", "away")}
+            home_corr = safe_corr(recent[f"{key}_home"].tolist(), goals["home"])
+            away_corr = safe_corr(recent[f"{key}_away"].tolist(), goals["away"])
+        else:
+            home_corr = away_corr = 0
+        result[key] = {
+            "home": compute_banded_stats(means.get(f"{key}_home", 0)),
+            "away": compute_banded_stats(means.get(f"{key}_away", 0)),
+            "home_correlation": home_corr,
+            "away_correlation": away_corr,
+        }
+    return result
+
+
+def banded_data_by_pair(frame, today: date) -> dict:
+    """
+    {(home_team_id, away_team_id): stats_banded_data} for every pair in `frame`, one row per
+    meeting (pair, date, stat columns and full-time goals). Windows are relative to `today`.
+    """
+    import pandas as pd
+
+    if frame.empty:
+        return {}
+
+    day = frame["date"].dt.normalize()
+    sd_cutoff = pd.Timestamp(today - timedelta(days=SD_WINDOW_DAYS))
+    corr_cutoff = pd.Timestamp(today - timedelta(days=CORRELATION_WINDOW_DAYS))
+
+    means = frame[day >= sd_cutoff].groupby(_PAIR)[_STAT_COLUMNS].mean()
+    recent = (
+        frame[day >= corr_cutoff]
+        .sort_values("date", ascending=False, kind="stable")
+        .groupby(_PAIR)
+        .head(CORRELATION_MATCHES)
+    )
+    recent_by_pair = {pair: rows for pair, rows in recent.groupby(_PAIR)}
+    means_by_pair = means.to_dict("index")
+
+    return {
+        pair: banded_data(means_by_pair.get(pair, {}), recent_by_pair.get(pair))
+        for pair in frame.groupby(_PAIR).size().index
+    }
+
+
+class BandedStatsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_many(self, pairs) -> dict:
+        """{pair: stats_banded_data} for the given pairs, refreshing stale ones first."""
+        pairs = sorted(set(pairs))
+        if not pairs:
+            return {}
+        self.refresh_if_stale(pairs)
+        rows = (
+            self.db.query(BandedStats.home_team_id, BandedStats.away_team_id, BandedStats.stats_banded_data)
+            .filter(tuple_(BandedStats.home_team_id, BandedStats.away_team_id).in_(pairs))
+            .all()
+        )
+        stored = {(home_id, away_id): data for home_id, away_id, data in rows}
+        # Pairs that never met have no row
+        return {pair: stored.get(pair) or empty_banded_data() for pair in pairs}
+
+    def get(self, home_team_id: str, away_team_id: str) -> dict:
+        return self.get_many([(home_team_id, away_team_id)])[(home_team_id, away_team_id)]
+
+    def stale_pairs(self, pairs=None) -> list:
+        """Pairs whose stored data misses results recorded in head_to_head_summary, or predates today."""
+        pair_key = tuple_(HeadToHeadSummary.home_team_id, HeadToHeadSummary.away_team_id)
+        query = (
+            self.db.query(HeadToHeadSummary.home_team_id, HeadToHeadSummary.away_team_id)
+            .outerjoin(BandedStats, and_(
+                BandedStats.home_team_id == HeadToHeadSummary.home_team_id,
+                BandedStats.away_team_id == HeadToHeadSummary.away_team_id,
+            ))
+            .filter(or_(
+                BandedStats.home_team_id.is_(None),
+                BandedStats.computed_on < date.today(),
+                BandedStats.match_count != HeadToHeadSummary.matches_played,
+                BandedStats.latest_match_date.is_distinct_from(HeadToHeadSummary.last_match_date),
+            ))
+        )
+        if pairs is not None:
+            query = query.filter(pair_key.in_(list(pairs)))
+        return [tuple(row) for row in query.all()]
+
+    def refresh_if_stale(self, pairs=None) -> int:
+        """Rebuild the stale pairs among `pairs` (all pairs if None). Returns how many were rebuilt."""
+        stale = self.stale_pairs(pairs)
+        if stale:
+            self.rebuild(stale)
+        return len(stale)
+
+    def rebuild(self, pairs=None) -> int:
+        """
+        Recompute and store banded data for `pairs` (every pair if None) in one pass over
+        match_statistics. Commits. Returns the number of pairs written.
+        """
+        import pandas as pd
+
+        query = (
+            self.db.query(
+                Match.home_team_id,
+                Match.away_team_id,
+                Match.date,
+                *(getattr(MatchStatistics, column) for column in _STAT_COLUMNS),
+                MatchStatistics.full_time_home_goals,
+                MatchStatistics.full_time_away_goals,
+            )
+            .join(MatchStatistics, Match.match_id == MatchStatistics.match_id)
+            .filter(Match.home_team_id.isnot(None), Match.away_team_id.isnot(None), Match.date.isnot(None))
+        )
+        if pairs is not None:
+            pairs = list(pairs)
+            if not pairs:
+                return 0
+            query = query.filter(tuple_(Match.home_team_id, Match.away_team_id).in_(pairs))
+
+        columns = _PAIR + ["date"] + _STAT_COLUMNS + ["full_time_home_goals", "full_time_away_goals"]
+        frame = pd.DataFrame.from_records(query.all(), columns=columns)
+        if frame.empty:
+            return 0
+        frame["date"] = pd.to_datetime(frame["date"])
+
+        today = date.today()
+        data_by_pair = banded_data_by_pair(frame, today)
+        grouped = frame.groupby(_PAIR)["date"].agg(["max", "count"])
+
+        values = [
+            {
+                "home_team_id": home_id,
+                "away_team_id": away_id,
+                "stats_banded_data": data,
+                "latest_match_date": grouped.at[(home_id, away_id), "max"].to_pydatetime(),
+                "match_count": int(grouped.at[(home_id, away_id), "count"]),
+                "computed_on": today,
+            }
+            for (home_id, away_id), data in data_by_pair.items()
+        ]
+
+        try:
+            for start in range(0, len(values), 1000):
+                statement = insert(BandedStats).values(values[start:start + 1000])
+                self.db.execute(statement.on_conflict_do_update(
+                    index_elements=_PAIR,
+                    set_={
+                        "stats_banded_data": statement.excluded.stats_banded_data,
+                        "latest_match_date": statement.excluded.latest_match_date,
+                        "match_count": statement.excluded.match_count,
+                        "computed_on": statement.excluded.computed_on,
+                    },
+                ))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        print(f"[LOG] Rebuilt banded stats for {len(values)} team pairs")
+        return len(values)
@@ -0,0 +1,96 @@
+import os
+import re
+import csv
+import time
+import threading
+from app.teams.services.team_alias_service import load_team_aliases
+
+LAST_SEASON_CSV_PATH = os.path.join(os.path.dirname(__file__), "last_season.csv")
+
+_CSV_NAME = re.compile(r"[^a-z0-9]")
+
+
+def _alias_key(name: str) -> str:
+    # Team and alias names are compared with spaces and "&" stripped
+    return name.lower().replace(" ", "").replace("&", "")
+
+
+def _csv_key(name: str) -> str:
+    return _CSV_NAME.sub("", name.lower())
+
+
+def _to_float(value) -> float:
+    return float(value) if value not in (None, "") else 0.0
+
+
+class LastSeasonFallback:
+    """
+    Last-season table rows from last_season.csv, used when a team has no CurrentLeague or
+    Standing row. The CSV is joined with the alias groups once, into a dict from every
+    normalized alias to (played, wins, draws, losses), so a lookup is a single dict get.
+    The file is re-read only when its mtime changes (checked at most every `check_interval` seconds).
+    """
+
+    def __init__(self, csv_path: str = LAST_SEASON_CSV_PATH, check_interval: float = 5.0):
+        self.csv_path = csv_path
+        self.check_interval = check_interval
+        self._index = None     # normalized alias -> (played, wins, draws, losses); None if no CSV
+        self._mtime = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def lookup(self, team_name: str):
+        """(played, wins, draws, losses) for the team, or None if the CSV or the team is missing."""
+        index = self._current_index()
+        if index is None:
+            return None
+        return index.get(_alias_key(team_name))
+
+    def available(self) -> bool:
+        return self._current_index() is not None
+
+    def _current_index(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._index
+
+        with self._lock:
+            try:
+                mtime = os.stat(self.csv_path).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._mtime or self._checked_at is None:
+                self._index = self._build_index() if mtime is not None else None
+                self._mtime = mtime
+            self._checked_at = now
+            return self._index
+
+    def _build_index(self) -> dict:
+        table = {}
+        with open(self.csv_path, newline="") as f:
+            for row in csv.DictReader(f):
+                # First row wins when two teams normalize to the same name
+                table.setdefault(_csv_key(row.get("Team") or ""), (
+                    _to_float(row.get("Played")),
+                    _to_float(row.get("Wins")),
+                    _to_float(row.get("Draws")),
+                    _to_float(row.get("Losses")),
+                ))
+
+        try:
+            aliases_by_team = load_team_aliases()
+        except FileNotFoundError:
+            aliases_by_team = {}
+
+        index = {}
+        for aliases in aliases_by_team.values():
+            # A group's row is the first of its aliases found in the CSV; earlier groups take precedence
+            row = next((table[_alias_key(alias)] for alias in aliases if _alias_key(alias) in table), None)
+            if row is None:
+                continue
+            for alias in aliases:
+                index.setdefault(_alias_key(alias), row)
+        return index
+
+
+last_season_fallback = LastSeasonFallback()
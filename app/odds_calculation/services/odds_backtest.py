@@ -0,0 +1,272 @@
+import json
+import time
+import argparse
+import numpy as np
+from sqlalchemy.orm import Session
+from app.betting_odds.models.betting_odds_model import BettingOdds
+from app.core.reference_cache import reference_cache
+from app.leagues.models.leagues_models import League
+from app.match_statistics.models.head_to_head_summary_model import H2H_RECENT_RESULTS
+from app.match_statistics.models.match_statistics_model import MatchStatistics
+from app.matches.models.match_model import Match
+from app.seasons.models.seasons_model import Season
+from app.odds_calculation.services import odds_kernel
+from app.odds_calculation.services.odds_batch_loader import previous_season_year
+
+# Bookmaker column prefixes in betting_odds: <prefix>H, <prefix>D, <prefix>A
+BOOKMAKERS = ("B365", "BW", "BF", "PS", "WH", "Max", "Avg")
+OUTCOMES = ("H", "D", "A")
+_EPS = 1e-15
+
+_SEASON_COLUMNS = ("played", "win", "draw", "loss")
+
+
+def point_in_time_inputs(frame, previous_season_ids: dict):
+    """
+    Model inputs for every match in `frame` (one row per match: match_id, date, season_id,
+    home/away team IDs, league_code, full_time_result) as they stood before kick-off:
+    - current season: the team's record from its earlier matches that season
+    - last season: the team's final record and first league in the previous season
+    - H2H: earlier meetings of the same home/away pairing
+    The league the match was played in stands in for both teams' current league.
+    """
+    import pandas as pd
+
+    frame = frame.reset_index(drop=True)
+    result = frame["full_time_result"]
+    frame["last_season_id"] = frame["season_id"].map(previous_season_ids)
+
+    games = pd.concat([
+        pd.DataFrame({
+            "match_id": frame["match_id"], "side": side, "team_id": frame[f"{side}_team_id"],
+            "season_id": frame["season_id"], "date": frame["date"], "league_code": frame["league_code"],
+            "win": (result == won).astype(int), "draw": (result == "D").astype(int), "loss": (result == lost).astype(int),
+        })
+        for side, won, lost in (("home", "H", "A"), ("away", "A", "H"))
+    ], ignore_index=True).sort_values(["team_id", "season_id", "date", "match_id"], kind="stable")
+
+    by_team_season = games.groupby(["team_id", "season_id"], sort=False)
+    games["played"] = by_team_season.cumcount()
+    for column in ("win", "draw", "loss"):
+        games[f"{column}_before"] = by_team_season[column].cumsum() - games[column]
+
+    final_tables = by_team_season.agg(
+        played=("win", "size"), win=("win", "sum"), draw=("draw", "sum"), loss=("loss", "sum"),
+        league_code=("league_code", "first"),
+    ).reset_index()
+
+    for side in ("home", "away"):
+        current = games.loc[games["side"] == side, ["match_id", "played", "win_before", "draw_before", "loss_before"]]
+        frame = frame.merge(current.rename(columns={
+            "played": f"{side}_current_played",
+            "win_before": f"{side}_current_win",
+            "draw_before": f"{side}_current_draw",
+            "loss_before": f"{side}_current_loss",
+        }), on="match_id", how="left")
+
+        last = final_tables.rename(columns={
+            "team_id": f"{side}_team_id",
+            "season_id": "last_season_id",
+            "league_code": f"{side}_last_league",
+            **{column: f"{side}_last_{column}" for column in _SEASON_COLUMNS},
+        })
+        frame = frame.merge(last, on=[f"{side}_team_id", "last_season_id"], how="left")
+        frame[[f"{side}_last_{column}" for column in _SEASON_COLUMNS]] = (
+            frame[[f"{side}_last_{column}" for column in _SEASON_COLUMNS]].fillna(0)
+        )
+
+    frame = frame.sort_values(["home_team_id", "away_team_id", "date", "match_id"], kind="stable")
+    pair = [frame["home_team_id"], frame["away_team_id"]]
+    frame["h2h_played"] = frame.groupby(pair, sort=False).cumcount()
+    for outcome, column in (("H", "h2h_home_wins"), ("D", "h2h_draws")):
+        won = (frame["full_time_result"] == outcome).astype(int)
+        frame[column] = won.groupby(pair, sort=False).cumsum() - won
+
+    return frame.sort_values(["date", "match_id"], kind="stable").reset_index(drop=True)
+
+
+def predict(inputs) -> np.ndarray:
+    """(n, 3) array of model probabilities (home, draw, away) for point_in_time_inputs() rows."""
+    def season(side: str, which: str):
+        return tuple(inputs[f"{side}_{which}_{column}"].to_numpy(dtype=float) for column in _SEASON_COLUMNS)
+
+    # Same H2H figures as the live calculation: counts are all-time, the total capped at the recent window
+    h2h_total = np.minimum(inputs["h2h_played"].to_numpy(), H2H_RECENT_RESULTS)
+    safe_total = np.where(h2h_total > 0, h2h_total, 1)
+    h2h_home_win_ratio = np.where(h2h_total > 0, inputs["h2h_home_wins"].to_numpy() / safe_total, 0.0)
+    h2h_draw_ratio = np.where(h2h_total > 0, inputs["h2h_draws"].to_numpy() / safe_total, 0.0)
+
+    home_win, draw, away_win = odds_kernel.calculate_many(
+        season("home", "current"), season("home", "last"),
+        season("away", "current"), season("away", "last"),
+        h2h_total, h2h_home_win_ratio, h2h_draw_ratio,
+        _statuses(inputs, "home"), _statuses(inputs, "away"),
+    )
+    return np.column_stack([home_win, draw, away_win])
+
+
+def _statuses(inputs, side: str) -> np.ndarray:
+    # A team without matches last season counts as promoted from the third tier, as in the live lookup
+    last_codes = [code if isinstance(code, str) else odds_kernel.PROMOTED_FROM_L3 for code in inputs[f"{side}_last_league"]]
+    current_codes = [code if isinstance(code, str) else None for code in inputs["league_code"]]
+    known = {}
+    statuses = []
+    for key in zip(last_codes, current_codes):
+        if key not in known:
+            known[key] = odds_kernel.team_status(*key)
+        statuses.append(known[key])
+    return np.array(statuses, dtype=object)
+
+
+def score(probabilities: np.ndarray, outcomes: np.ndarray) -> dict:
+    """Hit rate, multi-class Brier score and log-loss of (n, 3) probabilities against outcome indices."""
+    if len(outcomes) == 0:
+        return {"matches": 0, "hit_rate": None, "brier": None, "log_loss": None}
+    actual = np.zeros_like(probabilities)
+    actual[np.arange(len(outcomes)), outcomes] = 1
+    picked = probabilities[np.arange(len(outcomes)), outcomes]
+    return {
+        "matches": int(len(outcomes)),
+        "hit_rate": round(float(np.mean(probabilities.argmax(axis=1) == outcomes)), 4),
+        "brier": round(float(np.mean(np.sum((probabilities - actual) ** 2, axis=1))), 4),
+        "log_loss": round(float(-np.mean(np.log(np.clip(picked, _EPS, 1)))), 4),
+    }
+
+
+def bookmaker_report(probabilities: np.ndarray, outcomes: np.ndarray, prices: np.ndarray, min_edge: float = 0.0) -> dict:
+    """
+    Model vs one bookmaker on the matches it priced. The bookmaker is scored on its implied
+    probabilities (1/price, overround removed). ROI is for a 1-unit stake on the outcome with the
+    largest edge (probability × price − 1) whenever that edge exceeds `min_edge`.
+    """
+    priced = np.all(prices > 1, axis=1)
+    probabilities, outcomes, prices = probabilities[priced], outcomes[priced], prices[priced]
+
+    implied = 1 / prices
+    implied = implied / implied.sum(axis=1, keepdims=True)
+
+    edges = probabilities * prices - 1
+    choice = edges.argmax(axis=1)
+    rows = np.arange(len(choice))
+    placed = edges[rows, choice] > min_edge
+    won = placed & (choice == outcomes)
+    profit = float(np.sum(np.where(won, prices[rows, choice] - 1, 0)) - np.sum(placed & ~won))
+    bets = int(placed.sum())
+
+    return {
+        "model": score(probabilities, outcomes),
+        "bookmaker": score(implied, outcomes),
+        "bets": bets,
+        "wins": int(won.sum()),
+        "profit": round(profit, 2),
+        "roi": round(profit / bets, 4) if bets else None,
+    }
+
+
+class OddsBacktestService:
+    """
+    Scores the ratio model against history: every match with a result gets the inputs it
+    would have had before kick-off, the whole history goes through odds_kernel.calculate_many
+    at once, and the predictions are compared with the results and the stored bookmaker prices.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def run(self, season_ids=None, league_codes=None, date_from=None, date_to=None, min_edge: float = 0.0) -> dict:
+        """
+        Backtest report. Inputs are always built from the full history; the filters only select
+        which matches are scored. Without a last_season.csv equivalent for the past, a team with
+        no matches in the previous season counts as having played none.
+        """
+        started = time.perf_counter()
+        frame = self._load_history()
+        if frame.empty:
+            return {"matches": 0, "message": "No matches with results found."}
+
+        inputs = point_in_time_inputs(frame, self._previous_season_ids())
+        selected = np.ones(len(inputs), dtype=bool)
+        if season_ids:
+            selected &= inputs["season_id"].isin(season_ids).to_numpy()
+        if league_codes:
+            selected &= inputs["league_code"].isin(league_codes).to_numpy()
+        if date_from is not None:
+            selected &= (inputs["date"] >= date_from).to_numpy()
+        if date_to is not None:
+            selected &= (inputs["date"] <= date_to).to_numpy()
+        inputs = inputs[selected]
+
+        probabilities = predict(inputs)
+        outcomes = inputs["full_time_result"].map({outcome: i for i, outcome in enumerate(OUTCOMES)}).to_numpy()
+
+        report = {
+            "matches": int(len(inputs)),
+            "model": score(probabilities, outcomes),
+            "bookmakers": {
+                bookmaker: bookmaker_report(
+                    probabilities, outcomes,
+                    inputs[[f"{bookmaker}{outcome}" for outcome in OUTCOMES]].to_numpy(dtype=float),
+                    min_edge,
+                )
+                for bookmaker in BOOKMAKERS
+            },
+        }
+        report["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+        print(f"[LOG] Backtested {report['matches']} matches in {report['elapsed_seconds']}s")
+        return report
+
+    def _load_history(self):
+        """One row per match with a result: teams, season, league code, result and bookmaker prices."""
+        import pandas as pd
+
+        price_columns = [f"{bookmaker}{outcome}" for bookmaker in BOOKMAKERS for outcome in OUTCOMES]
+        rows = (
+            self.db.query(
+                Match.match_id, Match.date, Match.season_id, Match.home_team_id, Match.away_team_id,
+                League.league_code, MatchStatistics.full_time_result,
+                *(getattr(BettingOdds, column) for column in price_columns),
+            )
+            .join(MatchStatistics, MatchStatistics.match_id == Match.match_id)
+            .outerjoin(League, League.league_id == Match.league_id)
+            .outerjoin(BettingOdds, BettingOdds.match_id == Match.match_id)
+            .filter(
+                Match.home_team_id.isnot(None),
+                Match.away_team_id.isnot(None),
+                Match.season_id.isnot(None),
+                MatchStatistics.full_time_result.in_(OUTCOMES),
+            )
+            .all()
+        )
+        columns = ["match_id", "date", "season_id", "home_team_id", "away_team_id", "league_code", "full_time_result"]
+        frame = pd.DataFrame.from_records(rows, columns=columns + price_columns)
+        # A match with several statistics or odds rows is scored once
+        return frame.drop_duplicates("match_id")
+
+    def _previous_season_ids(self) -> dict:
+        seasons = reference_cache.all(self.db, Season)
+        ids_by_year = {season.season_year: season.season_id for season in seasons}
+        return {season.season_id: ids_by_year.get(previous_season_year(season.season_year)) for season in seasons}
+
+
+def main():
+    from datetime import datetime
+    from app.core.database import ReadSessionLocal
+
+    parser = argparse.ArgumentParser(description="Backtest the odds model against historical results and prices.")
+    parser.add_argument("--season", action="append", dest="season_ids", help="season_id to score (repeatable)")
+    parser.add_argument("--league", action="append", dest="league_codes", help="league code to score (repeatable)")
+    parser.add_argument("--from", dest="date_from", type=datetime.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=datetime.fromisoformat)
+    parser.add_argument("--min-edge", type=float, default=0.0, help="minimum edge for a value bet (default 0)")
+    args = parser.parse_args()
+
+    db = ReadSessionLocal()
+    try:
+        report = OddsBacktestService(db).run(args.season_ids, args.league_codes, args.date_from, args.date_to, args.min_edge)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+from sqlalchemy import tuple_, or_
+from sqlalchemy.orm import Session
+from app.matches.models.match_model import Match
+from app.seasons.models.seasons_model import Season
+from app.standings.models.standings_model import Standing
+from app.current_league.models.current_league_model import CurrentLeague
+from app.teams.models.team_model import Team
+from app.leagues.models.leagues_models import League
+from app.odds_calculation.models.odds_calculation_model import OddsCalculation
+from app.odds_calculation.models.banded_stats_model import BandedStats
+from app.match_statistics.models.head_to_head_summary_model import HeadToHeadSummary
+from app.core.reference_cache import reference_cache
+from app.match_statistics.services.head_to_head_service import HeadToHeadService
+from app.odds_calculation.services.banded_stats_service import BandedStatsService
+
+
+def previous_season_year(season_year: str):
+    """'2024/2025' -> '2023/2024'."""
+    if season_year:
+        start_year, end_year = map(int, season_year.split("/"))
+        return f"{start_year - 1}/{end_year - 1}"
+    return None
+
+
+class OddsBatchData:
+    """Everything the odds calculation reads for a list of fixtures, indexed for in-memory lookups."""
+
+    def __init__(self):
+        self.seasons = {}              # season_id -> Season (cached row)
+        self.last_season_ids = {}      # season_id -> previous season_id (or None)
+        self.teams = {}                # team_id -> Team (cached row)
+        self.h2h_summaries = {}        # (home_id, away_id) -> HeadToHeadSummary
+        self.table_rows = {}           # (team_id, season_id) -> (played, wins, draws, losses)
+        self.current_league_codes = {} # (team_id, season_id) -> league_code from current_league
+        self.season_league_codes = {}  # (team_id, season_id) -> league_code of a match played that season
+        self.banded_stats = {}         # (home_id, away_id) -> ready-made stats_banded_data
+        self.existing_fingerprints = {} # (date, time, home_id, away_id) -> stored OddsCalculation.input_fingerprint
+
+
+class OddsBatchLoader:
+    """
+    Loads the inputs of OddsCalculationService for many fixtures at once: one query per
+    table (IN / tuple-IN filters) instead of ~25 queries per fixture.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, fixtures) -> OddsBatchData:
+        """`fixtures` are objects with home_team_id, away_team_id and season_id (e.g. NewOdds rows)."""
+        data = OddsBatchData()
+
+        pairs = sorted({(f.home_team_id, f.away_team_id) for f in fixtures})
+        team_ids = sorted({team_id for pair in pairs for team_id in pair})
+        season_ids = sorted({f.season_id for f in fixtures if f.season_id})
+
+        for season_id in season_ids:
+            season = reference_cache.lookup(self.db, Season, "season_id", season_id)
+            if season is None:
+                continue
+            data.seasons[season_id] = season
+            last_season = reference_cache.lookup(self.db, Season, "season_year", previous_season_year(season.season_year))
+            data.last_season_ids[season_id] = last_season.season_id if last_season else None
+
+        for team_id in team_ids:
+            team = reference_cache.lookup(self.db, Team, "team_id", team_id)
+            if team is not None:
+                data.teams[team_id] = team
+
+        if not pairs:
+            return data
+
+        all_season_ids = sorted(set(season_ids) | {s for s in data.last_season_ids.values() if s})
+        last_season_ids = set(data.last_season_ids.values())
+
+        self._load_head_to_head(data, pairs)
+        self._load_table_rows(data, team_ids, all_season_ids)
+        self._load_current_league_codes(data, team_ids, season_ids)
+        self._load_season_league_codes(data, team_ids, last_season_ids)
+        self._load_banded_stats(data, pairs)
+        self._load_existing_fingerprints(data, fixtures)
+        return data
+
+    def load_all(self) -> OddsBatchData:
+        """
+        The inputs for every possible fixture: all seasons, teams, table rows, league codes,
+        H2H summaries and stored banded stats. Used for the in-memory evaluation snapshot;
+        banded stats are read as stored, so refresh stale pairs first if that matters.
+        """
+        data = OddsBatchData()
+
+        seasons = reference_cache.all(self.db, Season)
+        seasons_by_year = {season.season_year: season for season in seasons}
+        for season in seasons:
+            data.seasons[season.season_id] = season
+            last_season = seasons_by_year.get(previous_season_year(season.season_year))
+            data.last_season_ids[season.season_id] = last_season.season_id if last_season else None
+        data.teams = {team.team_id: team for team in reference_cache.all(self.db, Team)}
+
+        data.h2h_summaries = {
+            (summary.home_team_id, summary.away_team_id): summary
+            for summary in self.db.query(HeadToHeadSummary).all()
+        }
+        self._load_table_rows(data)
+        self._load_current_league_codes(data)
+        self._load_season_league_codes(data)
+        data.banded_stats = {
+            (home_id, away_id): banded
+            for home_id, away_id, banded in self.db.query(
+                BandedStats.home_team_id, BandedStats.away_team_id, BandedStats.stats_banded_data
+            ).all()
+        }
+        return data
+
+    def _load_head_to_head(self, data: OddsBatchData, pairs):
+        data.h2h_summaries = HeadToHeadService(self.db).get_summaries(pairs)
+
+    # team_ids / season_ids of None load every row
+
+    def _load_table_rows(self, data: OddsBatchData, team_ids=None, season_ids=None):
+        if season_ids is not None and not season_ids:
+            return
+        # current_league wins over standings, as in the per-fixture lookup
+        for model in (CurrentLeague, Standing):
+            query = self.db.query(model.team_id, model.season_id, model.played, model.wins, model.draws, model.losses)
+            if team_ids is not None:
+                query = query.filter(model.team_id.in_(team_ids))
+            if season_ids is not None:
+                query = query.filter(model.season_id.in_(season_ids))
+            for team_id, season_id, played, wins, draws, losses in query.all():
+                data.table_rows.setdefault((team_id, season_id), (played, wins, draws, losses))
+
+    def _load_current_league_codes(self, data: OddsBatchData, team_ids=None, season_ids=None):
+        if season_ids is not None and not season_ids:
+            return
+        query = (
+            self.db.query(CurrentLeague.team_id, CurrentLeague.season_id, League.league_code)
+            .join(League, CurrentLeague.league_id == League.league_id)
+        )
+        if team_ids is not None:
+            query = query.filter(CurrentLeague.team_id.in_(team_ids))
+        if season_ids is not None:
+            query = query.filter(CurrentLeague.season_id.in_(season_ids))
+        for team_id, season_id, league_code in query.all():
+            data.current_league_codes.setdefault((team_id, season_id), league_code)
+
+    def _load_season_league_codes(self, data: OddsBatchData, team_ids=None, season_ids=None):
+        season_filter = None
+        if season_ids is not None:
+            # A missing previous season is looked up as season_id IS NULL, like the per-fixture query
+            season_filter = [Match.season_id.in_([s for s in season_ids if s])]
+            if None in season_ids:
+                season_filter.append(Match.season_id.is_(None))
+
+        for team_column in (Match.home_team_id, Match.away_team_id):
+            query = self.db.query(team_column, Match.season_id, Match.league_id).distinct()
+            if season_filter is not None:
+                query = query.filter(or_(*season_filter))
+            if team_ids is not None:
+                query = query.filter(team_column.in_(team_ids))
+            for team_id, season_id, league_id in query.all():
+                if (team_id, season_id) in data.season_league_codes:
+                    continue
+                league = reference_cache.lookup(self.db, League, "league_id", league_id)
+                if league:
+                    data.season_league_codes[(team_id, season_id)] = league.league_code
+
+    def _load_banded_stats(self, data: OddsBatchData, pairs):
+        data.banded_stats = BandedStatsService(self.db).get_many(pairs)
+
+    def _load_existing_fingerprints(self, data: OddsBatchData, fixtures):
+        keys = sorted({(f.date, f.time, f.home_team_id, f.away_team_id) for f in fixtures})
+        fixture_key = (OddsCalculation.date, OddsCalculation.time, OddsCalculation.home_team_id, OddsCalculation.away_team_id)
+        rows = (
+            self.db.query(*fixture_key, OddsCalculation.input_fingerprint)
+            .filter(tuple_(*fixture_key).in_(keys))
+            .all()
+        )
+        for date, time, home_id, away_id, input_fingerprint in rows:
+            data.existing_fingerprints[(date, time, home_id, away_id)] = input_fingerprint
@@ -0,0 +1,216 @@
+import os
+import math
+import asyncio
+import argparse
+import multiprocessing
+from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from app.core.config import settings
+
+# NOTE: nothing that imports app.core.database at module level. Worker processes import this
+# module before _init_worker runs, and the engines are sized from PROCESS_ROLE on import.
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects container CPU sets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def resolve_worker_count(workers: int = None) -> int:
+    """
+    `workers` if given, else ODDS_CALC_WORKERS; 0 or less means one per available core.
+    Never more than the available cores or ODDS_CALC_MAX_WORKERS.
+    """
+    if workers is None:
+        workers = settings.ODDS_CALC_WORKERS
+    cap = min(available_cores(), settings.ODDS_CALC_MAX_WORKERS)
+    if workers <= 0:
+        workers = cap
+    return max(1, min(workers, cap))
+
+
+def partition_fixtures(fixtures, workers: int) -> list:
+    """
+    Split fixtures into at most `workers` lists of similar size, keeping each league together
+    where possible (fixtures of one league share teams, seasons and H2H pairs, so the
+    per-worker preload stays small). Leagues bigger than an even share are split.
+    """
+    fixtures = list(fixtures)
+    if not fixtures:
+        return []
+
+    share = math.ceil(len(fixtures) / workers)
+    by_league = defaultdict(list)
+    for fixture in fixtures:
+        by_league[fixture.league_id].append(fixture)
+
+    chunks = []
+    for league_fixtures in by_league.values():
+        for start in range(0, len(league_fixtures), share):
+            chunks.append(league_fixtures[start:start + share])
+
+    # Largest chunk first onto the least loaded partition
+    partitions = [[] for _ in range(min(workers, len(chunks)))]
+    for chunk in sorted(chunks, key=len, reverse=True):
+        min(partitions, key=len).extend(chunk)
+    return [partition for partition in partitions if partition]
+
+
+def _init_worker():
+    # Runs before app.core.database is imported in the worker, so its pools use the small profile
+    settings.PROCESS_ROLE = "background"
+
+
+def _calculate_partition(new_odds_ids: list, force: bool = False) -> dict:
+    """Worker entry point: {new_odds_id: odds_data} for the given NewOdds rows."""
+    return asyncio.run(_calculate_partition_async(new_odds_ids, force))
+
+
+async def _calculate_partition_async(new_odds_ids: list, force: bool) -> dict:
+    from sqlalchemy import select
+    from app.core.database import AsyncSessionLocal, async_engine
+    from app.core.query_stats import track_queries
+    from app.new_odds.models.new_odds_model import NewOdds
+    from app.odds_calculation.services.odds_calculation_service import OddsCalculationService
+
+    try:
+        with track_queries(f"task:odds_partition[{len(new_odds_ids)}]"):
+            async with AsyncSessionLocal() as db:
+                fixtures = (await db.execute(
+                    select(NewOdds).filter(NewOdds.new_odds_id.in_(new_odds_ids))
+                )).scalars().all()
+                return await OddsCalculationService(db).calculate_ratios_batch(fixtures, force=force)
+    finally:
+        # Pooled asyncpg connections are tied to this event loop, which asyncio.run closes
+        await async_engine.dispose()
+
+
+class OddsCalculationRunner:
+    """
+    Runs the odds calculation for a list of NewOdds fixtures across worker processes.
+    Each worker opens its own session and preloads only its partition's data; the results
+    are merged and saved from the calling process in one pass.
+
+    `progress` (e.g. a Job) gets set_phase() and advance() calls as fixtures are calculated:
+    per fixture in-process, per finished partition with workers.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def run(self, fixtures, workers: int = None, force: bool = False, progress=None) -> dict:
+        """
+        Calculate and save odds; fixtures with unchanged inputs are skipped unless `force` is set.
+        Returns counts: fixtures, unchanged, failed (no odds), saved.
+        """
+        from app.odds_calculation.services.odds_calculation_service import OddsCalculationService
+
+        fixtures = list(fixtures)
+        workers = resolve_worker_count(workers)
+        partitions = partition_fixtures(fixtures, workers)
+        service = OddsCalculationService(self.db)
+        if progress is not None:
+            progress.set_phase("calculating", total=len(fixtures))
+
+        if len(partitions) <= 1:
+            print(f"[LOG] Calculating odds for {len(fixtures)} fixtures in-process")
+            on_fixture = progress.advance if progress is not None else None
+            calculated = await service.calculate_ratios_batch(fixtures, force=force, on_fixture=on_fixture)
+        else:
+            print(f"[LOG] Calculating odds for {len(fixtures)} fixtures on {len(partitions)} workers "
+                  f"(partition sizes {[len(p) for p in partitions]})")
+            calculated = await self._calculate_in_workers(partitions, force, progress)
+
+        failed = sum(1 for odds_data in calculated.values() if not odds_data)
+        if progress is not None:
+            progress.set_phase("saving", total=len(calculated) - failed)
+        saved = await service.save_results(fixtures, calculated)
+        if progress is not None:
+            progress.advance(len(saved))
+
+        return {
+            "fixtures": len(fixtures),
+            "unchanged": len(fixtures) - len(calculated),
+            "failed": failed,
+            "saved": len(saved),
+        }
+
+    async def _calculate_in_workers(self, partitions, force: bool, progress=None) -> dict:
+        loop = asyncio.get_running_loop()
+        calculated = {}
+        # spawn: the workers must not inherit this process's event loop, threads and pooled sockets
+        with ProcessPoolExecutor(
+            max_workers=len(partitions),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as executor:
+            async def calculate(partition):
+                partial = await loop.run_in_executor(
+                    executor, _calculate_partition, [f.new_odds_id for f in partition], force
+                )
+                if progress is not None:
+                    progress.advance(len(partition))
+                return partial
+
+            for partial in await asyncio.gather(*(calculate(partition) for partition in partitions)):
+                calculated.update(partial)
+        return calculated
+
+
+def calculate_ratios_job(job, workers: int = None, force: bool = False) -> dict:
+    """
+    JobExecutor entry point: calculate and save odds for every upcoming fixture. Runs on the
+    job's thread with its own event loop, so it uses an isolated (unpooled) async session.
+    """
+    return asyncio.run(_calculate_ratios_job(job, workers, force))
+
+
+async def _calculate_ratios_job(job, workers: int, force: bool) -> dict:
+    from app.core.database import isolated_async_session
+    from app.core.query_stats import track_queries
+    from app.new_odds.services.new_odds_service import NewOddsService
+
+    with track_queries("job:calculate_ratios"):
+        async with isolated_async_session() as db:
+            job.set_phase("loading fixtures")
+            fixtures = await db.run_sync(
+                lambda session: NewOddsService(session).get_upcoming_matches(datetime.now())
+            )
+            print(f"[LOG] Total upcoming matches fetched: {len(fixtures)}")
+            if not fixtures:
+                return {"fixtures": 0, "unchanged": 0, "failed": 0, "saved": 0}
+            return await OddsCalculationRunner(db).run(fixtures, workers=workers, force=force, progress=job)
+
+
+async def _run_upcoming(workers: int = None, force: bool = False):
+    from app.core.database import AsyncSessionLocal
+    from app.new_odds.services.new_odds_service import NewOddsService
+
+    async with AsyncSessionLocal() as db:
+        fixtures = await db.run_sync(
+            lambda session: NewOddsService(session).get_upcoming_matches(datetime.now())
+        )
+        if not fixtures:
+            print("[LOG] No upcoming matches found for ratio calculation.")
+            return None
+        return await OddsCalculationRunner(db).run(fixtures, workers=workers, force=force)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculate odds for all upcoming fixtures.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default ODDS_CALC_WORKERS; 0 = one per core, 1 = in-process)")
+    parser.add_argument("--force", action="store_true",
+                        help="recalculate every fixture, even when its inputs are unchanged")
+    args = parser.parse_args()
+    summary = asyncio.run(_run_upcoming(args.workers, args.force))
+    if summary:
+        print(f"[LOG] Odds calculation finished: {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,30 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.match_statistics.models.match_statistics_model import MatchStatistics
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.matches.models.match_model import Match
 from app.seasons.models.seasons_model import Season
 from app.standings.models.standings_model import Standing
 from app.current_league.models.current_league_model import CurrentLeague
 from app.teams.models.team_model import Team
 from app.odds_calculation.services.odds_saving_service import OddsSavingService
-from app.match_statistics.services.match_statistics_service import MatchStatisticsService
+from app.odds_calculation.services.banded_stats_service import BandedStatsService, empty_banded_data
+from app.match_statistics.models.head_to_head_summary_model import HeadToHeadSummary, H2H_RECENT_RESULTS
 from app.leagues.models.leagues_models import League
-from datetime import datetime, timedelta
-import re
-import os
-import pandas as pd
+from app.core.reference_cache import reference_cache
+from app.odds_calculation.services.odds_batch_loader import OddsBatchLoader, previous_season_year
+from app.odds_calculation.services.last_season_fallback import last_season_fallback
+from app.odds_calculation.services import odds_kernel
 import json
-import statistics
-import numpy as np
-import math
+import hashlib
 
-class OddsCalculationService:
-    LAST_SEASON_ID = None
-    CURRENT_SEASON_ID=None
-    CURRENT_LEAGUE_ID = None
-    # Class-level attribute for aliases
-    TEAM_ALIASES = {}
-    HOME_TEAM_STATUS = None
-    AWAY_TEAM_STATUS = None
+# Part of every input fingerprint; bump it when the calculation itself changes
+ODDS_INPUTS_VERSION = 1
 
-    
+
+class OddsCalculationService:
+    """
+    Gathers the inputs for fixtures and turns them into odds with odds_kernel.
+    Holds no per-fixture state, so instances can be used concurrently.
+    """
     LEAGUE_TIERS = {
         "C1": ["L1", "L2"],   # England
         "C2": ["L3", "L4"],   # Germany
@@ -38,355 +35,315 @@ class OddsCalculationService:
         "C7": ["L12"]         # France
     }
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.odds_saving_service = OddsSavingService(db)
-        self.match_statistics_service = MatchStatisticsService(db)
-        # Load aliases once
-        if not self.__class__.TEAM_ALIASES:  # only if empty
-            try:
-                with open("app/teams/teams_aliases.json", "r") as f:
-                    self.__class__.TEAM_ALIASES = json.load(f)
-            except FileNotFoundError:
-                print("[WARN] teams_aliases.json not found. Using empty aliases.")
-                self.__class__.TEAM_ALIASES = {}
-
-    async def calculate_ratios_for_matches(self, new_matches):
-        """Calculate win, draw, and loss ratios for a list of matches and save them."""
-        results = []
 
+    async def calculate_ratios_for_matches(self, new_matches, batch: bool = True, force: bool = False):
+        """
+        Calculate win, draw, and loss ratios for a list of matches and save them.
+        With batch=True the inputs of all matches are loaded up front (see calculate_ratios_batch)
+        and fixtures whose inputs haven't changed are skipped unless `force` is set;
+        batch=False keeps the original query-per-match path.
+        """
+        if batch:
+            calculated = await self.calculate_ratios_batch(new_matches, force=force)
+        else:
+            calculated = {}
+            for match in new_matches:
+                calculated[match.new_odds_id] = await self.calculate_ratios(match.home_team_id, match.away_team_id, match.season_id)
+
+        return await self.save_results(new_matches, calculated)
+
+    async def save_results(self, new_matches, calculated: dict) -> list:
+        """
+        Save {new_odds_id: odds_data} results for the given matches in one bulk upsert
+        transaction (nothing is saved if it fails). Matches missing from `calculated` were
+        skipped as unchanged and are left as they are. Returns the saved odds_calculation_ids.
+        """
+        results = []
+        unchanged = 0
         for match in new_matches:
-            print(f"[LOG] Processing match_id: {match.new_odds_id}, Home: {match.home_team_id}, Away: {match.away_team_id}, Date: {match.date}")
-            self.__class__.CURRENT_LEAGUE_ID = match.league_id
-            odds_data = await self.calculate_ratios(match.home_team_id, match.away_team_id, match.season_id)
-            banded_data = odds_data.get("stats_banded_data") 
+            if match.new_odds_id not in calculated:
+                unchanged += 1
+                continue
+            odds_data = calculated.get(match.new_odds_id)
             if not odds_data:
-                    print(f"[WARN] No odds returned for match_id: {match.new_odds_id}")
+                print(f"[WARN] No odds returned for match_id: {match.new_odds_id}")
+                continue
+            results.append({
+                "date": match.date,
+                "time": match.time,
+                "home_team_id": match.home_team_id,
+                "away_team_id": match.away_team_id,
+                "odds_data": odds_data,
+                "stats_metrics": odds_data.get("stats_banded_data"),
+                "fixture_id": match.fixture_id,
+            })
+        if unchanged:
+            print(f"[LOG] Skipped {unchanged} fixtures with unchanged inputs")
+        if not results:
+            return []
+
+        try:
+            saved_ids = await self.db.run_sync(
+                lambda session: OddsSavingService(session).save_calculated_odds_bulk(results)
+            )
+        except Exception as e:
+            print(f"[ERROR] Failed to save odds for {len(results)} fixtures. Error: {e}")
+            raise
+
+        print(f"[LOG] Odds saved for {len(saved_ids)} fixtures")
+        return saved_ids
+
+    async def calculate_ratios_batch(self, fixtures, force: bool = False, on_fixture=None) -> dict:
+        """
+        Calculate ratios for many fixtures from one batched load (a handful of queries in total,
+        instead of ~25 per fixture). Returns {new_odds_id: odds_data or None}; nothing is saved.
+        The results are identical to calling calculate_ratios() for each fixture.
+
+        Each result carries an input_fingerprint. Fixtures whose stored OddsCalculation has the
+        same fingerprint are left out of the result, unless `force` is set. `on_fixture` is
+        called after each fixture (progress reporting).
+        """
+        fixtures = list(fixtures)
+        data = await self.db.run_sync(lambda session: OddsBatchLoader(session).load(fixtures))
+        return self.calculate_from_data(data, fixtures, force=force, on_fixture=on_fixture)
+
+    def calculate_from_data(self, data, fixtures, force: bool = False, adhoc: bool = False, on_fixture=None) -> dict:
+        """
+        calculate_ratios_batch() over already loaded OddsBatchData; no queries are made.
+        `adhoc` is for what-if pairings that are never saved: no input fingerprints and no
+        per-team warnings.
+        """
+        def season_performance(team, season_id):
+            if not season_id:
+                return None
+            row = data.table_rows.get((team.team_id, season_id))
+            if row is not None:
+                return self._season_performance(*row)
+            return self._season_performance(*self._fallback_performance(team.team_name))
+
+        def performances(team, season_id, last_season_id):
+            current_performance = season_performance(team, season_id)
+            last_performance = season_performance(team, last_season_id) if last_season_id else None
+            if not adhoc:
+                if not current_performance or current_performance.played == 0:
+                    print(f"[WARN] No current season performance for team_id: {team.team_id}")
+                if not last_performance or last_performance.played == 0:
+                    print(f"[WARN] No last season performance for team_id: {team.team_id}")
+            return current_performance, last_performance
+
+        results = {}
+        for fixture in fixtures:
+            if on_fixture is not None:
+                on_fixture()
+            home_id, away_id, season_id = fixture.home_team_id, fixture.away_team_id, fixture.season_id
+            if season_id not in data.seasons:
+                if not adhoc:
+                    print(f"[WARN] No season found for season_id: {season_id}")
+                results[fixture.new_odds_id] = None
+                continue
+            last_season_id = data.last_season_ids.get(season_id)
+
+            home_team, away_team = data.teams.get(home_id), data.teams.get(away_id)
+            if not home_team or not away_team:
+                if not adhoc:
+                    print(f"[ERROR] No team found for team_id: {home_id if not home_team else away_id}")
+                results[fixture.new_odds_id] = None
+                continue
+
+            pair = (home_id, away_id)
+            summary = data.h2h_summaries.get(pair)
+
+            input_fingerprint = None
+            if not adhoc:
+                input_fingerprint = self._input_fingerprint(data, home_team, away_team, season_id, last_season_id)
+                fixture_key = (fixture.date, fixture.time, home_id, away_id)
+                if not force and data.existing_fingerprints.get(fixture_key) == input_fingerprint:
                     continue
+            if summary is None:
+                head_to_head = self._head_to_head(0, 0, 0, 0)
+            else:
+                head_to_head = self._head_to_head(
+                    min(summary.matches_played, H2H_RECENT_RESULTS),
+                    summary.home_wins, summary.away_wins, summary.draws,
+                )
+
             try:
-                saved_entry = self.odds_saving_service.save_calculated_odds(
-                    date=match.date,
-                    time=match.time,
-                    home_team_id=match.home_team_id,
-                    away_team_id=match.away_team_id,
-                    odds_data=odds_data,
-                    stats_metrics=banded_data
+                results[fixture.new_odds_id] = self._compose_ratios(
+                    head_to_head,
+                    home_team, *performances(home_team, season_id, last_season_id),
+                    away_team, *performances(away_team, season_id, last_season_id),
+                    data.season_league_codes.get((home_id, last_season_id), odds_kernel.PROMOTED_FROM_L3),
+                    data.current_league_codes.get((home_id, season_id)),
+                    data.season_league_codes.get((away_id, last_season_id), odds_kernel.PROMOTED_FROM_L3),
+                    data.current_league_codes.get((away_id, season_id)),
+                    data.banded_stats.get(pair) or empty_banded_data(),
                 )
-                print(f"[LOG] Odds saved for match_id: {match.new_odds_id}")
-                results.append(saved_entry)
+                if input_fingerprint:
+                    results[fixture.new_odds_id]["input_fingerprint"] = input_fingerprint
             except Exception as e:
-                print(f"[ERROR] Failed to save odds for match_id: {match.new_odds_id}. Error: {e}")
+                print(f"[ERROR] Failed to calculate odds for match_id: {fixture.new_odds_id}. Error: {e}")
+                results[fixture.new_odds_id] = None
+
         return results
 
+    def _input_fingerprint(self, data, home_team, away_team, season_id: str, last_season_id: str) -> str:
+        """
+        SHA-256 of everything the ratios for this fixture are calculated from: the season IDs,
+        both teams' table rows (or last_season.csv fallback) and league codes, and the H2H history.
+        Bump ODDS_INPUTS_VERSION when the formula changes so stored odds are recalculated.
+        """
+        pair = (home_team.team_id, away_team.team_id)
+        summary = data.h2h_summaries.get(pair)
+
+        def table_row(team, season):
+            if not season:
+                return None
+            row = data.table_rows.get((team.team_id, season))
+            return list(row) if row is not None else ["csv", last_season_fallback.lookup(team.team_name)]
+
+        inputs = {
+            "version": ODDS_INPUTS_VERSION,
+            "seasons": [season_id, last_season_id],
+            "tables": [table_row(team, season) for team in (home_team, away_team) for season in (season_id, last_season_id)],
+            "current_leagues": [data.current_league_codes.get((team_id, season_id)) for team_id in pair],
+            "last_leagues": [data.season_league_codes.get((team_id, last_season_id)) for team_id in pair],
+            "h2h": [summary.matches_played, summary.home_wins, summary.away_wins, summary.draws] if summary else None,
+            "h2h_match_ids": [match["match_id"] for match in summary.recent_results] if summary else [],
+            "h2h_last_match": summary.last_match_date if summary else None,
+            # Moves with the calendar as meetings leave the 5/3-year windows
+            "banded": data.banded_stats.get(pair),
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
 
     async def calculate_ratios(self, home_team_id: str, away_team_id: str, season_id: str):
         """Calculate win, draw, and loss ratios for a single match."""
-        season = self.db.query(Season).filter(Season.season_id == season_id).first()
+        season = await self._lookup(Season, "season_id", season_id)
         
-        home_team = self.db.query(Team).filter(Team.team_id == home_team_id).first()
-        away_team = self.db.query(Team).filter(Team.team_id == away_team_id).first()
+        home_team = await self._lookup(Team, "team_id", home_team_id)
+        away_team = await self._lookup(Team, "team_id", away_team_id)
         if not season:
             print(f"[WARN] No season found for season_id: {season_id}")
             return None
 
-        last_season = self.db.query(Season).filter(Season.season_year == self.get_previous_season_year(season.season_year)).first()
+        last_season = await self._lookup(Season, "season_year", self.get_previous_season_year(season.season_year))
         if not last_season:
             print(f"[WARN] No previous season found for year: {self.get_previous_season_year(season.season_year)}")
         last_season_id = last_season.season_id if last_season else None
-
-        self.__class__.LAST_SEASON_ID = last_season_id
-        self.__class__.CURRENT_SEASON_ID = season_id
+        if not home_team or not away_team:
+            print(f"[ERROR] No team found for team_id: {home_team_id if not home_team else away_team_id}")
+            return None
 
         # Gather data for head-to-head, current season, and last season
         head_to_head = await self.get_head_to_head_record(home_team_id, away_team_id)
-        home_team_data = await self.get_team_data(home_team_id, season_id, last_season_id, is_home=True)
-        away_team_data = await self.get_team_data(away_team_id, season_id, last_season_id, is_home=False)
+        home_current, home_last = await self.get_team_performances(home_team, season_id, last_season_id)
+        away_current, away_last = await self.get_team_performances(away_team, season_id, last_season_id)
 
         
         # ✅ NEW: Detect promoted / relegated / stayed
-        home_last_league = self.get_team_league_last_season(home_team_id, last_season_id)
-        away_last_league = self.get_team_league_last_season(away_team_id, last_season_id)
+        home_last_league = await self.get_team_league_last_season(home_team_id, last_season_id)
+        away_last_league = await self.get_team_league_last_season(away_team_id, last_season_id)
 
         # ✅ Get home team current league code
-        home_current_league_row = (
-            self.db.query(League.league_code)  # league_code has SP1, I2, etc.
-            .join(CurrentLeague, CurrentLeague.league_id == League.league_id)
-            .filter(
-                CurrentLeague.team_id == home_team_id,
-                CurrentLeague.season_id == season_id
-            )
-            .first()
-        )
-        home_current_league = home_current_league_row.league_code if home_current_league_row else None
+        home_current_league = await self.get_team_current_league_code(home_team_id, season_id)
 
         # ✅ Get away team current league code
-        away_current_league_row = (
-            self.db.query(League.league_code)
-            .join(CurrentLeague, CurrentLeague.league_id == League.league_id)
-            .filter(
-                CurrentLeague.team_id == away_team_id,
-                CurrentLeague.season_id == season_id
-            )
-            .first()
-        )
-        away_current_league = away_current_league_row.league_code if away_current_league_row else None
+        away_current_league = await self.get_team_current_league_code(away_team_id, season_id)
 
         #print(f"[DEBUG] Home current league code: {home_current_league}, Away current league code: {away_current_league}")
 
 
 
-        home_status = self.get_team_status(home_last_league, home_current_league)
-        away_status = self.get_team_status(away_last_league, away_current_league)
-
-        #print(f"[DEBUG] {home_team.team_name if home_team else home_team_id} last={home_last_league} current={home_current_league} => {home_status}")
-        #print(f"[DEBUG] {away_team.team_name if away_team else away_team_id} last={away_last_league} current={away_current_league} => {away_status}")
-
-        self.__class__.HOME_TEAM_STATUS = home_status
-        self.__class__.AWAY_TEAM_STATUS = away_status
-        
-        # Calculate weighted draw for home and away teams
-        weighted_draw_home = await self.calculate_weighted_draw_ratio(home_team_data["current_season"], home_team_data["last_season"])
-        weighted_draw_away = await self.calculate_weighted_draw_ratio(away_team_data["current_season"], away_team_data["last_season"])
-
-        # Final draw chance calculation
-        draw_chance = self.calculate_draw_chance(head_to_head['draw_ratio'], weighted_draw_home, weighted_draw_away, head_to_head['total_matches'])
-
-        # Calculate final home win ratio
-        final_home_win_ratio = self.calculate_final_home_win_ratio(
-            home_team_data.get("weighted_home_win_ratio", 0.0),
-            away_team_data.get("weighted_away_loss_ratio", 0.0),
-            head_to_head.get("home_win_ratio", 0.0),
-            head_to_head['total_matches']
-        )
-        # print(
-        # f"[DEBUG]Result | {home_team.team_name if home_team else home_team_id} "
-        # f"vs {away_team.team_name if away_team else away_team_id} => "
-        # f"HomeWin={final_home_win_ratio:.2f}, Draw={draw_chance:.2f}, "
-        # f"AwayWin={1 - (final_home_win_ratio + draw_chance):.2f}"
-        # )
-
-        adjusted_home, adjusted_away, adjusted_draw = self.adjust_ratios_by_status(final_home_win_ratio,(1 - (final_home_win_ratio + draw_chance)),draw_chance,home_status,away_status)
-        #print(f"Adj after league stats : ADJ_HOME {adjusted_home}, ADJ_AWAY {adjusted_away}, ADJ_DRW {adjusted_draw}")
-        final_adj_home, final_adj_away, final_adj_draw = self.final_95_check(adjusted_home, adjusted_away, adjusted_draw)
-        #print(f"Adj after 0.95 : ADJ_HOME {final_adj_home}, ADJ_AWAY {final_adj_away}, ADJ_DRW {final_adj_draw}")
-
-        # Fetch historic stats for this matchup
-        historic_matches_raw = self.match_statistics_service.get_historic_stats_for_banded_chart(
-            home_team_id, away_team_id
+        # Precomputed banded stats for this matchup
+        banded_data = await self.db.run_sync(
+            lambda session: BandedStatsService(session).get(home_team_id, away_team_id)
         )
 
-        # Reformat to match calculate_historic_metrics expectations
-        historic_matches = []
-        for match in historic_matches_raw:
-            historic_matches.append({
-                "date": match["date"],
-                "statistics": {
-                    "shots_home": match.get("shots_home", 0),
-                    "shots_away": match.get("shots_away", 0),
-                    "shots_on_target_home": match["shots_on_target_home"],
-                    "shots_on_target_away": match["shots_on_target_away"],
-                    "corners_home": match["corners_home"],
-                    "corners_away": match["corners_away"],
-                    "full_time_home_goals": match.get("full_time_home_goals", 0),
-                    "full_time_away_goals": match.get("full_time_away_goals", 0)
-                }
-            })
+        return self._compose_ratios(
+            head_to_head,
+            home_team, home_current, home_last,
+            away_team, away_current, away_last,
+            home_last_league, home_current_league,
+            away_last_league, away_current_league,
+            banded_data,
+        )
 
-        # Now calculate banded metrics
-        banded_data = self.calculate_historic_metrics(historic_matches)
+    def _compose_ratios(self, head_to_head,
+                        home_team, home_current, home_last,
+                        away_team, away_current, away_last,
+                        home_last_league, home_current_league,
+                        away_last_league, away_current_league,
+                        banded_data):
+        """Turn the gathered inputs into the final ratios; shared by the per-match and batch paths."""
+        result = odds_kernel.calculate(odds_kernel.FixtureInput(
+            home_current=home_current,
+            home_last=home_last,
+            away_current=away_current,
+            away_last=away_last,
+            h2h_total_matches=head_to_head["total_matches"],
+            h2h_home_win_ratio=head_to_head.get("home_win_ratio", 0.0),
+            h2h_draw_ratio=head_to_head["draw_ratio"],
+            home_last_league=home_last_league,
+            home_current_league=home_current_league,
+            away_last_league=away_last_league,
+            away_current_league=away_current_league,
+        ))
+
+        home_team_data = self._team_data(home_team, home_current, home_last)
+        home_team_data["weighted_home_win_ratio"] = result.weighted_home_win
+        away_team_data = self._team_data(away_team, away_current, away_last)
+        away_team_data["weighted_away_loss_ratio"] = result.weighted_away_loss
 
         return {
             "home_team": home_team_data,
             "away_team": away_team_data,
             "head_to_head": head_to_head,
-            "final_draw_chance": round(final_adj_draw,3),
-            "weighted home draw": weighted_draw_home,
-            "weighted away draw": weighted_draw_away,
-            "final_home_win_ratio": round(final_adj_home,3),
-            "final_away_win_ratio": round(final_adj_away,3),
+            "final_draw_chance": result.draw,
+            "weighted home draw": result.weighted_home_draw,
+            "weighted away draw": result.weighted_away_draw,
+            "final_home_win_ratio": result.home_win,
+            "final_away_win_ratio": result.away_win,
             "stats_banded_data": banded_data
         }  
     
-    def final_95_check(
-        self,
-        adj_home_win: float,
-        adj_away_win: float,
-        adj_draw: float,
-    )-> tuple[float, float, float]:
-        '''
-            check if any part is above 0.95 and start adjusting both
-        
-        '''
-        if adj_home_win >= 0.95:
-            adjustment2 = 0.10
-            to_draw2 = adjustment2 * 0.30
-            to_other2 = adjustment2 - to_draw2
-            final_adj_home = adj_home_win - adjustment2
-            final_adj_draw = adj_draw + to_draw2
-            final_adj_away = adj_away_win + to_other2
-        elif adj_away_win >=0.95:
-            adjustment2 = 0.10
-            to_draw2 = adjustment2 * 0.30
-            to_other2 = adjustment2 - to_draw2
-            final_adj_away = adj_away_win - adjustment2
-            final_adj_draw = adj_draw + to_draw2
-            final_adj_home = adj_home_win + to_other2
-        else:
-            final_adj_away = adj_away_win
-            final_adj_draw = adj_draw
-            final_adj_home = adj_home_win
-
-
-        return (final_adj_home, final_adj_away, final_adj_draw)
-
-    def adjust_ratios_by_status(
-        self,
-        home_win: float,
-        away_win: float,
-        draw: float,
-        home_status: str,
-        away_status: str
-    ) -> tuple[float, float, float]:
-        """
-        Adjusts win/draw ratios based on team status (promoted, relegated, stayed).
-        
-        Rules:
-        - stayed vs stayed → no adjustment
-        - promoted vs stayed → promoted loses 0.20
-            - 20% of 0.20 → draw
-            - 80% of 0.20 → stayed team
-        - relegated vs promoted → promoted loses 0.30
-            - 20% of 0.30 → draw
-            - 80% of 0.30 → relegated team
-        """
-
-        adjustment = 0.0
-        to_draw = 0.0
-        to_other = 0.0
-        home_win_adjusted, away_win_adjusted, draw_adjusted = home_win, away_win , draw
-
-        # Case 1: stayed vs stayed & promoted vs promoted & relegated vs relegated
-        if home_status == "stayed" and away_status == "stayed":
-            return (home_win_adjusted, away_win_adjusted, draw_adjusted)
-        elif home_status == "promoted" and away_status == "promoted":
-            return (home_win_adjusted, away_win_adjusted, draw_adjusted)
-        elif home_status == "relegated" and away_status == "relegated":
-            return (home_win_adjusted, away_win_adjusted, draw_adjusted)
-
-        # Case 2: promoted vs stayed
-        if home_status == "promoted" and away_status == "stayed" and home_win > 0.20:
-            adjustment = 0.20
-            to_draw = adjustment * 0.20 
-            to_other = adjustment-to_draw
-            home_win_adjusted = home_win - adjustment
-            away_win_adjusted = away_win + to_other
-            draw_adjusted = draw + to_draw
-
-        elif home_status == "stayed" and away_status == "promoted" and away_win > 0.20:
-            adjustment = 0.20
-            to_draw = adjustment * 0.20
-            to_other = adjustment-to_draw
-            away_win_adjusted = away_win - adjustment
-            home_win_adjusted = home_win + to_other
-            draw_adjusted = draw + to_draw
-
-        #case 3 relegated vs stayed con
-        if home_status == "relegated" and away_status == "stayed" and away_win > 0.20:
-            adjustment = 0.20
-            to_draw = adjustment * 0.20 
-            to_other = adjustment-to_draw
-            home_win_adjusted = home_win + to_other
-            away_win_adjusted = away_win - adjustment
-            draw_adjusted = draw + to_draw
-
-        elif home_status == "stayed" and away_status == "relegated" and home_win > 0.20:
-            adjustment = 0.20
-            to_draw = adjustment * 0.20
-            to_other = adjustment-to_draw
-            away_win_adjusted = away_win + to_other
-            home_win_adjusted = home_win - adjustment
-            draw_adjusted = draw + to_draw
-
-        # Case 3: promoted vs relegated
-        elif home_status == "promoted" and away_status == "relegated" and home_win > 0.30:
-            adjustment = 0.30
-            to_draw = adjustment * 0.20
-            to_other = adjustment-to_draw
-            home_win_adjusted = home_win - adjustment
-            away_win_adjusted = away_win + to_other
-            draw_adjusted = draw + to_draw
-
-        elif home_status == "relegated" and away_status == "promoted" and away_win > 0.30:
-            adjustment = 0.30
-            to_draw = adjustment * 0.20
-            to_other = adjustment-to_draw
-            away_win_adjusted = away_win - adjustment
-            home_win_adjusted = home_win +  to_other
-            draw_adjusted = draw + to_draw
-
-        else:
-            return (home_win_adjusted, away_win_adjusted, draw_adjusted)
-
-        return (home_win_adjusted, away_win_adjusted, draw_adjusted)
-  
-
     def get_previous_season_year(self, season_year: str) -> str:
         """Get the previous season year given the current season year."""
-        if season_year:
-            start_year, end_year = map(int, season_year.split("/"))
-            return f"{start_year - 1}/{end_year - 1}"
-        return None
-
-
-    async def get_team_data(self, team_id: str, season_id: str, last_season_id: str, is_home: bool):
-        """Retrieve team data including current and previous season performance."""
-        team = self.db.query(Team).filter(Team.team_id == team_id).first()
-        if not team:
-            print(f"[ERROR] No team found for team_id: {team_id}")
-            return {}
-        team_name = team.team_name if team else team_id
-        season = self.db.query(Season).filter(Season.season_id == season_id).first()
-        season_name = season.season_year if season else season_id
-
-        last_season_name = None
-        if last_season_id:
-            last_season = self.db.query(Season).filter(Season.season_id == last_season_id).first()
-            last_season_name = last_season.season_year if last_season else last_season_id
+        return previous_season_year(season_year)
 
 
-        current_performance = await self.get_team_season_performance(team_id, season_id)
-        if not current_performance or current_performance['total_played'] == 0:
-            print(f"[WARN] No current season performance for team_id: {team_id}")
-        last_performance = await self.get_team_season_performance(team_id, last_season_id) if last_season_id else None
-        if not last_performance or last_performance['total_played'] == 0:
-            print(f"[WARN] No last season performance for team_id: {team_id}")
+    async def get_team_performances(self, team, season_id: str, last_season_id: str):
+        """(current season, last season) SeasonPerformance for a team; last is None without a last season."""
+        current_performance = await self.get_team_season_performance(team.team_id, season_id)
+        if not current_performance or current_performance.played == 0:
+            print(f"[WARN] No current season performance for team_id: {team.team_id}")
+        last_performance = await self.get_team_season_performance(team.team_id, last_season_id) if last_season_id else None
+        if not last_performance or last_performance.played == 0:
+            print(f"[WARN] No last season performance for team_id: {team.team_id}")
 
-        #print(f"[DEBUG] {team_name} | Current Season {season_name} Performance => {current_performance}")
         if last_performance:
-            print(f"[DEBUG] {team_name} | Last Season {last_season_name} Performance => {last_performance}")
+            last_season = await self._lookup(Season, "season_id", last_season_id)
+            last_season_name = last_season.season_year if last_season else last_season_id
+            print(f"[DEBUG] {team.team_name} | Last Season {last_season_name} Performance => {last_performance.as_dict()}")
 
-        team_data = {
-            "team_id": team_id,
+        return current_performance, last_performance
+
+    def _team_data(self, team, current_performance, last_performance):
+        return {
+            "team_id": team.team_id,
             "team_name": team.team_name,
-            "current_season": current_performance,
-            "last_season": last_performance,
+            "current_season": current_performance.as_dict() if current_performance else None,
+            "last_season": last_performance.as_dict() if last_performance else None,
         }
 
-        if is_home:
-            team_data["weighted_home_win_ratio"] = await self.calculate_weighted_home_win_ratio(current_performance, last_performance)
-        else:
-            team_data["weighted_away_loss_ratio"] = await self.calculate_weighted_away_loss_ratio(current_performance, last_performance)
-
-        return team_data
-
 
     async def get_team_season_performance(self, team_id: str, season_id: str):
         """Fetch the performance of a team for a given season."""
         if not season_id:
             return None
         
-        team = self.db.query(Team).filter(Team.team_id == team_id).first()
-        season = self.db.query(Season).filter(Season.season_id == season_id).first()
+        team = await self._lookup(Team, "team_id", team_id)
+        season = await self._lookup(Season, "season_id", season_id)
         team_name = team.team_name if team else team_id
         season_name = season.season_year if season else season_id
 
@@ -394,389 +351,100 @@ class OddsCalculationService:
 
     
 
-        record = self.db.query(CurrentLeague).filter(CurrentLeague.team_id == team_id, CurrentLeague.season_id == season_id).first()
+        record = (await self.db.execute(
+            select(CurrentLeague).filter(CurrentLeague.team_id == team_id, CurrentLeague.season_id == season_id).limit(1)
+        )).scalars().first()
         if not record:
-            record = self.db.query(Standing).filter(Standing.team_id == team_id, Standing.season_id == season_id).first()
+            record = (await self.db.execute(
+                select(Standing).filter(Standing.team_id == team_id, Standing.season_id == season_id).limit(1)
+            )).scalars().first()
 
         if record:
-            played, wins, draws, losses = record.played, record.wins, record.draws, record.losses
+            return self._season_performance(record.played, record.wins, record.draws, record.losses)
+        return self._season_performance(*self._fallback_performance(team_name))
+
+    def _season_performance(self, played, wins, draws, losses):
+        return odds_kernel.SeasonPerformance(played, wins, draws, losses)
+
+    def _fallback_performance(self, team_name: str):
+        """(played, wins, draws, losses) for a team from last_season.csv, matched through the alias groups."""
+        row = last_season_fallback.lookup(team_name)
+        if row is not None:
+            return row
+        if not last_season_fallback.available():
+            print(f"[WARN] last_season.csv not found")
         else:
-             # Fallback to CSV
-            csv_path = os.path.join(os.path.dirname(__file__), "last_season.csv")
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path)
-                team_row = None
-
-                # Normalize CSV names
-                df["Team_clean"] = df["Team"].str.lower().str.replace(r"[^a-z0-9]", "", regex=True)
-                team_name_clean = team_name.lower().replace(" ", "").replace("&", "")
-
-                team_row = None
-                for real_name, aliases in self.__class__.TEAM_ALIASES.items():
-                    for alias in aliases:
-                        alias_clean = alias.lower().replace(" ", "").replace("&", "")
-                        if team_name_clean == alias_clean:
-                            # Try to find a matching row in CSV
-                            for csv_alias in aliases:
-                                csv_alias_clean = csv_alias.lower().replace(" ", "").replace("&", "")
-                                matched_row = df[df["Team_clean"] == csv_alias_clean]
-                                if not matched_row.empty:
-                                    team_row = matched_row.iloc[0]
-                                    break
-                            if team_row is not None:
-                                break
-                    if team_row is not None:
-                        break
-                
-                if team_row is not None:
-                    played = float(team_row.get("Played", 0))
-                    wins = float(team_row.get("Wins", 0))
-                    draws = float(team_row.get("Draws", 0))
-                    losses = float(team_row.get("Losses", 0))
-                else:
-                    print(f"[WARN] Team {team_name} not found in last_season.csv using aliases")
-                    played, wins, draws, losses = 0, 0, 0, 0
-            else:
-                print(f"[WARN] last_season.csv not found")
-                played, wins, draws, losses = 0, 0, 0, 0
-
-
-        result = {
-        "wins": wins,
-        "draws": draws,
-        "losses": losses,
-        "total_played": played,
-        "wins_ratio": float(wins / played) if played else 0,
-        "draws_ratio": float(draws / played) if played else 0,
-        "losses_ratio": float(losses / played) if played else 0
-        }
-
-        #print(f"[DEBUG] Season Perf | {team_name} ({season_name}) => {result}")
-        return result
+            print(f"[WARN] Team {team_name} not found in last_season.csv using aliases")
+        return 0, 0, 0, 0
 
 
     async def get_head_to_head_record(self, home_team_id: str, away_team_id: str):
         """Fetch and calculate the head-to-head record between two teams."""
-        home_team = self.db.query(Team).filter(Team.team_id == home_team_id).first()
-        away_team = self.db.query(Team).filter(Team.team_id == away_team_id).first()
-        #print(f"[DEBUG] H2H START | {home_team.team_name if home_team else home_team_id} vs {away_team.team_name if away_team else away_team_id}")
-
-    
-        # Count the total matches where home_team_id is home and away_team_id is away
-        total_matches = self.db.query(Match.match_id).filter(
-            Match.home_team_id == home_team_id,
-            Match.away_team_id == away_team_id
-        ).order_by(Match.date.desc()).limit(5).all()
+        summary = await self.db.get(HeadToHeadSummary, (home_team_id, away_team_id))
+        if summary is None:
+            return self._head_to_head(0, 0, 0, 0)
+        return self._head_to_head(
+            min(summary.matches_played, H2H_RECENT_RESULTS),
+            summary.home_wins, summary.away_wins, summary.draws,
+        )
 
-        if len(total_matches) == 0:
+    def _head_to_head(self, total_matches: int, home_wins: int, away_wins: int, draws: int):
+        """
+        H2H record. total_matches is the number of recent meetings (capped at H2H_RECENT_RESULTS)
+        while the win/draw counts are all-time, exactly as the ratios have always been computed.
+        """
+        if total_matches == 0:
             return {
                 "home_wins": 0, "away_wins": 0, "draws": 0,
                 "home_win_ratio": 0.0, "away_win_ratio": 0.0, "draw_ratio": 0.0,
                 "total_matches": 0 
             }
 
-        # Count home wins
-        home_wins = self.db.query(func.count()).select_from(Match).join(
-            MatchStatistics, Match.match_id == MatchStatistics.match_id
-        ).filter(
-            Match.home_team_id == home_team_id,
-            Match.away_team_id == away_team_id,
-            MatchStatistics.full_time_result == "H"
-        ).scalar()
-
-        # Count away wins
-        away_wins = self.db.query(func.count()).select_from(Match).join(
-            MatchStatistics, Match.match_id == MatchStatistics.match_id
-        ).filter(
-            Match.home_team_id == home_team_id,
-            Match.away_team_id == away_team_id,
-            MatchStatistics.full_time_result == "A"
-        ).scalar()
-
-        # Count draws
-        draws = self.db.query(func.count()).select_from(Match).join(
-            MatchStatistics, Match.match_id == MatchStatistics.match_id
-        ).filter(
-            (Match.home_team_id == home_team_id) & (Match.away_team_id == away_team_id) ,
-            MatchStatistics.full_time_result == "D"
-        ).scalar()
-        
-        # print(f"[DEBUG] H2H Last 5 => home_wins={home_wins}, draws={draws}, away_wins={away_wins}, "
-        #   f"ratios=H:{home_wins / len(total_matches) if len(total_matches) > 0 else 0.0:.2f} D:{draws / len(total_matches) if len(total_matches) > 0 else 0.0:.2f} A:{away_wins / len(total_matches) if len(total_matches) > 0 else 0.0:.2f}")
-        
         return {
             "home_wins": home_wins,
             "away_wins": away_wins,
             "draws": draws,
-            "total_matches": len(total_matches),
-            "home_win_ratio": home_wins / len(total_matches) if len(total_matches) > 0 else 0.0,
-            "away_win_ratio": away_wins / len(total_matches) if len(total_matches) > 0 else 0.0,
-            "draw_ratio": draws / len(total_matches) if len(total_matches) > 0 else 0.0
+            "total_matches": total_matches,
+            "home_win_ratio": home_wins / total_matches,
+            "away_win_ratio": away_wins / total_matches,
+            "draw_ratio": draws / total_matches
         }
 
 
-    async def calculate_weighted_home_win_ratio(self, current_performance, last_performance):
-        if not current_performance:
-            return 0.0
-
-        last_performance = last_performance or {"wins_ratio": 0.0, "total_played": 0}
-        total_matches_played = current_performance["total_played"] + last_performance["total_played"]
-
-        if total_matches_played == 0:
-            return 0.0
-
-        weighted_home_win_ratio = (
-            (((current_performance["wins_ratio"] * current_performance["total_played"])*1.25 if (current_performance["wins_ratio"] * current_performance["total_played"]) < 0.8 else (current_performance["wins_ratio"] * current_performance["total_played"]))) +
-            ((last_performance["wins_ratio"] * last_performance["total_played"])/1.25)
-        ) / total_matches_played
-
-        #print(f"[DEBUG] Weighted Home Win => {weighted_home_win_ratio:.4f}")
-
-        return weighted_home_win_ratio
-
-
-    async def calculate_weighted_away_loss_ratio(self, current_performance, last_performance):
-        """Calculate the weighted away loss ratio based on home team's wins."""
-        if not current_performance:
-            return 0.0
-
-        last_performance = last_performance or {"losses_ratio": 0.0, "total_played": 0}
-        total_matches_played = current_performance["total_played"] + last_performance["total_played"]
-
-        if total_matches_played == 0:
-            return 0.0
-
-        weighted_away_loss_ratio = (
-            (((current_performance["losses_ratio"] * current_performance["total_played"])*1.25)if (current_performance["losses_ratio"] * current_performance["total_played"]) < 0.8 else (current_performance["losses_ratio"] * current_performance["total_played"])  )+
-            ((last_performance["losses_ratio"] * last_performance["total_played"])/1.25)
-        ) / total_matches_played
-       
-        #print(f"[DEBUG] Weighted Away Loss => {weighted_away_loss_ratio:.4f}")
-
-        return weighted_away_loss_ratio
-
-
-    async def calculate_weighted_draw_ratio(self, current_performance, last_performance):
-        """Calculate the weighted draw ratio for a team across two seasons."""
-        if not current_performance:
-            return 0.0
-
-        last_performance = last_performance or {"draws_ratio": 0.0, "total_played": 0}
-        total_matches_played = current_performance["total_played"] + last_performance["total_played"]
-
-        if total_matches_played == 0:
-            return 0.0
-
-        weighted_draw_ratio = (
-            (current_performance["draws_ratio"] * current_performance["total_played"]) +
-            (last_performance["draws_ratio"] * last_performance["total_played"]) 
-        ) / total_matches_played
-
-        #print(f"[DEBUG] Weighted Draw => {weighted_draw_ratio:.4f}")
-
-        return weighted_draw_ratio
-
-    def calculate_draw_chance(self, head_to_head_draw_ratio, home_weighted_draw_ratio, away_weighted_draw_ratio, head_to_head_total_matches):
-        """Calculate the final draw chance."""
-        if head_to_head_total_matches == 0:
-            return (home_weighted_draw_ratio + away_weighted_draw_ratio) / 2
-        return (head_to_head_draw_ratio + home_weighted_draw_ratio + away_weighted_draw_ratio) / 3
-
-
-    def calculate_final_home_win_ratio(self, weighted_home_win_ratio, weighted_away_loss_ratio, head_to_head_home_win_ratio, head_to_head_total_matches):
-        """Calculate the final home win ratio."""
-        if head_to_head_total_matches == 0:
-            return (weighted_home_win_ratio + weighted_away_loss_ratio) / 2
-        return (weighted_home_win_ratio + weighted_away_loss_ratio + ((head_to_head_home_win_ratio * 1.25 if head_to_head_home_win_ratio < 0.8 else head_to_head_home_win_ratio))) / 3
-
-    def parse_league_tier(self, league_code: str):
-        """
-        Parse league code into (country_code, tier_number).
-        Example: E0 -> (E, 0), E1 -> (E, 1), SP2 -> (SP, 2), D1 -> (D, 1).
-        """
-        match = re.match(r"([A-Z]+)(\d+)", league_code)
-        if not match:
-            return None, None
-        country = match.group(1)
-        tier = int(match.group(2))
-        return country, tier
-
-    def get_team_league_last_season(self, team_id: str, last_season_id: str):
+    async def get_team_league_last_season(self, team_id: str, last_season_id: str):
         """Find the league a team played in last season. If not found, assume promoted from 3rd tier."""
         # Get any match played by this team last season
-        match_record = (
-            self.db.query(Match)
+        match_record = (await self.db.execute(
+            select(Match)
             .filter(
                 Match.season_id == last_season_id,
                 ((Match.home_team_id == team_id) | (Match.away_team_id == team_id))
             )
-            .first()
-        )
+            .limit(1)
+        )).scalars().first()
 
         if match_record:
             # Join League table to get the league code
-            league = self.db.query(League).filter(League.league_id == match_record.league_id).first()
+            league = await self._lookup(League, "league_id", match_record.league_id)
             if league:
                 return league.league_code
 
         # If no match found, assume team was promoted from 3rd tier
-        return "PROMOTED_FROM_L3"
-
-    def get_team_status(self, last_league_code: str, current_league_code: str):
-        """Determine if team stayed, promoted, or relegated based on league codes."""
-        if not last_league_code or not current_league_code:
-            return "unknown"
-
-        if last_league_code == "PROMOTED_FROM_L3":
-            return "promoted"
-
-        last_country, last_tier = self.parse_league_tier(last_league_code)
-        curr_country, curr_tier = self.parse_league_tier(current_league_code)
-
-        if not last_country or not curr_country or last_country != curr_country:
-            return "unknown"
-
-        # Stayed
-        if last_tier == curr_tier:
-            return "stayed"
-        # Relegated → tier number increased (0 → 1)
-        elif last_tier < curr_tier:
-            return "relegated"
-        # Promoted → tier number decreased (1 → 0)
-        elif last_tier > curr_tier:
-            return "promoted"
-
-        return "unknown"
-    
-    def compute_banded_stats(self, avg: float) -> list:
-        """Distribute avg across 90 minutes and add ±25% range (same as frontend)."""
-        time_intervals = [0, 15, 30, 45, 60, 75, 90]
-        per_min = avg / 90 if avg else 0
-        banded = []
-        for t in time_intervals:
-            val = round(per_min * t, 2)
-            if t == 0:
-                banded.append({"time": t, "actual": val, "stdRange": [0, 0]})
-            else:
-                std = val * 0.25
-                banded.append({
-                    "time": t,
-                    "actual": val,
-                    "stdRange": [round(max(val - std, 0), 2), round(val + std, 2)]
-                })
-        return banded
-
-
-    def compute_correlation(self, matches, stat_key: str):
-        home_stats, home_goals = [], []
-        away_stats, away_goals = [], []
-
-        for m in matches:
-            stats = m["statistics"]
-
-            if stat_key == "corners":
-                home_val = stats.get("corners_home", 0)
-                away_val = stats.get("corners_away", 0)
-
-            elif stat_key == "shots_on_target":
-                home_val = stats.get("shots_on_target_home", 0)
-                away_val = stats.get("shots_on_target_away", 0)
-
-            else:
-                continue
+        return odds_kernel.PROMOTED_FROM_L3
 
-            # Only append if values exist
-            if home_val is not None:
-                home_stats.append(home_val)
-                home_goals.append(stats.get("full_time_home_goals", 0))
-            if away_val is not None:
-                away_stats.append(away_val)
-                away_goals.append(stats.get("full_time_away_goals", 0))
-
-        def safe_corr(x, y):
-            if len(x) < 2 or len(y) < 2 or np.std(x) == 0 or np.std(y) == 0:
-                return 0
-            corr = float(np.corrcoef(x, y)[0, 1])
-            return 0 if math.isnan(corr) or math.isinf(corr) else corr
-
-        return {
-            "home_correlation": safe_corr(home_stats, home_goals),
-            "away_correlation": safe_corr(away_stats, away_goals),
-        }
-
-
-    def calculate_historic_metrics(self, historic_matches):
-        import math
-        import statistics
-        import numpy as np
-
-        # ✅ Only keep corners & shots_on_target
-        stats_keys = ["corners", "shots_on_target"]
-
-        if not historic_matches:
-            return {
-                key: {
-                    "home": self.compute_banded_stats(0),
-                    "away": self.compute_banded_stats(0),
-                    "home_correlation": 0,
-                    "away_correlation": 0
-                } for key in stats_keys
-            }
-
-        today = datetime.now()
-        # Cutoffs
-        cutoff_sd = today - timedelta(days=5*365)
-        cutoff_corr = today - timedelta(days=3*365)
-
-        def get_match_date(m):
-            """Extract just the date from a datetime or string."""
-            match_date = m.get("date")
-            if isinstance(match_date, datetime):
-                return match_date.date()
-            elif match_date:
-                return datetime.strptime(str(match_date).split(" ")[0], "%Y-%m-%d").date()
-            return None
-
-        # Filter for SD (last 5 years)
-        matches_for_sd = [
-            m for m in historic_matches
-            if (d := get_match_date(m)) and d >= cutoff_sd.date()
-        ]
-
-        # Filter for correlation (last 3 years, but cap at 3 latest matches)
-        matches_for_corr = [
-            m for m in historic_matches
-            if (d := get_match_date(m)) and d >= cutoff_corr.date()
-        ]
-        matches_for_corr = sorted(matches_for_corr, key=lambda m: get_match_date(m), reverse=True)[:3]
-
-        banded_data = {}
-
-        for key in stats_keys:
-            home_vals, away_vals = [], []
-
-            for m in matches_for_sd:
-                stats = m.get("statistics", {})
-                home_val = stats.get(f"{key}_home", 0)
-                away_val = stats.get(f"{key}_away", 0)
-
-                home_vals.append(home_val if home_val is not None else 0)
-                away_vals.append(away_val if away_val is not None else 0)
-
-            avg_home = statistics.mean(home_vals) if home_vals else 0
-            avg_away = statistics.mean(away_vals) if away_vals else 0
-
-            correlations = self.compute_correlation(matches_for_corr, key)
-            home_corr = correlations.get("home_correlation", 0)
-            away_corr = correlations.get("away_correlation", 0)
-            home_corr = 0 if math.isnan(home_corr) or math.isinf(home_corr) else home_corr
-            away_corr = 0 if math.isnan(away_corr) or math.isinf(away_corr) else away_corr
-
-            banded_data[key] = {
-                "home": self.compute_banded_stats(avg_home),
-                "away": self.compute_banded_stats(avg_away),
-                "home_correlation": home_corr,
-                "away_correlation": away_corr,
-            }
+    async def get_team_current_league_code(self, team_id: str, season_id: str):
+        """League code (SP1, I2, ...) of the team's current-league table row for the season."""
+        row = (await self.db.execute(
+            select(League.league_code)
+            .join(CurrentLeague, CurrentLeague.league_id == League.league_id)
+            .filter(
+                CurrentLeague.team_id == team_id,
+                CurrentLeague.season_id == season_id
+            )
+            .limit(1)
+        )).first()
+        return row.league_code if row else None
 
-        return banded_data
+    async def _lookup(self, model, field: str, value):
+        """Resolve a reference row through the process-wide cache (DB only on a miss)."""
+        return await self.db.run_sync(lambda session: reference_cache.lookup(session, model, field, value))
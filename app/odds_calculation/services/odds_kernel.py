@@ -0,0 +1,333 @@
+"""
+Pure odds math: no DB, no I/O, no shared state. Every function depends only on its
+arguments, so batch, threaded, multi-process and ad-hoc callers can share it freely.
+calculate_many() is the same model over NumPy arrays, for scoring whole histories at once.
+"""
+import re
+import numpy as np
+
+_LEAGUE_CODE = re.compile(r"([A-Z]+)(\d+)")
+
+# Last-season league code used when a team played no matches in the previous season
+PROMOTED_FROM_L3 = "PROMOTED_FROM_L3"
+
+
+class SeasonPerformance:
+    """A team's table row for one season, with the per-game ratios the formulas use."""
+    __slots__ = ("played", "wins", "draws", "losses", "wins_ratio", "draws_ratio", "losses_ratio")
+
+    def __init__(self, played, wins, draws, losses):
+        self.played = played
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+        self.wins_ratio = float(wins / played) if played else 0
+        self.draws_ratio = float(draws / played) if played else 0
+        self.losses_ratio = float(losses / played) if played else 0
+
+    def as_dict(self) -> dict:
+        return {
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "total_played": self.played,
+            "wins_ratio": self.wins_ratio,
+            "draws_ratio": self.draws_ratio,
+            "losses_ratio": self.losses_ratio,
+        }
+
+
+class FixtureInput:
+    """Everything the odds for one fixture are calculated from."""
+    __slots__ = (
+        "home_current", "home_last", "away_current", "away_last",
+        "h2h_total_matches", "h2h_home_win_ratio", "h2h_draw_ratio",
+        "home_last_league", "home_current_league", "away_last_league", "away_current_league",
+    )
+
+    def __init__(self, home_current, home_last, away_current, away_last,
+                 h2h_total_matches, h2h_home_win_ratio, h2h_draw_ratio,
+                 home_last_league, home_current_league, away_last_league, away_current_league):
+        # SeasonPerformance, or None when the season is unknown
+        self.home_current = home_current
+        self.home_last = home_last
+        self.away_current = away_current
+        self.away_last = away_last
+        self.h2h_total_matches = h2h_total_matches
+        self.h2h_home_win_ratio = h2h_home_win_ratio
+        self.h2h_draw_ratio = h2h_draw_ratio
+        self.home_last_league = home_last_league
+        self.home_current_league = home_current_league
+        self.away_last_league = away_last_league
+        self.away_current_league = away_current_league
+
+
+class FixtureResult:
+    """Final probabilities plus the intermediate values reported alongside them."""
+    __slots__ = (
+        "home_win", "draw", "away_win",
+        "weighted_home_win", "weighted_away_loss", "weighted_home_draw", "weighted_away_draw",
+        "home_status", "away_status",
+    )
+
+    def __init__(self, home_win, draw, away_win, weighted_home_win, weighted_away_loss,
+                 weighted_home_draw, weighted_away_draw, home_status, away_status):
+        self.home_win = home_win
+        self.draw = draw
+        self.away_win = away_win
+        self.weighted_home_win = weighted_home_win
+        self.weighted_away_loss = weighted_away_loss
+        self.weighted_home_draw = weighted_home_draw
+        self.weighted_away_draw = weighted_away_draw
+        self.home_status = home_status
+        self.away_status = away_status
+
+
+def calculate(fixture: FixtureInput) -> FixtureResult:
+    """Odds for one fixture (rounded to 3 places, as stored)."""
+    home_status = team_status(fixture.home_last_league, fixture.home_current_league)
+    away_status = team_status(fixture.away_last_league, fixture.away_current_league)
+
+    weighted_home_win = weighted_home_win_ratio(fixture.home_current, fixture.home_last)
+    weighted_away_loss = weighted_away_loss_ratio(fixture.away_current, fixture.away_last)
+    weighted_home_draw = weighted_draw_ratio(fixture.home_current, fixture.home_last)
+    weighted_away_draw = weighted_draw_ratio(fixture.away_current, fixture.away_last)
+
+    draw = draw_chance(fixture.h2h_draw_ratio, weighted_home_draw, weighted_away_draw, fixture.h2h_total_matches)
+    home_win = final_home_win_ratio(weighted_home_win, weighted_away_loss, fixture.h2h_home_win_ratio, fixture.h2h_total_matches)
+
+    adjusted_home, adjusted_away, adjusted_draw = adjust_ratios_by_status(
+        home_win, (1 - (home_win + draw)), draw, home_status, away_status
+    )
+    final_home, final_away, final_draw = final_95_check(adjusted_home, adjusted_away, adjusted_draw)
+
+    return FixtureResult(
+        home_win=round(final_home, 3),
+        draw=round(final_draw, 3),
+        away_win=round(final_away, 3),
+        weighted_home_win=weighted_home_win,
+        weighted_away_loss=weighted_away_loss,
+        weighted_home_draw=weighted_home_draw,
+        weighted_away_draw=weighted_away_draw,
+        home_status=home_status,
+        away_status=away_status,
+    )
+
+
+def calculate_many(home_current, home_last, away_current, away_last,
+                   h2h_total_matches, h2h_home_win_ratio, h2h_draw_ratio,
+                   home_status, away_status) -> tuple:
+    """
+    calculate() over arrays with one element per fixture. Seasons are (played, wins, draws,
+    losses) tuples of arrays, played 0 standing for a missing season; statuses are arrays of
+    team_status() values. Returns (home_win, draw, away_win) arrays, rounded like calculate().
+    """
+    weighted_home_win = _weighted_many(home_current[0], home_current[1], home_last[0], home_last[1], boost=True)
+    weighted_away_loss = _weighted_many(away_current[0], away_current[3], away_last[0], away_last[3], boost=True)
+    weighted_home_draw = _weighted_many(home_current[0], home_current[2], home_last[0], home_last[2], boost=False)
+    weighted_away_draw = _weighted_many(away_current[0], away_current[2], away_last[0], away_last[2], boost=False)
+
+    h2h_total_matches = np.asarray(h2h_total_matches)
+    no_h2h = h2h_total_matches == 0
+    draw = np.where(
+        no_h2h,
+        (weighted_home_draw + weighted_away_draw) / 2,
+        (np.asarray(h2h_draw_ratio) + weighted_home_draw + weighted_away_draw) / 3,
+    )
+    home_win = np.where(
+        no_h2h,
+        (weighted_home_win + weighted_away_loss) / 2,
+        (weighted_home_win + weighted_away_loss + _boosted_many(np.asarray(h2h_home_win_ratio, dtype=float))) / 3,
+    )
+    away_win = 1 - (home_win + draw)
+
+    # adjust_ratios_by_status: the rules match disjoint status pairs, so they apply in any order
+    home_status, away_status = np.asarray(home_status, dtype=object), np.asarray(away_status, dtype=object)
+    for (home_rule, away_rule), (adjustment, giver) in _STATUS_ADJUSTMENTS.items():
+        rule = (home_status == home_rule) & (away_status == away_rule)
+        to_draw = adjustment * 0.20
+        to_other = adjustment - to_draw
+        if giver == "home":
+            shift = rule & (home_win > adjustment)
+            home_win = np.where(shift, home_win - adjustment, home_win)
+            away_win = np.where(shift, away_win + to_other, away_win)
+        else:
+            shift = rule & (away_win > adjustment)
+            away_win = np.where(shift, away_win - adjustment, away_win)
+            home_win = np.where(shift, home_win + to_other, home_win)
+        draw = np.where(shift, draw + to_draw, draw)
+
+    # final_95_check
+    adjustment = 0.10
+    to_draw = adjustment * 0.30
+    to_other = adjustment - to_draw
+    home_high = home_win >= 0.95
+    away_high = ~home_high & (away_win >= 0.95)
+    home_win, away_win = (
+        np.where(home_high, home_win - adjustment, np.where(away_high, home_win + to_other, home_win)),
+        np.where(away_high, away_win - adjustment, np.where(home_high, away_win + to_other, away_win)),
+    )
+    draw = np.where(home_high | away_high, draw + to_draw, draw)
+
+    return np.round(home_win, 3), np.round(draw, 3), np.round(away_win, 3)
+
+
+def _boosted_many(values):
+    return np.where(values < 0.8, values * 1.25, values)
+
+
+def _weighted_many(current_played, current_count, last_played, last_count, boost: bool):
+    # Same as the weighted_* ratios: ratio * played is the count, and a season never played counts 0
+    current_played = np.asarray(current_played, dtype=float)
+    last_played = np.asarray(last_played, dtype=float)
+    current = np.where(current_played > 0, np.asarray(current_count, dtype=float), 0.0)
+    last = np.where(last_played > 0, np.asarray(last_count, dtype=float), 0.0)
+    if boost:
+        current = _boosted_many(current)
+        last = last / 1.25
+    total = current_played + last_played
+    return np.divide(current + last, total, out=np.zeros_like(total), where=total > 0)
+
+
+def _boosted(value: float) -> float:
+    # Values under 0.8 are weighted up by 25%
+    return value * 1.25 if value < 0.8 else value
+
+
+def weighted_home_win_ratio(current: SeasonPerformance, last: SeasonPerformance) -> float:
+    if not current:
+        return 0.0
+
+    last_wins, last_played = (last.wins_ratio, last.played) if last else (0.0, 0)
+    total_matches_played = current.played + last_played
+    if total_matches_played == 0:
+        return 0.0
+
+    return (_boosted(current.wins_ratio * current.played) + ((last_wins * last_played) / 1.25)) / total_matches_played
+
+
+def weighted_away_loss_ratio(current: SeasonPerformance, last: SeasonPerformance) -> float:
+    """Weighted away loss ratio of the away team."""
+    if not current:
+        return 0.0
+
+    last_losses, last_played = (last.losses_ratio, last.played) if last else (0.0, 0)
+    total_matches_played = current.played + last_played
+    if total_matches_played == 0:
+        return 0.0
+
+    return (_boosted(current.losses_ratio * current.played) + ((last_losses * last_played) / 1.25)) / total_matches_played
+
+
+def weighted_draw_ratio(current: SeasonPerformance, last: SeasonPerformance) -> float:
+    """Weighted draw ratio for a team across two seasons."""
+    if not current:
+        return 0.0
+
+    last_draws, last_played = (last.draws_ratio, last.played) if last else (0.0, 0)
+    total_matches_played = current.played + last_played
+    if total_matches_played == 0:
+        return 0.0
+
+    return ((current.draws_ratio * current.played) + (last_draws * last_played)) / total_matches_played
+
+
+def draw_chance(h2h_draw_ratio: float, home_weighted_draw: float, away_weighted_draw: float, h2h_total_matches: int) -> float:
+    if h2h_total_matches == 0:
+        return (home_weighted_draw + away_weighted_draw) / 2
+    return (h2h_draw_ratio + home_weighted_draw + away_weighted_draw) / 3
+
+
+def final_home_win_ratio(weighted_home_win: float, weighted_away_loss: float, h2h_home_win_ratio: float, h2h_total_matches: int) -> float:
+    if h2h_total_matches == 0:
+        return (weighted_home_win + weighted_away_loss) / 2
+    return (weighted_home_win + weighted_away_loss + _boosted(h2h_home_win_ratio)) / 3
+
+
+def parse_league_tier(league_code: str):
+    """
+    Parse league code into (country_code, tier_number).
+    Example: E0 -> (E, 0), E1 -> (E, 1), SP2 -> (SP, 2), D1 -> (D, 1).
+    """
+    match = _LEAGUE_CODE.match(league_code)
+    if not match:
+        return None, None
+    return match.group(1), int(match.group(2))
+
+
+def team_status(last_league_code: str, current_league_code: str) -> str:
+    """stayed, promoted, relegated or unknown, from last and current season league codes."""
+    if not last_league_code or not current_league_code:
+        return "unknown"
+
+    if last_league_code == PROMOTED_FROM_L3:
+        return "promoted"
+
+    last_country, last_tier = parse_league_tier(last_league_code)
+    curr_country, curr_tier = parse_league_tier(current_league_code)
+
+    if not last_country or not curr_country or last_country != curr_country:
+        return "unknown"
+
+    if last_tier == curr_tier:
+        return "stayed"
+    # Tier number increased (0 -> 1)
+    if last_tier < curr_tier:
+        return "relegated"
+    return "promoted"
+
+
+# (home status, away status) -> (adjustment, side that gives it up); that side needs more than the adjustment
+_STATUS_ADJUSTMENTS = {
+    ("promoted", "stayed"): (0.20, "home"),
+    ("stayed", "promoted"): (0.20, "away"),
+    ("relegated", "stayed"): (0.20, "away"),
+    ("stayed", "relegated"): (0.20, "home"),
+    ("promoted", "relegated"): (0.30, "home"),
+    ("relegated", "promoted"): (0.30, "away"),
+}
+
+
+def _shift(taker: float, giver: float, draw: float, adjustment: float) -> tuple:
+    # 20% of the adjustment goes to the draw, the rest to the other team
+    to_draw = adjustment * 0.20
+    to_other = adjustment - to_draw
+    return taker + to_other, giver - adjustment, draw + to_draw
+
+
+def adjust_ratios_by_status(home_win: float, away_win: float, draw: float,
+                            home_status: str, away_status: str) -> tuple:
+    """
+    Adjusts win/draw ratios based on team status (promoted, relegated, stayed).
+
+    Rules:
+    - same status on both sides, or an unknown status → no adjustment
+    - promoted vs stayed → promoted side loses 0.20
+    - relegated vs stayed → stayed side loses 0.20
+    - promoted vs relegated → promoted side loses 0.30
+    20% of the adjustment goes to the draw and 80% to the other team.
+    Returns (home_win, away_win, draw).
+    """
+    rule = _STATUS_ADJUSTMENTS.get((home_status, away_status))
+    if rule is None:
+        return home_win, away_win, draw
+
+    adjustment, giver = rule
+    if giver == "home" and home_win > adjustment:
+        away_adjusted, home_adjusted, draw_adjusted = _shift(away_win, home_win, draw, adjustment)
+        return home_adjusted, away_adjusted, draw_adjusted
+    if giver == "away" and away_win > adjustment:
+        return _shift(home_win, away_win, draw, adjustment)
+    return home_win, away_win, draw
+
+
+def final_95_check(adj_home_win: float, adj_away_win: float, adj_draw: float) -> tuple:
+    """If either side is at 0.95 or above, move 0.10 off it: 30% to the draw, 70% to the other side."""
+    adjustment = 0.10
+    to_draw = adjustment * 0.30
+    to_other = adjustment - to_draw
+    if adj_home_win >= 0.95:
+        return adj_home_win - adjustment, adj_away_win + to_other, adj_draw + to_draw
+    if adj_away_win >= 0.95:
+        return adj_home_win + to_other, adj_away_win - adjustment, adj_draw + to_draw
+    return adj_home_win, adj_away_win, adj_draw
@@ -1,113 +1,298 @@
-from sqlalchemy.orm import Session, joinedload
-from datetime import datetime, date
+import json
+import base64
+from time import monotonic
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload, load_only
+from datetime import datetime, date, time
+from app.core.config import settings
+from app.core.data_versions import current_versions
+from app.core.response_cache import ResponseCache, CachedResponse
 from app.odds_calculation.models.odds_calculation_model import OddsCalculation
 from app.live_data.services.live_game_date_service import LiveGameDataService
 from app.new_odds.models.new_odds_model import NewOdds
 from app.leagues.models.leagues_models import League
+from app.teams.models.team_model import Team
+
+# Tables the calculated-odds payload is built from; writes to any of them bump its data version
+CALCULATED_ODDS_TABLES = ("odds_calculations", "new_odds", "live_game_data")
+
+# Shared by every request in this process
+calculated_odds_cache = ResponseCache(ttl_seconds=settings.ODDS_RESPONSE_CACHE_TTL_SECONDS)
+
+
+# Rows enriched per round trip when streaming
+STREAM_BATCH_SIZE = 200
+
+
+def encode_cursor(odds) -> str:
+    """Opaque pagination cursor for the position just after `odds`."""
+    position = [odds.date.isoformat(), odds.time.isoformat(), odds.odds_calculation_id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(date, time, odds_calculation_id) from encode_cursor(); raises ValueError if malformed."""
+    try:
+        date_value, time_value, odds_calculation_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(date_value), time.fromisoformat(time_value), odds_calculation_id
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def json_default(value):
+    # date, time and datetime, serialized as FastAPI does
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# Response fields, in response order, with their value for (OddsCalculation, matching NewOdds or None)
+_FIELD_VALUES = {
+    "odds_calculation_id": lambda o, original: o.odds_calculation_id,
+    "date": lambda o, original: o.date,
+    "time": lambda o, original: o.time,
+    "home_team_id": lambda o, original: o.home_team_id,
+    "home_team_name": lambda o, original: o.home_team.team_name if o.home_team else None,
+    "home_team_primary_color": lambda o, original: o.home_team.home_primary_color if o.home_team else None,
+    "home_team_secondary_color": lambda o, original: o.home_team.home_secondary_color if o.home_team else None,
+
+    "away_team_id": lambda o, original: o.away_team_id,
+    "away_team_name": lambda o, original: o.away_team.team_name if o.away_team else None,
+    "away_team_primary_color": lambda o, original: o.away_team.away_primary_color if o.away_team else None,
+    "away_team_secondary_color": lambda o, original: o.away_team.away_secondary_color if o.away_team else None,
+
+    "match_league": lambda o, original: original.league.league_name if original and original.league else None,
+    "match_country": lambda o, original: original.league.country.country_name if original and original.league and original.league.country else None,
+
+    "calculated_home_chance": lambda o, original: o.calculated_home_odds,
+    "calculated_draw_chance": lambda o, original: o.calculated_draw_odds,
+    "calculated_away_chance": lambda o, original: o.calculated_away_odds,
+    "home_odds": lambda o, original: original.home_odds if original else None,
+    "draw_odds": lambda o, original: original.draw_odds if original else None,
+    "away_odds": lambda o, original: original.away_odds if original else None,
+    "stats_banded_data": lambda o, original: o.stats_banded_data if o.stats_banded_data else None,
+    "full_market_data": lambda o, original: original.full_market_data if original else None,
+}
+# Attached only for fixtures that have live data
+LIVE_DATA_FIELD = "live_data"
+
+CALCULATED_ODDS_FIELDS = tuple(_FIELD_VALUES) + (LIVE_DATA_FIELD,)
+# full_market_data is for backend use only (include_market_data)
+DEFAULT_FIELDS = tuple(field for field in CALCULATED_ODDS_FIELDS if field != "full_market_data")
+
+# OddsCalculation columns loaded only when their field is asked for
+_ODDS_COLUMNS = {
+    "calculated_home_chance": OddsCalculation.calculated_home_odds,
+    "calculated_draw_chance": OddsCalculation.calculated_draw_odds,
+    "calculated_away_chance": OddsCalculation.calculated_away_odds,
+    "stats_banded_data": OddsCalculation.stats_banded_data,
+}
+_HOME_TEAM_FIELDS = {"home_team_name", "home_team_primary_color", "home_team_secondary_color"}
+_AWAY_TEAM_FIELDS = {"away_team_name", "away_team_primary_color", "away_team_secondary_color"}
+_LEAGUE_FIELDS = {"match_league", "match_country"}
+_NEW_ODDS_FIELDS = _LEAGUE_FIELDS | {"home_odds", "draw_odds", "away_odds", "full_market_data"}
+
+
+def resolve_fields(fields=None, include_market_data: bool = False) -> tuple:
+    """
+    The response fields to return, in response order: `fields` (names, or a comma-separated
+    string) or the defaults, plus full_market_data with include_market_data.
+    Raises ValueError for unknown names.
+    """
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(",") if field.strip()]
+    wanted = set(fields) if fields else set(DEFAULT_FIELDS)
+    unknown = wanted - set(CALCULATED_ODDS_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Valid fields: {', '.join(CALCULATED_ODDS_FIELDS)}")
+    if include_market_data:
+        wanted.add("full_market_data")
+    return tuple(field for field in CALCULATED_ODDS_FIELDS if field in wanted)
+
+
+# The projections served from calculated_odds_cache: the defaults, with and without market data
+_CACHED_FIELD_SETS = (resolve_fields(), resolve_fields(include_market_data=True))
+
 
 class OddsRetrievalService:
     def __init__(self, db: Session):
         self.db = db
         self.live_data_service = LiveGameDataService(db)
 
-    def get_all_calculated_odds(self, include_market_data: bool = False):
+    def get_calculated_odds_response(self, include_market_data: bool = False, fields=None):
+        """
+        The calculated-odds response body, serialized, with its ETag (a CachedResponse).
+        Rebuilt only after a write to odds_calculations, new_odds or live_game_data, or once
+        ODDS_RESPONSE_CACHE_TTL_SECONDS have passed (fixtures drop out as they kick off).
+        Only the default field sets are cached; other `fields=` projections are built per
+        request, so clients can't grow the cache one field combination at a time.
+        """
+        fields = resolve_fields(fields, include_market_data)
+        versions = current_versions(self.db, CALCULATED_ODDS_TABLES)
+
+        def build() -> bytes:
+            calculated_odds = self.get_all_calculated_odds(fields=fields)
+            payload = {"calculated_odds": calculated_odds} if calculated_odds else {"message": "No calculated odds found."}
+            return json.dumps(payload, default=json_default).encode()
+
+        if fields not in _CACHED_FIELD_SETS:
+            return CachedResponse(build(), versions, monotonic())
+        return calculated_odds_cache.get(("calculated_odds", fields), versions, build)
+
+    def get_all_calculated_odds(self, include_market_data: bool = False, fields=None):
         """Retrieve all upcoming calculated odds with league & country from NewOdds.
         Optionally include full_market_data for backend use only.
+        `fields` limits the response (and the columns read) to the given fields.
         """
         try:
-            now = datetime.now().time()
-            today = date.today()
-
-            # ✅ Preload teams with joinedload to avoid N+1 queries
-            odds = self.db.query(OddsCalculation).options(
-                joinedload(OddsCalculation.home_team),
-                joinedload(OddsCalculation.away_team),
-            ).filter(
-                (OddsCalculation.date >= today) |
-                ((OddsCalculation.date == today) & (OddsCalculation.time > now))
-            ).order_by(
-                OddsCalculation.date.asc(), OddsCalculation.time.asc()
-            ).all()
-
-            # ✅ Preload leagues and countries
-            new_odds = self.db.query(NewOdds).options(
-                joinedload(NewOdds.league).joinedload(League.country)
-            ).filter(
-                (NewOdds.date >= today) |
-                ((NewOdds.date == today) & (NewOdds.time > now))
-            ).order_by(
-                NewOdds.date.asc(), NewOdds.time.asc()
-            ).all()
-
-            new_odds_lookup = {
-                (o.date, o.time, o.home_team_id, o.away_team_id): o
-                for o in new_odds
+            fields = resolve_fields(fields, include_market_data)
+            odds = self._upcoming_odds_query(fields).all()
+            return self._enrich(odds, fields)
+        
+        except Exception as e:
+            self.db.rollback()  # rollback to prevent dirty session if an error occurs
+            raise e
+
+    def get_calculated_odds_page(self, limit: int, cursor: str = None, include_market_data: bool = False, fields=None) -> dict:
+        """
+        One page of upcoming calculated odds, keyset-paginated on (date, time, odds_calculation_id).
+        Pass the returned next_cursor to get the following page; it is None on the last page.
+        """
+        try:
+            fields = resolve_fields(fields, include_market_data)
+            query = self._upcoming_odds_query(fields)
+            if cursor:
+                query = query.filter(tuple_(
+                    OddsCalculation.date, OddsCalculation.time, OddsCalculation.odds_calculation_id
+                ) > decode_cursor(cursor))
+            # One extra row tells whether there is a next page
+            odds = query.limit(limit + 1).all()
+            has_more = len(odds) > limit
+            odds = odds[:limit]
+            return {
+                "calculated_odds": self._enrich(odds, fields),
+                "next_cursor": encode_cursor(odds[-1]) if has_more else None,
             }
 
-            # ✅ Bulk-fetch all live data for the odds calculations
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    def iter_calculated_odds(self, include_market_data: bool = False, fields=None, batch_size: int = STREAM_BATCH_SIZE):
+        """
+        Upcoming calculated odds one row at a time, read through a server-side cursor and
+        enriched `batch_size` rows at a time, so memory stays flat however many there are.
+        """
+        fields = resolve_fields(fields, include_market_data)
+        query = self._upcoming_odds_query(fields).execution_options(stream_results=True).yield_per(batch_size)
+        batch = []
+        for odds in query:
+            batch.append(odds)
+            if len(batch) >= batch_size:
+                yield from self._enrich(batch, fields)
+                batch = []
+        if batch:
+            yield from self._enrich(batch, fields)
+
+    def _upcoming_odds_query(self, fields: tuple):
+        now = datetime.now().time()
+        today = date.today()
+        wanted = set(fields)
+
+        # The fixture key is always read (cursor, NewOdds/live data lookups); the rest only if returned
+        options = [load_only(
+            OddsCalculation.odds_calculation_id,
+            OddsCalculation.fixture_id,
+            OddsCalculation.date,
+            OddsCalculation.time,
+            OddsCalculation.home_team_id,
+            OddsCalculation.away_team_id,
+            *(column for field, column in _ODDS_COLUMNS.items() if field in wanted),
+        )]
+        # ✅ Preload teams with joinedload to avoid N+1 queries
+        if wanted & _HOME_TEAM_FIELDS:
+            options.append(joinedload(OddsCalculation.home_team).load_only(
+                Team.team_name, Team.home_primary_color, Team.home_secondary_color
+            ))
+        if wanted & _AWAY_TEAM_FIELDS:
+            options.append(joinedload(OddsCalculation.away_team).load_only(
+                Team.team_name, Team.away_primary_color, Team.away_secondary_color
+            ))
+
+        return self.db.query(OddsCalculation).options(*options).filter(
+            (OddsCalculation.date >= today) |
+            ((OddsCalculation.date == today) & (OddsCalculation.time > now))
+        ).order_by(
+            OddsCalculation.date.asc(), OddsCalculation.time.asc(), OddsCalculation.odds_calculation_id.asc()
+        )
+
+    def _enrich(self, odds: list, fields: tuple) -> list:
+        """Response rows for OddsCalculation rows, with their NewOdds prices/league and live data."""
+        if not odds:
+            return []
+        wanted = set(fields)
+
+        new_odds_lookup = {}
+        if wanted & _NEW_ODDS_FIELDS:
+            new_odds_lookup = self._new_odds_for(odds, wanted)
+
+        # ✅ Bulk-fetch all live data for the odds calculations
+        live_data_lookup = {}
+        if LIVE_DATA_FIELD in wanted:
             odds_ids = [o.odds_calculation_id for o in odds]
             live_data_lookup = self.live_data_service.get_bulk_live_game_data(odds_ids)
 
-            enriched = []
-
-            for o in odds:
-                original = new_odds_lookup.get((o.date, o.time, o.home_team_id, o.away_team_id))
-                live_data = live_data_lookup.get(o.odds_calculation_id)
-
-                data = {
-                    "odds_calculation_id": o.odds_calculation_id,
-                    "date": o.date,
-                    "time": o.time,
-                    "home_team_id": o.home_team_id,
-                    "home_team_name": o.home_team.team_name if o.home_team else None,
-                    "home_team_primary_color": o.home_team.home_primary_color if o.home_team else None,
-                    "home_team_secondary_color": o.home_team.home_secondary_color if o.home_team else None,
-
-                    "away_team_id": o.away_team_id,
-                    "away_team_name": o.away_team.team_name if o.away_team else None,
-                    "away_team_primary_color": o.away_team.away_primary_color if o.away_team else None,
-                    "away_team_secondary_color": o.away_team.away_secondary_color if o.away_team else None,
-
-                    "match_league": original.league.league_name if original and original.league else None,
-                    "match_country": original.league.country.country_name if original and original.league and original.league.country else None,
-
-                    "calculated_home_chance": o.calculated_home_odds,
-                    "calculated_draw_chance": o.calculated_draw_odds,
-                    "calculated_away_chance": o.calculated_away_odds,
-                    "home_odds": original.home_odds if original else None,
-                    "draw_odds": original.draw_odds if original else None,
-                    "away_odds": original.away_odds if original else None,
-                    "stats_banded_data": o.stats_banded_data if o.stats_banded_data else None,
+        values = [(field, _FIELD_VALUES[field]) for field in fields if field in _FIELD_VALUES]
+        enriched = []
+
+        for o in odds:
+            original = new_odds_lookup.get(o.fixture_id)
+            live_data = live_data_lookup.get(o.odds_calculation_id)
+
+            data = {field: value(o, original) for field, value in values}
+
+            # ✅ Attach live data if it exists
+            if live_data:
+                data["live_data"] = {
+                    "is_live": live_data.is_live,
+                    "scrape_url": live_data.scrape_url,
+                    "live_home_score": live_data.live_home_score,
+                    "live_away_score": live_data.live_away_score,
+                    "match_time": live_data.match_time,
+                    "live_home_odds": live_data.live_home_odds,
+                    "live_draw_odds": live_data.live_draw_odds,
+                    "live_away_odds": live_data.live_away_odds,
+                    "shots_on_target_home": live_data.shots_on_target_home,
+                    "shots_on_target_away": live_data.shots_on_target_away,
+                    "corners_home": live_data.corners_home,
+                    "corners_away": live_data.corners_away,
+                    "last_updated": live_data.last_updated.isoformat() if live_data.last_updated else None
                 }
 
-                if include_market_data:
-                    data["full_market_data"] = original.full_market_data if original else None
-
-                # ✅ Attach live data if it exists
-                if live_data:
-                    data["live_data"] = {
-                        "is_live": live_data.is_live,
-                        "scrape_url": live_data.scrape_url,
-                        "live_home_score": live_data.live_home_score,
-                        "live_away_score": live_data.live_away_score,
-                        "match_time": live_data.match_time,
-                        "live_home_odds": live_data.live_home_odds,
-                        "live_draw_odds": live_data.live_draw_odds,
-                        "live_away_odds": live_data.live_away_odds,
-                        "shots_on_target_home": live_data.shots_on_target_home,
-                        "shots_on_target_away": live_data.shots_on_target_away,
-                        "corners_home": live_data.corners_home,
-                        "corners_away": live_data.corners_away,
-                        "last_updated": live_data.last_updated.isoformat() if live_data.last_updated else None
-                    }
-
-                enriched.append(data)
-
-            return enriched
-        
-        except Exception as e:
-            self.db.rollback()  # rollback to prevent dirty session if an error occurs
-            raise e
+            enriched.append(data)
+
+        return enriched
+
+    def _new_odds_for(self, odds: list, wanted: set) -> dict:
+        """{fixture_id: NewOdds} for the given fixtures, reading only the columns `wanted` needs."""
+        columns = [
+            NewOdds.new_odds_id, NewOdds.fixture_id, NewOdds.league_id, NewOdds.home_odds, NewOdds.draw_odds, NewOdds.away_odds,
+        ]
+        if "full_market_data" in wanted:
+            columns.append(NewOdds.full_market_data)
+        options = [load_only(*columns)]
+        # ✅ Preload leagues and countries
+        if wanted & _LEAGUE_FIELDS:
+            options.append(joinedload(NewOdds.league).joinedload(League.country))
+
+        fixture_ids = list({o.fixture_id for o in odds if o.fixture_id})
+        if not fixture_ids:
+            return {}
+        new_odds = self.db.query(NewOdds).options(*options).filter(
+            NewOdds.fixture_id.in_(fixture_ids)
+        ).all()
+
+        return {o.fixture_id: o for o in new_odds}
 
     # def get_all_calculated_odds(self, include_market_data: bool = False):
     #     """Retrieve all upcoming calculated odds with league & country from NewOdds.
@@ -1,17 +1,97 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
 from app.odds_calculation.models.odds_calculation_model import OddsCalculation
 from datetime import datetime
 from app.core.utils import generate_custom_id
+from app.fixtures.services.fixture_service import FixtureService, fixture_key
 
 class OddsSavingService:
+    BULK_CHUNK_SIZE = 500
+
     def __init__(self, db: Session):
         self.db = db
 
+    def save_calculated_odds_bulk(self, results: list, chunk_size: int = None) -> list:
+        """
+        Upsert calculated odds for many fixtures in a single transaction.
+
+        `results` holds dicts with date, time, home_team_id, away_team_id, odds_data and
+        stats_metrics (the arguments of save_calculated_odds), and fixture_id when the caller
+        knows it (otherwise the Fixture is looked up or created). Rows are written with one
+        INSERT ... ON CONFLICT (date, time, home_team_id, away_team_id) DO UPDATE per chunk.
+        Returns the odds_calculation_id of each input row, in input order. Rolls back and
+        raises if any chunk fails.
+        """
+        chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+        rows_by_key = {}  # fixture key -> row; later results for the same fixture win
+        for result in results:
+            key = (result["date"], result["time"], result["home_team_id"], result["away_team_id"])
+            odds_data = result["odds_data"]
+            rows_by_key[key] = {
+                "odds_calculation_id": rows_by_key[key]["odds_calculation_id"] if key in rows_by_key
+                else generate_custom_id(self.db, OddsCalculation, "OC", "odds_calculation_id"),
+                "date": result["date"],
+                "time": result["time"],
+                "home_team_id": result["home_team_id"],
+                "away_team_id": result["away_team_id"],
+                "calculated_home_odds": odds_data.get("final_home_win_ratio"),
+                "calculated_draw_odds": odds_data.get("final_draw_chance"),
+                "calculated_away_odds": odds_data.get("final_away_win_ratio"),
+                "stats_banded_data": result.get("stats_metrics"),
+                "input_fingerprint": odds_data.get("input_fingerprint"),
+                "fixture_id": result.get("fixture_id"),
+            }
+
+        rows = list(rows_by_key.values())
+        ids_by_key = {}
+        try:
+            unlinked = [row for row in rows if row["fixture_id"] is None]
+            if unlinked:
+                fixture_ids = FixtureService(self.db).ensure_fixtures(unlinked, chunk_size)
+                for row in unlinked:
+                    row["fixture_id"] = fixture_ids[fixture_key(row)]
+
+            for start in range(0, len(rows), chunk_size):
+                stmt = insert(OddsCalculation).values(rows[start:start + chunk_size])
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_odds_calculations_fixture",
+                    set_={
+                        "calculated_home_odds": stmt.excluded.calculated_home_odds,
+                        "calculated_draw_odds": stmt.excluded.calculated_draw_odds,
+                        "calculated_away_odds": stmt.excluded.calculated_away_odds,
+                        "stats_banded_data": stmt.excluded.stats_banded_data,
+                        "input_fingerprint": stmt.excluded.input_fingerprint,
+                        "fixture_id": stmt.excluded.fixture_id,
+                    },
+                ).returning(
+                    # An existing row keeps its ID
+                    OddsCalculation.odds_calculation_id,
+                    OddsCalculation.date,
+                    OddsCalculation.time,
+                    OddsCalculation.home_team_id,
+                    OddsCalculation.away_team_id,
+                )
+                for row in self.db.execute(stmt):
+                    ids_by_key[(row.date, row.time, row.home_team_id, row.away_team_id)] = row.odds_calculation_id
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return [
+            ids_by_key.get((result["date"], result["time"], result["home_team_id"], result["away_team_id"]))
+            for result in results
+        ]
+
     def save_calculated_odds(self, date: datetime, time: datetime.time, home_team_id: str, away_team_id: str, odds_data: dict, stats_metrics: dict):
         """
         Save the calculated odds to the database. If an entry with the same date, time, home_team_id, and away_team_id exists, update it instead of inserting a new one.
         """
         try:
+            fixture_id = FixtureService(self.db).ensure_fixture({
+                "date": date, "time": time, "home_team_id": home_team_id, "away_team_id": away_team_id,
+            })
             existing_entry = self.db.query(OddsCalculation).filter(
                 OddsCalculation.date == date,
                 OddsCalculation.time == time,
@@ -24,6 +104,8 @@ class OddsSavingService:
                 existing_entry.calculated_draw_odds = odds_data.get("final_draw_chance")
                 existing_entry.calculated_away_odds = odds_data.get("final_away_win_ratio")
                 existing_entry.stats_banded_data = stats_metrics
+                existing_entry.input_fingerprint = odds_data.get("input_fingerprint")
+                existing_entry.fixture_id = fixture_id
                 self.db.commit()
                 self.db.refresh(existing_entry)
                 return existing_entry
@@ -40,7 +122,9 @@ class OddsSavingService:
                 calculated_home_odds=odds_data.get("final_home_win_ratio"),
                 calculated_draw_odds=odds_data.get("final_draw_chance"),
                 calculated_away_odds=odds_data.get("final_away_win_ratio"),
-                stats_banded_data=stats_metrics
+                stats_banded_data=stats_metrics,
+                input_fingerprint=odds_data.get("input_fingerprint"),
+                fixture_id=fixture_id
             )
             self.db.add(new_entry)
             self.db.commit()
@@ -0,0 +1,130 @@
+import time
+import threading
+from datetime import datetime
+from app.core.config import settings
+
+
+class EvaluationFixture:
+    """A what-if pairing, shaped like the NewOdds rows the batch calculation reads."""
+    __slots__ = ("new_odds_id", "home_team_id", "away_team_id", "season_id", "date", "time")
+
+    def __init__(self, new_odds_id, home_team_id: str, away_team_id: str, season_id: str):
+        self.new_odds_id = new_odds_id
+        self.home_team_id = home_team_id
+        self.away_team_id = away_team_id
+        self.season_id = season_id
+        self.date = None
+        self.time = None
+
+
+class OddsSnapshot:
+    """
+    Every input of the odds calculation (seasons, teams, table rows, league codes, H2H and
+    banded stats) held in memory, so ad-hoc pairings are evaluated without queries.
+
+    The first call loads it; after `ttl_seconds` callers keep getting the current copy while
+    one background thread reloads it and swaps the new copy in.
+    """
+
+    def __init__(self, ttl_seconds: float = None):
+        self.ttl_seconds = settings.ODDS_SNAPSHOT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._current = None  # (OddsBatchData, loaded_at datetime, monotonic load time)
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self):
+        """(OddsBatchData, loaded_at) — loads on first use, reloads in the background once stale."""
+        current = self._current
+        if current is None:
+            with self._lock:
+                if self._current is None:
+                    self._current = self._load()
+                current = self._current
+        elif time.monotonic() - current[2] >= self.ttl_seconds:
+            self._refresh_in_background()
+        return current[0], current[1]
+
+    def invalidate(self):
+        """Drop the snapshot; the next call loads a fresh one."""
+        with self._lock:
+            self._current = None
+
+    def evaluate(self, pairings) -> tuple:
+        """
+        Odds for (home_team_id, away_team_id, season_id) pairings; nothing is saved.
+        Returns (loaded_at, [result]) with each result holding either `odds` or an `error`.
+        """
+        from app.odds_calculation.services.odds_calculation_service import OddsCalculationService
+
+        data, loaded_at = self.get()
+        fixtures = [EvaluationFixture(index, *pairing) for index, pairing in enumerate(pairings)]
+        # The calculation reads only `data`, so the service needs no session
+        calculated = OddsCalculationService(None).calculate_from_data(data, fixtures, adhoc=True)
+
+        results = []
+        for fixture in fixtures:
+            result = {
+                "home_team_id": fixture.home_team_id,
+                "away_team_id": fixture.away_team_id,
+                "season_id": fixture.season_id,
+            }
+            odds = calculated.get(fixture.new_odds_id)
+            if odds is not None:
+                result["odds"] = odds
+            else:
+                result["error"] = self._error(data, fixture)
+            results.append(result)
+        return loaded_at, results
+
+    def _error(self, data, fixture) -> str:
+        if fixture.season_id not in data.seasons:
+            return f"Unknown season_id: {fixture.season_id}"
+        for team_id in (fixture.home_team_id, fixture.away_team_id):
+            if team_id not in data.teams:
+                return f"Unknown team_id: {team_id}"
+        return "Calculation failed"
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="odds-snapshot-refresh", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self._current = self._load()
+        except Exception as e:
+            # Keep serving the previous copy; the next stale read tries again
+            print(f"[ERROR] Odds snapshot refresh failed: {e}")
+        finally:
+            self._refreshing = False
+
+    def _load(self) -> tuple:
+        from app.core.database import BackgroundSessionLocal, ReadSessionLocal
+        from app.core.query_stats import track_queries
+        from app.odds_calculation.services.banded_stats_service import BandedStatsService
+        from app.odds_calculation.services.odds_batch_loader import OddsBatchLoader
+
+        started = time.monotonic()
+        with track_queries("task:odds_snapshot"):
+            # Pairs with new meetings (or none stored yet) are rebuilt before they are read
+            db = BackgroundSessionLocal()
+            try:
+                BandedStatsService(db).refresh_if_stale()
+            finally:
+                db.close()
+
+            db = ReadSessionLocal()
+            try:
+                data = OddsBatchLoader(db).load_all()
+            finally:
+                db.close()
+
+        loaded = time.monotonic()
+        print(f"[LOG] Odds snapshot loaded in {loaded - started:.1f}s: {len(data.teams)} teams, "
+              f"{len(data.table_rows)} table rows, {len(data.h2h_summaries)} H2H pairs")
+        return data, datetime.now(), loaded
+
+
+odds_snapshot = OddsSnapshot()
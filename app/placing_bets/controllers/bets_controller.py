@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.placing_bets.services.odds_processor_service import OddsProcessorService
 
 router = APIRouter()
 
 @router.get("/v4m-sets/")
-def get_v4m_sets(db: Session = Depends(get_db)):
+def get_v4m_sets(db: Session = Depends(get_read_db)):
     """
     Retrieve value 4 money sets.
     """
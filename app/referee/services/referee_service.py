@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.referee.models import Referee
 from app.core.utils import generate_custom_id
+from app.core.reference_cache import reference_cache
 
 class RefereeService:
     def __init__(self, db: Session):
@@ -9,7 +10,7 @@ class RefereeService:
     def get_or_create_referee(self, ref_name: str):
         """Retrieve a referee or create a new one."""
         try:
-            referee = self.db.query(Referee).filter(Referee.ref_name == ref_name).first()
+            referee = reference_cache.lookup(self.db, Referee, "ref_name", ref_name)
             
             if not referee:
                 new_id = generate_custom_id(self.db, Referee, "R", "ref_id")
@@ -18,6 +19,7 @@ class RefereeService:
                 self.db.add(referee)
                 self.db.commit()
                 self.db.refresh(referee)
+                referee = reference_cache.add(referee)
 
             return referee
         except:
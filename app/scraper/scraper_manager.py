@@ -1,10 +1,8 @@
-from app.scraper.oddsportal.oddsportal_scraper.oddsportal_scraper import get_odds_page_content, parse_match_data
-from app.scraper.fishy.fishy_scraper.fishy_scraper import get_fishy_page_content, parse_fishy_league_standing_data
-from app.scraper.betfair.betfair_scraper.betfair_scraper import get_betfair_page_content, parse_betfair_match_data  # You'll need to put your Betfair functions in this module
 from app.new_odds.services.new_odds_service import NewOddsService
 from app.current_league.services.current_league_service import CurrentLeagueService
 from app.teams.services.team_service import TeamService
 from sqlalchemy.orm import Session
+import asyncio
 
 class ScraperManager:
     def __init__(self, scraper_name, db: Session):
@@ -54,7 +52,10 @@ class ScraperManager:
         else:
             raise ValueError("Unsupported scraper name")
     
+    # Scraper modules pull in Playwright/Selenium/BeautifulSoup, so each is imported only when it runs
     async def _run_oddsportal_scraper(self, url):
+        from app.scraper.oddsportal.oddsportal_scraper.oddsportal_scraper import get_odds_page_content, parse_match_data
+
         try:
             league_code = self.oddsportal_league_mapping.get(url)
             if not league_code:
@@ -63,32 +64,44 @@ class ScraperManager:
             page_content = await get_odds_page_content(url)
             match_data = parse_match_data(page_content)
 
-            for match in match_data:
-                home_team = self.team_service.get_or_create_team(match['Home Team'], league_code)
-                away_team = self.team_service.get_or_create_team(match['Away Team'], league_code)
-                
-                if not home_team or not away_team:
-                    print(f"Warning: Could not find or create teams for {match['Home Team']} or {match['Away Team']}")
-                    continue
-                
-                new_odds_data = {
-                    'date': match['Date'],
-                    'time': match['Time'],
-                    'home_team_id': home_team.team_id,
-                    'away_team_id': away_team.team_id,
-                    'home_odds': match['Home Odds'],
-                    'draw_odds': match['Draw Odds'],
-                    'away_odds': match['Away Odds'],
-                    'league_code': league_code
-                }
-                print("New odds data:", new_odds_data)
-                self.new_odds_service.create_new_odds(new_odds_data)
+            # Team resolution and saving use the sync session; keep them off the event loop
+            await asyncio.to_thread(self._save_oddsportal_matches, match_data, league_code)
 
             return "OddsPortal Scraping: Success"
         except Exception as e:
             return f"OddsPortal Scraping: Failed - {str(e)}"
+
+    def _save_oddsportal_matches(self, match_data, league_code):
+        new_odds_rows = []
+        for match in match_data:
+            home_team = self.team_service.get_or_create_team(match['Home Team'], league_code)
+            away_team = self.team_service.get_or_create_team(match['Away Team'], league_code)
+            
+            if not home_team or not away_team:
+                print(f"Warning: Could not find or create teams for {match['Home Team']} or {match['Away Team']}")
+                continue
+            
+            new_odds_data = {
+                'date': match['Date'],
+                'time': match['Time'],
+                'home_team_id': home_team.team_id,
+                'away_team_id': away_team.team_id,
+                'home_odds': match['Home Odds'],
+                'draw_odds': match['Draw Odds'],
+                'away_odds': match['Away Odds'],
+                'league_code': league_code
+            }
+            print("New odds data:", new_odds_data)
+            new_odds_rows.append(new_odds_data)
+
+        outcomes = self.new_odds_service.create_new_odds_bulk(new_odds_rows)
+        failed = [o for o in outcomes if o["status"] == "error"]
+        if failed:
+            print(f"Warning: {len(failed)} of {len(outcomes)} OddsPortal rows failed to save")
     
     async def _run_fishy_scraper(self, url):
+        from app.scraper.fishy.fishy_scraper.fishy_scraper import get_fishy_page_content, parse_fishy_league_standing_data
+
         try:
             league_code = self.fishy_league_mapping.get(url)
             if not league_code:
@@ -104,34 +117,39 @@ class ScraperManager:
             league_data = parse_fishy_league_standing_data(page_content)
             print(f"[DEBUG] Parsed {len(league_data)} teams from {url}")
 
-            for team_standing in league_data:
-                current_league_data = {
-                    'team_id': team_standing['Team'],
-                    'year': team_standing['Year'],
-                    'position': team_standing['Position'],
-                    'played': team_standing['Played'],
-                    'wins': team_standing['Wins'],
-                    'draws': team_standing['Draws'],
-                    'losses': team_standing['Losses'],
-                    'goals_for': team_standing['Goals For'],
-                    'goals_against': team_standing['Goals Against'],
-                    'goal_difference': team_standing['Goal Difference'],
-                    'points': team_standing['Points'],
-                    'league_code': league_code
-                }
-                print("Current league data:", current_league_data)
-                self.current_league_service.create_or_update_current_league(current_league_data)
+            await asyncio.to_thread(self._save_fishy_standings, league_data, league_code)
 
             return "TheFishy Scraping: Success"
         except Exception as e:
-            self.new_odds_service.db.rollback()
+            await asyncio.to_thread(self.new_odds_service.db.rollback)
             return f"TheFishy Scraping: Failed - {str(e)}"
         finally:
-            self.new_odds_service.db.close() 
+            await asyncio.to_thread(self.new_odds_service.db.close)
+
+    def _save_fishy_standings(self, league_data, league_code):
+        for team_standing in league_data:
+            current_league_data = {
+                'team_id': team_standing['Team'],
+                'year': team_standing['Year'],
+                'position': team_standing['Position'],
+                'played': team_standing['Played'],
+                'wins': team_standing['Wins'],
+                'draws': team_standing['Draws'],
+                'losses': team_standing['Losses'],
+                'goals_for': team_standing['Goals For'],
+                'goals_against': team_standing['Goals Against'],
+                'goal_difference': team_standing['Goal Difference'],
+                'points': team_standing['Points'],
+                'league_code': league_code
+            }
+            print("Current league data:", current_league_data)
+            self.current_league_service.create_or_update_current_league(current_league_data)
         
 
 
     async def _run_betfair_scraper(self, url):
+        from app.scraper.betfair.betfair_scraper.betfair_scraper import get_betfair_page_content, parse_betfair_match_data
+
         try:
             # Fetch page content with Selenium
             page_content = await get_betfair_page_content(url)
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.seasons.models import Season
 from app.core.utils import generate_custom_id
+from app.core.reference_cache import reference_cache
 from datetime import datetime
 
 class SeasonService:
@@ -16,7 +17,7 @@ class SeasonService:
         else:
             formatted_season = self.determine_season(season_input)
 
-        season = self.db.query(Season).filter(Season.season_year == formatted_season).first()
+        season = reference_cache.lookup(self.db, Season, "season_year", formatted_season)
 
         if not season:
             new_id = generate_custom_id(self.db, Season, "S", "season_id")
@@ -29,6 +30,7 @@ class SeasonService:
                 self.db.add(season)
                 self.db.commit()
                 self.db.refresh(season)
+                season = reference_cache.add(season)
             except Exception as e:
                 self.db.rollback()  # Rollback on failure
                 raise e
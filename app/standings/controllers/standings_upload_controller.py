@@ -1,16 +1,17 @@
 from fastapi import APIRouter, UploadFile, File
-from app.standings.services.standing_upload_service import StandingsService
 from fastapi import Depends
-from app.core.database import get_db
-from sqlalchemy.orm import Session
+from app.core.database import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 @router.post("/upload-standings-csv/")
 async def upload_csv(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)  # Session managed by FastAPIY
+    db: AsyncSession = Depends(get_async_db)  # Session managed by FastAPIY
 ):
     """Upload CSV and delegate processing to the service layer."""
+    from app.standings.services.standing_upload_service import StandingsService  # pandas, only when uploading
+
     standing_upload_service = StandingsService(db)  # Dependency injection
     return await standing_upload_service.process_csv(file)
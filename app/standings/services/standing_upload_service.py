@@ -1,15 +1,15 @@
 import pandas as pd
 from io import StringIO
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import UploadFile
 from app.standings.models.standings_model import Standing
 from app.standings.services.standing_service import StandingService
 
 
 class StandingsService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.standing_service = StandingService(db)
 
     async def process_csv(self, file: UploadFile):
         """Reads the CSV, processes data, and calls necessary services."""
@@ -35,30 +35,35 @@ class StandingsService:
             # Rename columns to match expected format
             df.columns = [col.lower().replace(' ', '_') for col in df.columns]
 
-        
-            for _, row in df.iterrows():
-                standings_data = {
-                    "league": league_name,
-                    "season": season_year,
-                    "team": row["team"],
-                    "position": row["position"],
-                    "played": row["played"],
-                    "wins": row["wins"],
-                    "draws": row["draws"],
-                    "losses": row["losses"],
-                    "goals_for": row["goals_for"],
-                    "goals_against": row["goals_against"],
-                    "goal_difference": row["goal_difference"],
-                    "points": row["points"]
-                }
-
-                # Call StandingService to handle DB logic
-                self.standing_service.create_standing(standings_data)
-
-            return {"message": "Standings CSV uploaded and processed successfully"}
+            # StandingService is synchronous; run it on the async session's connection
+            return await self.db.run_sync(self._process_rows, df, league_name, season_year)
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return {"error": f"Failed to process standings CSV: {str(e)}"}
 
+    def _process_rows(self, db: Session, df: pd.DataFrame, league_name: str, season_year: str):
+        standing_service = StandingService(db)
+
+        for _, row in df.iterrows():
+            standings_data = {
+                "league": league_name,
+                "season": season_year,
+                "team": row["team"],
+                "position": row["position"],
+                "played": row["played"],
+                "wins": row["wins"],
+                "draws": row["draws"],
+                "losses": row["losses"],
+                "goals_for": row["goals_for"],
+                "goals_against": row["goals_against"],
+                "goal_difference": row["goal_difference"],
+                "points": row["points"]
+            }
+
+            # Call StandingService to handle DB logic
+            standing_service.create_standing(standings_data)
+
+        return {"message": "Standings CSV uploaded and processed successfully"}
+
 
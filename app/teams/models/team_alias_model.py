@@ -1,9 +1,13 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class TeamAlias(Base):
     __tablename__ = "team_aliases"
+    __table_args__ = (
+        # alias_name lookups are already covered by its unique constraint
+        Index("ix_team_aliases_team_id", "team_id"),
+    )
 
     alias_id = Column(String, primary_key=True, index=True)
     alias_name = Column(String, unique=True, nullable=False)
@@ -1,6 +1,19 @@
+import json
+from functools import lru_cache
 from sqlalchemy.orm import Session
 from app.teams.models import TeamAlias, Team
 from app.core.utils import generate_custom_id
+from app.core.reference_cache import reference_cache
+
+TEAM_ALIASES_PATH = "app/teams/teams_aliases.json"
+
+
+@lru_cache(maxsize=1)
+def load_team_aliases() -> dict:
+    """Official team name -> known aliases, read from JSON once per process. Treat as read-only."""
+    with open(TEAM_ALIASES_PATH, "r") as f:
+        return json.load(f)
+
 
 class TeamAliasService:
     def __init__(self, db: Session):
@@ -8,14 +21,16 @@ class TeamAliasService:
 
     def get_or_create_alias(self, team_id: str, alias_name: str):
         """Retrieve an alias for a team or create a new one."""
-        
+
         # ✅ First, ensure the team exists
-        team = self.db.query(Team).filter(Team.team_id == team_id).first()
+        team = reference_cache.lookup(self.db, Team, "team_id", team_id)
         if not team:
             raise ValueError(f"Team with ID {team_id} does not exist. Cannot create alias.")
 
         # ✅ Check if alias already exists
-        alias = self.db.query(TeamAlias).filter(TeamAlias.alias_name == alias_name, TeamAlias.team_id == team_id).first()
+        alias = reference_cache.lookup(self.db, TeamAlias, "alias_name", alias_name)
+        if alias and alias.team_id != team_id:
+            alias = None
 
         if not alias:
             try:
@@ -26,6 +41,7 @@ class TeamAliasService:
                 self.db.add(alias)
                 self.db.commit()
                 self.db.refresh(alias)
+                alias = reference_cache.add(alias)
             except Exception as e:
                 self.db.rollback()  # Rollback if commit fails
                 raise e
@@ -34,11 +50,11 @@ class TeamAliasService:
 
     def get_aliases_by_team(self, team_id: str):
         """Retrieve all aliases for a given team."""
-        return self.db.query(TeamAlias).filter(TeamAlias.team_id == team_id).all()
+        return reference_cache.group(self.db, TeamAlias, "team_id", team_id)
 
     def get_team_by_alias(self, alias_name: str):
-        """Retrieve the team associated with a given alias."""
-        alias = self.db.query(TeamAlias).filter(TeamAlias.alias_name == alias_name).first()
+        """Retrieve the team associated with a given alias (from the reference cache)."""
+        alias = reference_cache.get(self.db, TeamAlias, "alias_name", alias_name)
         if alias:
-            return self.db.query(Team).filter(Team.team_id == alias.team_id).first()
+            return reference_cache.lookup(self.db, Team, "team_id", alias.team_id)
         return None
@@ -0,0 +1,139 @@
+"""
+Query-plan regression check for the hot query shapes.
+
+Runs EXPLAIN on the queries the services issue and fails if any of them needs a
+sequential scan. Sequential scans are disabled for the session, so on a small
+local database the planner still picks an index whenever one can serve the query;
+a "Seq Scan" in the plan therefore means the index is missing.
+
+    alembic upgrade head
+    python -m migrations.query_plan_check            # uses DATABASE_URL
+    python -m migrations.query_plan_check --url postgresql://localhost/bet_test
+
+Exits with status 1 when any query falls back to a sequential scan.
+"""
+import sys
+import json
+import argparse
+from datetime import datetime, date, time
+from sqlalchemy import create_engine, select, text, or_
+from app.core.database import import_models
+
+
+def hot_queries():
+    """(name, statement) pairs mirroring the filters used by the services."""
+    import_models()
+    from app.matches.models.match_model import Match
+    from app.match_statistics.models.match_statistics_model import MatchStatistics
+    from app.current_league.models.current_league_model import CurrentLeague
+    from app.standings.models.standings_model import Standing
+    from app.new_odds.models.new_odds_model import NewOdds
+    from app.odds_calculation.models.odds_calculation_model import OddsCalculation
+    from app.teams.models.team_alias_model import TeamAlias
+    from app.betting_odds.models.betting_odds_model import BettingOdds
+
+    match_date = datetime(2025, 1, 1, 15, 0)
+    fixture_date = datetime(2025, 1, 1)
+    kick_off = time(15, 0)
+
+    return [
+        # MatchService.create_match
+        ("matches by fixture", select(Match).where(
+            Match.date == match_date, Match.home_team_id == "T1", Match.away_team_id == "T2"
+        ).limit(1)),
+        # OddsCalculationService.get_head_to_head_record
+        ("matches last 5 head-to-head", select(Match.match_id).where(
+            Match.home_team_id == "T1", Match.away_team_id == "T2"
+        ).order_by(Match.date.desc()).limit(5)),
+        # MatchStatisticsService.get_historic_stats_for_banded_chart
+        ("head-to-head history with statistics", select(Match.match_id, MatchStatistics.corners_home)
+            .join(MatchStatistics, Match.match_id == MatchStatistics.match_id)
+            .where(Match.home_team_id == "T1", Match.away_team_id == "T2")
+            .order_by(Match.date.desc())),
+        # OddsCalculationService.get_team_league_last_season
+        ("matches by season and team", select(Match).where(
+            Match.season_id == "S1", or_(Match.home_team_id == "T1", Match.away_team_id == "T1")
+        ).limit(1)),
+        # OddsCalculationService.get_team_season_performance
+        ("current_league by team and season", select(CurrentLeague).where(
+            CurrentLeague.team_id == "T1", CurrentLeague.season_id == "S1"
+        ).limit(1)),
+        ("standings by team and season", select(Standing).where(
+            Standing.team_id == "T1", Standing.season_id == "S1"
+        ).limit(1)),
+        # NewOddsService.create_new_odds
+        ("new_odds by fixture", select(NewOdds).where(
+            NewOdds.home_team_id == "T1", NewOdds.away_team_id == "T2",
+            NewOdds.date == fixture_date, NewOdds.time == kick_off,
+        ).limit(1)),
+        # NewOddsService.get_upcoming_matches
+        ("upcoming new_odds", select(NewOdds).where(NewOdds.date >= date(2025, 1, 1))),
+        # OddsSavingService.save_calculated_odds
+        ("odds_calculations by fixture", select(OddsCalculation).where(
+            OddsCalculation.date == fixture_date, OddsCalculation.time == kick_off,
+            OddsCalculation.home_team_id == "T1", OddsCalculation.away_team_id == "T2",
+        ).limit(1)),
+        # OddsRetrievalService.get_all_calculated_odds
+        ("upcoming odds_calculations", select(OddsCalculation).where(
+            OddsCalculation.date >= date(2025, 1, 1)
+        ).order_by(OddsCalculation.date.asc(), OddsCalculation.time.asc())),
+        # MatchStatisticsService.create_match_statistics
+        ("match_statistics by match", select(MatchStatistics).where(MatchStatistics.match_id == "M1").limit(1)),
+        # TeamAliasService
+        ("team_aliases by alias", select(TeamAlias).where(TeamAlias.alias_name == "Man Utd").limit(1)),
+        ("team_aliases by team", select(TeamAlias).where(TeamAlias.team_id == "T1")),
+        ("betting_odds by match", select(BettingOdds).where(BettingOdds.match_id == "M1")),
+    ]
+
+
+def find_seq_scans(plan):
+    """Return the relations read with a sequential scan anywhere in the plan tree."""
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+def check_query_plans(url: str) -> list:
+    """Return (query name, relations) for every query that falls back to a sequential scan."""
+    engine = create_engine(url)
+    failures = []
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SET enable_seqscan = off"))
+            for name, stmt in hot_queries():
+                compiled = stmt.compile(dialect=conn.dialect)
+                rows = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+                plan = (json.loads(rows) if isinstance(rows, str) else rows)[0]["Plan"]
+                scans = find_seq_scans(plan)
+                print(f"{'❌' if scans else '✅'} {name}" + (f" (seq scan on {', '.join(scans)})" if scans else ""))
+                if scans:
+                    failures.append((name, scans))
+    finally:
+        engine.dispose()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail if a hot query needs a sequential scan.")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        url = args.url
+    else:
+        from app.core.config import settings
+        url = settings.DATABASE_URL
+
+    failures = check_query_plans(url)
+    if failures:
+        print(f"{len(failures)} hot queries fall back to a sequential scan")
+        return 1
+    print("All hot queries use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
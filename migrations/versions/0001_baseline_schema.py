@@ -0,0 +1,193 @@
+"""baseline schema
+
+Tables as they existed before migrations were introduced. Databases that were
+created by Base.metadata.create_all() already have them, so each table is only
+created when it is missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table(name, *columns):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+        op.create_index(f"ix_{name}_{columns[0].name}", name, [columns[0].name])
+
+
+def upgrade():
+    _create_table(
+        "countries",
+        sa.Column("country_id", sa.String(), primary_key=True),
+        sa.Column("country_name", sa.String(), nullable=False, unique=True),
+    )
+    _create_table(
+        "leagues",
+        sa.Column("league_id", sa.String(), primary_key=True),
+        sa.Column("league_code", sa.String()),
+        sa.Column("league_name", sa.String(), nullable=False, unique=True),
+        sa.Column("country_id", sa.String(), sa.ForeignKey("countries.country_id")),
+        sa.Column("league_alternate_name", sa.String(), nullable=True, unique=True),
+    )
+    _create_table(
+        "seasons",
+        sa.Column("season_id", sa.String(), primary_key=True),
+        sa.Column("season_year", sa.String(), nullable=False, unique=True),
+    )
+    _create_table(
+        "referees",
+        sa.Column("ref_id", sa.String(), primary_key=True),
+        sa.Column("ref_name", sa.String(), nullable=False, unique=True),
+    )
+    _create_table(
+        "teams",
+        sa.Column("team_id", sa.String(), primary_key=True),
+        sa.Column("team_name", sa.String(), nullable=False, unique=True),
+        sa.Column("home_primary_color", sa.String(), nullable=True),
+        sa.Column("home_secondary_color", sa.String(), nullable=True),
+        sa.Column("away_primary_color", sa.String(), nullable=True),
+        sa.Column("away_secondary_color", sa.String(), nullable=True),
+        sa.Column("league_id", sa.String(), sa.ForeignKey("leagues.league_id")),
+        sa.Column("country_id", sa.String(), sa.ForeignKey("countries.country_id")),
+    )
+    _create_table(
+        "team_aliases",
+        sa.Column("alias_id", sa.String(), primary_key=True),
+        sa.Column("alias_name", sa.String(), nullable=False, unique=True),
+        sa.Column("team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+    )
+    _create_table(
+        "matches",
+        sa.Column("match_id", sa.String(), primary_key=True),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("league_id", sa.String(), sa.ForeignKey("leagues.league_id")),
+        sa.Column("season_id", sa.String(), sa.ForeignKey("seasons.season_id")),
+        sa.Column("home_team_id", sa.String(), sa.ForeignKey("teams.team_id")),
+        sa.Column("away_team_id", sa.String(), sa.ForeignKey("teams.team_id")),
+        sa.Column("referee_id", sa.String(), sa.ForeignKey("referees.ref_id")),
+    )
+    _create_table(
+        "betting_odds",
+        sa.Column("betting_oddds_id", sa.String(), primary_key=True),
+        sa.Column("match_id", sa.String(), sa.ForeignKey("matches.match_id"), nullable=False),
+        *[
+            sa.Column(name, sa.Float(), nullable=True)
+            for name in (
+                "B365H", "B365D", "B365A", "BWH", "BWD", "BWA", "BFH", "BFD", "BFA",
+                "PSH", "PSD", "PSA", "WHH", "WHD", "WHA", "MaxH", "MaxD", "MaxA",
+                "AvgH", "AvgD", "AvgA",
+                "B365_over_2_5", "B365_under_2_5", "P_over_2_5", "P_under_2_5",
+                "Max_over_2_5", "Max_under_2_5", "Avg_over_2_5", "Avg_under_2_5",
+                "AHh", "B365AHH", "B365AHA", "PAHH", "PAHA", "MaxAHH", "MaxAHA", "AvgAHH", "AvgAHA",
+            )
+        ],
+    )
+    _create_table(
+        "match_statistics",
+        sa.Column("match_stat_id", sa.String(), primary_key=True),
+        sa.Column("match_id", sa.String(), sa.ForeignKey("matches.match_id"), nullable=False),
+        sa.Column("full_time_home_goals", sa.Integer(), nullable=False),
+        sa.Column("full_time_away_goals", sa.Integer(), nullable=False),
+        sa.Column("full_time_result", sa.String(), nullable=False),
+        sa.Column("half_time_home_goals", sa.Integer(), nullable=False),
+        sa.Column("half_time_away_goals", sa.Integer(), nullable=False),
+        sa.Column("half_time_result", sa.String(), nullable=False),
+        *[
+            sa.Column(name, sa.Integer(), nullable=False)
+            for name in (
+                "shots_home", "shots_away", "shots_on_target_home", "shots_on_target_away",
+                "fouls_home", "fouls_away", "corners_home", "corners_away",
+                "yellow_cards_home", "yellow_cards_away", "red_cards_home", "red_cards_away",
+            )
+        ],
+    )
+    for table, pk in (("standings", "standing_id"), ("current_league", "current_league_id")):
+        _create_table(
+            table,
+            sa.Column(pk, sa.String(), primary_key=True),
+            sa.Column("team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+            sa.Column("league_id", sa.String(), sa.ForeignKey("leagues.league_id"), nullable=False),
+            sa.Column("season_id", sa.String(), sa.ForeignKey("seasons.season_id"), nullable=False),
+            *[
+                sa.Column(name, sa.Integer(), nullable=False)
+                for name in (
+                    "position", "played", "wins", "draws", "losses",
+                    "goals_for", "goals_against", "goal_difference", "points",
+                )
+            ],
+        )
+    _create_table(
+        "new_odds",
+        sa.Column("new_odds_id", sa.String(), primary_key=True),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("time", sa.Time(), nullable=False),
+        sa.Column("season_id", sa.String(), sa.ForeignKey("seasons.season_id"), nullable=False),
+        sa.Column("league_id", sa.String(), sa.ForeignKey("leagues.league_id"), nullable=False),
+        sa.Column("home_team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+        sa.Column("away_team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+        sa.Column("home_odds", sa.Float()),
+        sa.Column("draw_odds", sa.Float()),
+        sa.Column("away_odds", sa.Float()),
+        sa.Column("full_market_data", JSONB(), nullable=True),
+    )
+    _create_table(
+        "odds_calculations",
+        sa.Column("odds_calculation_id", sa.String(), primary_key=True),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("time", sa.Time(), nullable=False),
+        sa.Column("home_team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+        sa.Column("away_team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+        sa.Column("calculated_home_odds", sa.Float()),
+        sa.Column("calculated_draw_odds", sa.Float()),
+        sa.Column("calculated_away_odds", sa.Float()),
+        sa.Column("stats_banded_data", sa.JSON(), nullable=True),
+    )
+    _create_table(
+        "live_game_data",
+        sa.Column(
+            "odds_calculation_id",
+            sa.String(),
+            sa.ForeignKey("odds_calculations.odds_calculation_id"),
+            primary_key=True,
+        ),
+        sa.Column("is_live", sa.Boolean()),
+        sa.Column("scrape_url", sa.String(), nullable=True),
+        sa.Column("live_home_score", sa.Integer(), nullable=True),
+        sa.Column("live_away_score", sa.Integer(), nullable=True),
+        sa.Column("match_time", sa.String(), nullable=True),
+        sa.Column("live_home_odds", sa.Float(), nullable=True),
+        sa.Column("live_draw_odds", sa.Float(), nullable=True),
+        sa.Column("live_away_odds", sa.Float(), nullable=True),
+        sa.Column("shots_on_target_home", sa.Integer(), nullable=True),
+        sa.Column("shots_on_target_away", sa.Integer(), nullable=True),
+        sa.Column("shots_off_target_home", sa.Integer(), nullable=True),
+        sa.Column("shots_off_target_away", sa.Integer(), nullable=True),
+        sa.Column("corners_home", sa.Integer(), nullable=True),
+        sa.Column("corners_away", sa.Integer(), nullable=True),
+        sa.Column("last_updated", sa.DateTime(), nullable=True),
+    )
+    if not sa.inspect(op.get_bind()).has_table("id_counters"):
+        op.create_table(
+            "id_counters",
+            sa.Column("counter_name", sa.String(), primary_key=True),
+            sa.Column("next_value", sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade():
+    for table in (
+        "id_counters", "live_game_data", "odds_calculations", "new_odds", "current_league",
+        "standings", "match_statistics", "betting_odds", "matches", "team_aliases", "teams",
+        "referees", "seasons", "leagues", "countries",
+    ):
+        op.drop_table(table)
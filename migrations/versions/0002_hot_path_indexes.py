@@ -0,0 +1,74 @@
+"""hot path indexes
+
+Composite and unique indexes for the lookups the services run on every
+upload, scrape and odds calculation.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_matches_home_away_date", "matches", ["home_team_id", "away_team_id", "date"]),
+    ("ix_matches_away_team_id", "matches", ["away_team_id"]),
+    ("ix_current_league_team_season", "current_league", ["team_id", "season_id"]),
+    ("ix_standings_team_season", "standings", ["team_id", "season_id"]),
+    ("ix_match_statistics_match_id", "match_statistics", ["match_id"]),
+    ("ix_team_aliases_team_id", "team_aliases", ["team_id"]),
+    ("ix_betting_odds_match_id", "betting_odds", ["match_id"]),
+]
+
+# (constraint name, table, primary key) - both are keyed on the fixture
+FIXTURE_CONSTRAINTS = [
+    ("uq_new_odds_fixture", "new_odds", "new_odds_id"),
+    ("uq_odds_calculations_fixture", "odds_calculations", "odds_calculation_id"),
+]
+FIXTURE_COLUMNS = ["date", "time", "home_team_id", "away_team_id"]
+
+
+def _has_unique_constraint(table, name):
+    return any(c["name"] == name for c in sa.inspect(op.get_bind()).get_unique_constraints(table))
+
+
+def _delete_duplicate_fixtures(table, pk):
+    """Keep the lowest ID per fixture so the unique constraint can be added."""
+    # IDs are prefix + number ("OC9" < "OC10"), so rank by the numeric part, not the string
+    duplicates = f"""
+        SELECT {pk} FROM (
+            SELECT {pk}, row_number() OVER (
+                PARTITION BY {", ".join(FIXTURE_COLUMNS)}
+                ORDER BY substring({pk} from '[0-9]+$')::bigint, {pk}
+            ) AS fixture_rank
+            FROM {table}
+        ) ranked
+        WHERE fixture_rank > 1
+    """
+    if table == "odds_calculations":
+        op.execute(f"DELETE FROM live_game_data WHERE odds_calculation_id IN ({duplicates})")
+    op.execute(f"DELETE FROM {table} WHERE {pk} IN ({duplicates})")
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+    for name, table, pk in FIXTURE_CONSTRAINTS:
+        if not _has_unique_constraint(table, name):
+            _delete_duplicate_fixtures(table, pk)
+            op.create_unique_constraint(name, table, FIXTURE_COLUMNS)
+
+
+def downgrade():
+    for name, table, _ in FIXTURE_CONSTRAINTS:
+        op.drop_constraint(name, table, type_="unique")
+
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,76 @@
+"""head to head summary
+
+Per-pairing H2H counts and last results, maintained on every stored result.
+Backfilled from matches + match_statistics.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Keep in sync with H2H_RECENT_RESULTS in head_to_head_summary_model
+RECENT_RESULTS = 5
+
+
+def upgrade():
+    op.create_table(
+        "head_to_head_summary",
+        sa.Column("home_team_id", sa.String(), sa.ForeignKey("teams.team_id"), primary_key=True),
+        sa.Column("away_team_id", sa.String(), sa.ForeignKey("teams.team_id"), primary_key=True),
+        sa.Column("matches_played", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("home_wins", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("away_wins", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("draws", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("recent_results", sa.JSON(), nullable=False, server_default="[]"),
+        sa.Column("last_match_date", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    op.execute(f"""
+        INSERT INTO head_to_head_summary
+            (home_team_id, away_team_id, matches_played, home_wins, away_wins, draws,
+             recent_results, last_match_date, updated_at)
+        SELECT
+            m.home_team_id,
+            m.away_team_id,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE s.full_time_result = 'H'),
+            COUNT(*) FILTER (WHERE s.full_time_result = 'A'),
+            COUNT(*) FILTER (WHERE s.full_time_result = 'D'),
+            COALESCE((
+                SELECT json_agg(json_build_object(
+                           'match_id', r.match_id,
+                           'date', r.date,
+                           'result', r.full_time_result,
+                           'home_goals', r.full_time_home_goals,
+                           'away_goals', r.full_time_away_goals
+                       ) ORDER BY r.date DESC)
+                FROM (
+                    SELECT m2.match_id, m2.date, s2.full_time_result,
+                           s2.full_time_home_goals, s2.full_time_away_goals
+                    FROM matches m2
+                    JOIN match_statistics s2 ON s2.match_id = m2.match_id
+                    WHERE m2.home_team_id = m.home_team_id AND m2.away_team_id = m.away_team_id
+                    ORDER BY m2.date DESC
+                    LIMIT {RECENT_RESULTS}
+                ) r
+            ), '[]'::json),
+            MAX(m.date),
+            now()
+        FROM matches m
+        JOIN match_statistics s ON s.match_id = m.match_id
+        WHERE m.home_team_id IS NOT NULL AND m.away_team_id IS NOT NULL
+        GROUP BY m.home_team_id, m.away_team_id
+    """)
+
+
+def downgrade():
+    op.drop_table("head_to_head_summary")
@@ -0,0 +1,26 @@
+"""odds input fingerprint
+
+Hash of the inputs each OddsCalculation row was calculated from, so reruns
+skip fixtures whose inputs haven't changed. Existing rows start without one
+and are recalculated on the next run.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("odds_calculations", sa.Column("input_fingerprint", sa.String(64), nullable=True))
+
+
+def downgrade():
+    op.drop_column("odds_calculations", "input_fingerprint")
@@ -0,0 +1,33 @@
+"""banded stats
+
+Precomputed stats_banded_data per team pair. Rows are filled on first use
+(missing rows count as stale), so there is no backfill here.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "banded_stats",
+        sa.Column("home_team_id", sa.String(), sa.ForeignKey("teams.team_id"), primary_key=True),
+        sa.Column("away_team_id", sa.String(), sa.ForeignKey("teams.team_id"), primary_key=True),
+        sa.Column("stats_banded_data", sa.JSON(), nullable=False),
+        sa.Column("latest_match_date", sa.DateTime(), nullable=True),
+        sa.Column("match_count", sa.Integer(), nullable=False),
+        sa.Column("computed_on", sa.Date(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("banded_stats")
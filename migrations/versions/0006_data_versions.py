@@ -0,0 +1,56 @@
+"""data versions
+
+Per-table version counters bumped by statement-level triggers, so cached
+responses built from these tables can tell when they are out of date.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Keep in sync with CALCULATED_ODDS_TABLES in odds_retrieval_service
+VERSIONED_TABLES = ("odds_calculations", "new_odds", "live_game_data")
+
+
+def upgrade():
+    op.create_table(
+        "data_versions",
+        sa.Column("table_name", sa.String(), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.execute(f"""
+        INSERT INTO data_versions (table_name, version)
+        VALUES {", ".join(f"('{table}', 0)" for table in VERSIONED_TABLES)}
+    """)
+
+    op.execute("""
+        CREATE FUNCTION bump_data_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO data_versions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name) DO UPDATE SET version = data_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in VERSIONED_TABLES:
+        # Once per statement, so a bulk upsert bumps the version once
+        op.execute(f"""
+            CREATE TRIGGER {table}_data_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()
+        """)
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_data_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_data_version()")
+    op.drop_table("data_versions")
@@ -0,0 +1,102 @@
+"""fixtures
+
+One row per real-world match with the Betfair and SofaScore IDs it is known by;
+new_odds, odds_calculations and live_game_data reference it by fixture_id.
+Existing rows are backfilled: fixtures from the (date, time, home, away) keys
+of new_odds and odds_calculations, Betfair IDs from new_odds.full_market_data
+(stored as a JSON string inside the JSONB column), live_game_data through its
+odds_calculations row.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+LINKED_TABLES = ("new_odds", "odds_calculations", "live_game_data")
+
+
+def upgrade():
+    op.create_table(
+        "fixtures",
+        sa.Column("fixture_id", sa.String(), primary_key=True),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.Column("time", sa.Time(), nullable=False),
+        sa.Column("home_team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+        sa.Column("away_team_id", sa.String(), sa.ForeignKey("teams.team_id"), nullable=False),
+        sa.Column("betfair_event_id", sa.String(), nullable=True),
+        sa.Column("betfair_event_name", sa.String(), nullable=True),
+        sa.Column("betfair_market_id", sa.String(), nullable=True),
+        sa.Column("sofascore_event_id", sa.String(), nullable=True),
+        sa.UniqueConstraint("date", "time", "home_team_id", "away_team_id", name="uq_fixtures_fixture"),
+    )
+    for column in ("fixture_id", "betfair_event_id", "sofascore_event_id"):
+        op.create_index(f"ix_fixtures_{column}", "fixtures", [column])
+
+    op.execute("""
+        WITH fixture_keys AS (
+            SELECT date, time, home_team_id, away_team_id FROM new_odds
+            UNION
+            SELECT date, time, home_team_id, away_team_id FROM odds_calculations
+        ),
+        market AS (
+            SELECT date, time, home_team_id, away_team_id,
+                   CASE WHEN jsonb_typeof(full_market_data) = 'string'
+                        THEN (full_market_data #>> '{}')::jsonb
+                        ELSE full_market_data END AS doc
+            FROM new_odds
+            WHERE full_market_data IS NOT NULL
+        )
+        INSERT INTO fixtures (
+            fixture_id, date, time, home_team_id, away_team_id,
+            betfair_event_id, betfair_event_name, betfair_market_id
+        )
+        SELECT 'FX' || row_number() OVER (ORDER BY k.date, k.time, k.home_team_id, k.away_team_id),
+               k.date, k.time, k.home_team_id, k.away_team_id,
+               m.doc ->> 'event_id',
+               m.doc ->> 'event_name',
+               (
+                   SELECT market_row ->> 'market_id'
+                   FROM jsonb_array_elements(
+                       CASE WHEN jsonb_typeof(m.doc -> 'markets') = 'array'
+                            THEN m.doc -> 'markets' ELSE '[]'::jsonb END
+                   ) AS market_row
+                   WHERE lower(replace(market_row ->> 'market_name', ' ', '')) = 'matchodds'
+                   LIMIT 1
+               )
+        FROM fixture_keys k
+        LEFT JOIN market m USING (date, time, home_team_id, away_team_id)
+    """)
+
+    for table in LINKED_TABLES:
+        op.add_column(table, sa.Column("fixture_id", sa.String(), nullable=True))
+        op.create_foreign_key(f"{table}_fixture_id_fkey", table, "fixtures", ["fixture_id"], ["fixture_id"])
+        op.create_index(f"ix_{table}_fixture_id", table, ["fixture_id"])
+
+    for table in ("new_odds", "odds_calculations"):
+        op.execute(f"""
+            UPDATE {table} t SET fixture_id = f.fixture_id
+            FROM fixtures f
+            WHERE f.date = t.date AND f.time = t.time
+              AND f.home_team_id = t.home_team_id AND f.away_team_id = t.away_team_id
+        """)
+    op.execute("""
+        UPDATE live_game_data l SET fixture_id = o.fixture_id
+        FROM odds_calculations o
+        WHERE o.odds_calculation_id = l.odds_calculation_id
+    """)
+
+
+def downgrade():
+    for table in LINKED_TABLES:
+        op.drop_index(f"ix_{table}_fixture_id", table_name=table)
+        op.drop_constraint(f"{table}_fixture_id_fkey", table, type_="foreignkey")
+        op.drop_column(table, "fixture_id")
+    op.drop_table("fixtures")
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.database import get_read_db
+from app.odds_calculation.controllers import odds_calculation_controller
+from app.odds_calculation.services import odds_retrieval_service
+from app.odds_calculation.services.odds_retrieval_service import OddsRetrievalService, calculated_odds_cache
+
+ROWS = [{"home_team_name": "Arsenal", "away_team_name": "Chelsea", "home_odds": 1.9}]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # No database: fixed data versions and rows
+    monkeypatch.setattr(odds_retrieval_service, "current_versions", lambda db, names: (1, 1, 1))
+    monkeypatch.setattr(odds_retrieval_service, "LiveGameDataService", lambda db: None)
+    monkeypatch.setattr(
+        OddsRetrievalService, "get_all_calculated_odds",
+        lambda self, include_market_data=False, fields=None: ROWS,
+    )
+    calculated_odds_cache.invalidate()
+
+    app = FastAPI()
+    app.include_router(odds_calculation_controller.router, prefix="/odds-calculation")
+    app.dependency_overrides[get_read_db] = lambda: None
+    return TestClient(app)
+
+
+def test_default_fields_are_served(client):
+    response = client.get("/odds-calculation/calculated-odds/")
+    assert response.status_code == 200
+    assert response.json() == {"calculated_odds": ROWS}
+    assert response.headers["ETag"]
+
+
+def test_non_default_fields_are_served_uncached(client):
+    response = client.get("/odds-calculation/calculated-odds/", params={"fields": "home_team_name,home_odds"})
+    assert response.status_code == 200
+    assert response.json() == {"calculated_odds": ROWS}
+
+    etag = response.headers["ETag"]
+    again = client.get(
+        "/odds-calculation/calculated-odds/",
+        params={"fields": "home_team_name,home_odds"},
+        headers={"If-None-Match": etag},
+    )
+    assert again.status_code == 304
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/odds-calculation/calculated-odds/", params={"fields": "nope"})
+    assert response.status_code == 400